@@ -0,0 +1,59 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+# Worker threads used for the startup fetches
+DEFAULT_MAX_WORKERS = 4
+# How often the Tk thread drains the result queue
+DEFAULT_POLL_INTERVAL_MS = 100
+
+
+# Runs blocking work (DB fetches, frame preparation) on a worker pool and hands the
+# results back to the Tk thread. Workers never touch widgets: completions and progress
+# updates are put on a queue that the Tk thread drains with root.after() polling.
+class BackgroundLoader:
+    def __init__(self, root, max_workers=DEFAULT_MAX_WORKERS, poll_interval_ms=DEFAULT_POLL_INTERVAL_MS):
+        self.root = root
+        self.poll_interval_ms = poll_interval_ms
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="loader")
+        self.results = queue.Queue()
+        self.polling = False
+
+    # Run function(*args) on a worker; on_done(result) or on_error(exception) then runs on the Tk thread
+    def submit(self, function, *args, on_done=None, on_error=None):
+        future = self.executor.submit(function, *args)
+        future.add_done_callback(lambda done: self.results.put((on_done, on_error, done)))
+        self.start()
+        return future
+
+    # Queue a call to run on the Tk thread (safe to use from a worker, e.g. for progress updates)
+    def post(self, callback, *args, **kwargs):
+        self.results.put((lambda _: callback(*args, **kwargs), None, None))
+
+    def start(self):
+        if not self.polling:
+            self.polling = True
+            self.root.after(0, self.poll)
+
+    # Drain the queue on the Tk thread, then re-arm the timer
+    def poll(self):
+        while True:
+            try:
+                on_done, on_error, future = self.results.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                if future is None:
+                    on_done(None)
+                elif future.exception() is not None:
+                    if on_error:
+                        on_error(future.exception())
+                    else:
+                        print(f"Background task failed: {str(future.exception())}")
+                elif on_done:
+                    on_done(future.result())
+            except Exception as e:
+                print(f"Error handling background result: {str(e)}")
+        self.root.after(self.poll_interval_ms, self.poll)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
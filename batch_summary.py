@@ -0,0 +1,145 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from data_loader import stream_inbound_table, stream_outbound_table
+from snapshot_cache import load_inbound_cached, load_outbound_cached, DEFAULT_LOOKBACK_DAYS
+from date_index import DateIndex, sort_by_date
+from metrics_cube import build_inbound_cube, build_outbound_cube
+from metadata_catalog import build_inbound_catalog, build_outbound_catalog
+from metrics_engine import inbound_summary, outbound_summary
+from data_schema import memory_bytes
+from export_history import append_run
+
+# Headless batch mode: loads the inbound and outbound tables once and writes the summary KPIs
+# of every filter combination to one file. Nothing on this path imports tkinter.
+#
+#   python batch_summary.py --start 2024-01-01 --end 2024-12-31 --output summary.csv --workers 4
+
+DIRECTIONS = ("inbound", "outbound")
+
+# Filter columns leading every row of the consolidated output
+OUTPUT_FILTER_COLUMNS = ["direction", "DC_NAME", "BUSINESSUNIT", "ORDERTYPE", "start_date", "end_date"]
+
+DEFAULT_OUTPUT = 'summary_batch.csv'
+
+
+# Loaded frame of one direction with its date index, cube and filter catalog
+class LoadedDirection:
+    def __init__(self, direction, data):
+        self.direction = direction
+        self.data = sort_by_date(data)
+        self.index = DateIndex(self.data)
+        if direction == "inbound":
+            self.cube = build_inbound_cube(self.data)
+            self.catalog = build_inbound_catalog(self.data)
+        else:
+            self.cube = build_outbound_cube(self.data)
+            self.catalog = build_outbound_catalog(self.data)
+
+    # Bytes held by the frame and everything built from it (date index, cube, catalog)
+    def memory_bytes(self):
+        return memory_bytes(self.data) + self.index.memory_bytes() + self.cube.memory_bytes() + self.catalog.memory_bytes()
+
+    # Metrics of one filter combination (column -> value, "All" for no filter)
+    def summary(self, start_date, end_date, combination):
+        if self.direction == "inbound":
+            return inbound_summary(self.data, start_date, end_date, combination.get("DC_NAME"),
+                                   date_index=self.index, cube=self.cube)
+        return outbound_summary(self.data, start_date, end_date, combination.get("DC_NAME"),
+                                combination.get("BUSINESSUNIT"), combination.get("ORDERTYPE"),
+                                date_index=self.index, cube=self.cube)
+
+
+# Load one direction from the snapshot cache (or a full streaming load)
+def load_direction(direction, use_cache=True, lookback_days=DEFAULT_LOOKBACK_DAYS):
+    started = time.perf_counter()
+    if direction == "inbound":
+        data = load_inbound_cached(lookback_days) if use_cache else stream_inbound_table()
+    else:
+        data = load_outbound_cached(lookback_days) if use_cache else stream_outbound_table()
+    loaded = LoadedDirection(direction, data)
+    print(f"{direction}: {len(loaded.data):,} rows loaded in {time.perf_counter() - started:.1f}s")
+    return loaded
+
+
+# Every filter combination present in the data, including the "All" roll-ups of each column
+def filter_grid(catalog):
+    combinations = [{}]
+    for column in catalog.filter_columns:
+        combinations = [dict(combination, **{column: value})
+                        for combination in combinations
+                        for value in catalog.values(column, combination)]
+    return combinations
+
+
+# One output row: filters, date range and the raw KPIs
+def summary_record(loaded, start_date, end_date, combination):
+    record = {"direction": loaded.direction, **combination, "start_date": start_date, "end_date": end_date}
+    record.update(loaded.summary(start_date, end_date, combination).kpi_record())
+    return record
+
+
+# Summaries of every filter combination of the given directions, as one long table.
+# Without start/end the full loaded date range of each direction is used.
+def run_batch(start_date=None, end_date=None, directions=DIRECTIONS, workers=1, use_cache=True):
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        loaded_directions = list(executor.map(lambda direction: load_direction(direction, use_cache), directions))
+
+        tasks = []
+        for loaded in loaded_directions:
+            start = pd.Timestamp(start_date) if start_date else loaded.catalog.min_date
+            end = pd.Timestamp(end_date) if end_date else loaded.catalog.max_date
+            tasks.extend((loaded, start, end, combination) for combination in filter_grid(loaded.catalog))
+        records = list(executor.map(lambda task: summary_record(*task), tasks))
+
+    frame = pd.DataFrame.from_records(records)
+    ordered = [column for column in OUTPUT_FILTER_COLUMNS if column in frame.columns]
+    return frame[ordered + [column for column in frame.columns if column not in ordered]]
+
+
+# Write the consolidated table; the format follows the file extension (.csv, .xlsx or .parquet)
+def write_output(frame, path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.xlsx':
+        frame.to_excel(path, index=False)
+    elif extension == '.parquet':
+        frame.to_parquet(path, index=False)
+    else:
+        frame.to_csv(path, index=False)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compute inbound/outbound summary KPIs for every filter combination.")
+    parser.add_argument('--start', help="first DATE included (default: earliest loaded date)")
+    parser.add_argument('--end', help="last DATE included (default: latest loaded date)")
+    parser.add_argument('--direction', choices=DIRECTIONS, action='append',
+                        help="direction to summarize; repeat for both (default: both)")
+    parser.add_argument('--workers', type=int, default=1, help="threads used for loading and computing")
+    parser.add_argument('--no-cache', action='store_true', help="stream the full tables instead of using the snapshot cache")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="output file (.csv, .xlsx or .parquet)")
+    parser.add_argument('--history', help="also append the run to this export history store (SQLite)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        frame = run_batch(args.start, args.end, args.direction or DIRECTIONS, args.workers, not args.no_cache)
+        write_output(frame, args.output)
+        if args.history:
+            run_id = append_run(frame.to_dict('records'), args.history, source="batch")
+            print(f"Run {run_id} appended to {args.history}")
+    except Exception as e:
+        print(f"Batch summary failed: {str(e)}")
+        return 1
+    print(f"{len(frame):,} summary rows written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
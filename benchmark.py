@@ -0,0 +1,214 @@
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from typed_frames import read_cursor_chunks, INBOUND_COLUMNS, OUTBOUND_COLUMNS
+from synthetic_data import ensure_database, DEFAULT_SEED, DEFAULT_DATA_DIR, DC_NAMES, BUSINESS_UNITS, ORDER_TYPES, FIRST_DATE, DAYS
+from metrics_engine import inbound_summary, outbound_summary, filter_rows, slice_kpis, INBOUND_DISTINCT, OUTBOUND_DISTINCT
+from batch_summary import LoadedDirection, filter_grid, summary_record, write_output
+from export_history import append_run
+
+# Benchmark of the load, filter, metrics and export stages on synthetic tables of fixed sizes,
+# read from a local SQLite stand-in instead of the MySQL host. Each stage reports its best wall
+# time over --repeat runs and the peak memory it allocated (tracemalloc, in a separate run).
+#
+#   python benchmark.py --sizes 100K 1M --save-baseline
+#   python benchmark.py --sizes 100K 1M              # compares against the saved baseline
+
+DEFAULT_SIZES = ["100K", "1M"]
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+DEFAULT_REPEAT = 3
+# Filter combinations timed by the filter and metrics stages
+QUERY_COUNT = 20
+# Date window lengths (days) the queries are drawn from
+WINDOW_DAYS = [7, 30, 90, 365]
+
+COLUMNS = {"inbound": INBOUND_COLUMNS, "outbound": OUTBOUND_COLUMNS}
+
+
+# "100K" / "1M" / "10M" / "2500" -> number of rows
+def parse_size(text):
+    multipliers = {"K": 1_000, "M": 1_000_000}
+    text = text.strip().upper()
+    if text[-1] in multipliers:
+        return int(float(text[:-1]) * multipliers[text[-1]])
+    return int(text)
+
+
+# Best wall time of function() over repeat runs, the peak traced memory of one more run (when
+# track_memory) and the last result
+def measure(function, repeat=1, track_memory=True):
+    best = float('inf')
+    result = None
+    for _ in range(max(repeat, 1)):
+        started = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - started)
+    peak = None
+    if track_memory:
+        tracemalloc.start()
+        try:
+            function()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return best, peak, result
+
+
+# Random filter combinations: a date window inside the year plus DC (and BU/channel) choices
+def make_queries(direction, count=QUERY_COUNT, seed=DEFAULT_SEED):
+    rng = np.random.default_rng(seed)
+    queries = []
+    for _ in range(count):
+        days = int(rng.choice(WINDOW_DAYS))
+        start = FIRST_DATE + pd.Timedelta(days=int(rng.integers(0, DAYS - days + 1)))
+        query = {"start_date": start, "end_date": start + pd.Timedelta(days=days - 1),
+                 "dc_name": str(rng.choice(["All"] + DC_NAMES))}
+        if direction == "outbound":
+            query["bu_name"] = str(rng.choice(["All"] + BUSINESS_UNITS))
+            query["channel_name"] = str(rng.choice(["All"] + ORDER_TYPES))
+        queries.append(query)
+    return queries
+
+
+# Legacy load: fetchall() into an object-dtype frame, as connect_to_database_* did originally
+def load_legacy(path, direction):
+    connection = sqlite3.connect(path)
+    try:
+        cursor = connection.cursor()
+        cursor.execute(f"SELECT {','.join(COLUMNS[direction])} FROM {direction}")
+        rows = cursor.fetchall()
+        columns = [col[0] for col in cursor.description]
+        return pd.DataFrame(rows, columns=columns)
+    finally:
+        connection.close()
+
+
+# Current load: fetchmany() chunks converted to the compact schema
+def load_streaming(path, direction):
+    connection = sqlite3.connect(path)
+    try:
+        cursor = connection.cursor()
+        cursor.execute(f"SELECT {','.join(COLUMNS[direction])} FROM {direction}")
+        return read_cursor_chunks(cursor, COLUMNS[direction])
+    finally:
+        connection.close()
+
+
+def summarize(direction, data, query, **kwargs):
+    if direction == "inbound":
+        return inbound_summary(data, query["start_date"], query["end_date"], query["dc_name"], **kwargs)
+    return outbound_summary(data, query["start_date"], query["end_date"], query["dc_name"], query["bu_name"],
+                            query["channel_name"], **kwargs)
+
+
+# Original metrics path: boolean masks and nunique() on the object frame
+def legacy_metrics(direction, legacy_frame, query):
+    data = legacy_frame.assign(DATE=pd.to_datetime(legacy_frame['DATE']))
+    filtered = filter_rows(data, query["start_date"], query["end_date"], query["dc_name"],
+                           query.get("bu_name"), query.get("channel_name"))
+    return slice_kpis(filtered, INBOUND_DISTINCT if direction == "inbound" else OUTBOUND_DISTINCT)
+
+
+# Export stage: every filter combination over the full range, appended to a history store and
+# written as one CSV (both in a temporary directory)
+def export_all(loaded, directory):
+    start, end = loaded.catalog.min_date, loaded.catalog.max_date
+    records = [summary_record(loaded, start, end, combination) for combination in filter_grid(loaded.catalog)]
+    append_run(records, os.path.join(directory, 'history.sqlite'), source="benchmark")
+    write_output(pd.DataFrame.from_records(records), os.path.join(directory, f'{loaded.direction}.csv'))
+    return len(records)
+
+
+# Time every stage of one direction at one size; returns a list of result dicts
+def benchmark_direction(path, rows, direction, repeat=DEFAULT_REPEAT, track_memory=True, legacy=True):
+    results = []
+
+    def record(stage, function, stage_repeat=repeat):
+        seconds, peak, result = measure(function, stage_repeat, track_memory)
+        results.append({"rows": rows, "direction": direction, "stage": stage, "seconds": seconds,
+                        "peak_mb": None if peak is None else peak / 2**20})
+        print(f"  {direction:<8} {stage:<16} {seconds:9.4f}s" + ("" if peak is None else f"  {peak / 2**20:9.1f} MB"))
+        return result
+
+    queries = make_queries(direction)
+    if legacy:
+        legacy_frame = record("load_legacy", lambda: load_legacy(path, direction), 1)
+    data = record("load_streaming", lambda: load_streaming(path, direction), 1)
+    loaded = record("index", lambda: LoadedDirection(direction, data), 1)
+    record("filter", lambda: [loaded.index.select(**query) for query in queries])
+    if legacy:
+        record("metrics_legacy", lambda: [legacy_metrics(direction, legacy_frame, query) for query in queries])
+        del legacy_frame
+    record("metrics_slice", lambda: [summarize(direction, loaded.data, query, date_index=loaded.index) for query in queries])
+    record("metrics_cube", lambda: [summarize(direction, loaded.data, query, cube=loaded.cube) for query in queries])
+    with tempfile.TemporaryDirectory(prefix='benchmark_export_') as directory:
+        record("export", lambda: export_all(loaded, directory), 1)
+    return results
+
+
+def run_benchmark(sizes, seed=DEFAULT_SEED, data_dir=DEFAULT_DATA_DIR, repeat=DEFAULT_REPEAT, track_memory=True,
+                  legacy=True):
+    results = []
+    for rows in sizes:
+        path = ensure_database(rows, seed, data_dir)
+        print(f"{rows:,} rows per table")
+        for direction in ("inbound", "outbound"):
+            results.extend(benchmark_direction(path, rows, direction, repeat, track_memory, legacy))
+    return results
+
+
+def save_baseline(results, path=DEFAULT_BASELINE):
+    with open(path, 'w') as f:
+        json.dump({"created_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results}, f, indent=2)
+    print(f"Baseline saved to {path}")
+
+
+# Side-by-side table of the current results and the baseline (ratio > 1 means slower than baseline)
+def compare_to_baseline(results, path=DEFAULT_BASELINE):
+    with open(path) as f:
+        baseline = json.load(f)
+    keys = ["rows", "direction", "stage"]
+    current = pd.DataFrame(results).set_index(keys)
+    previous = pd.DataFrame(baseline["results"]).set_index(keys)
+    table = current.join(previous, rsuffix="_baseline", how="left")
+    table["time_ratio"] = table["seconds"] / table["seconds_baseline"]
+    print(f"Compared with baseline of {baseline['created_at']}:")
+    print(table[["seconds", "seconds_baseline", "time_ratio", "peak_mb", "peak_mb_baseline"]].to_string(float_format="%.4f"))
+    return table
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the load, filter, metrics and export stages on synthetic data.")
+    parser.add_argument('--sizes', nargs='+', default=DEFAULT_SIZES, help="rows per table, e.g. 100K 1M 10M")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR, help="where the SQLite stand-ins are kept")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="runs per stage (best time is kept)")
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc peak-memory runs")
+    parser.add_argument('--no-legacy', action='store_true', help="skip the legacy fetchall/object-frame stages")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument('--save-baseline', action='store_true', help="save these results as the new baseline")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = run_benchmark([parse_size(size) for size in args.sizes], args.seed, args.data_dir, args.repeat,
+                            not args.no_memory, not args.no_legacy)
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+    elif os.path.exists(args.baseline):
+        compare_to_baseline(results, args.baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
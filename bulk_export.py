@@ -0,0 +1,147 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from batch_summary import LoadedDirection, DIRECTIONS, OUTPUT_FILTER_COLUMNS, filter_grid, summary_record, load_direction, write_output
+
+# Bulk export of every DC x BU x ORDERTYPE combination (every DC for inbound), "All" roll-ups
+# included, computed across a process pool. The frame is never pickled: its columns are written
+# once as .npy files, partitioned by DC_NAME, and each worker memory-maps only its row range.
+#
+#   python bulk_export.py --start 2024-01-01 --end 2024-12-31 --output all_combinations.csv --workers 4
+
+DEFAULT_OUTPUT = 'summary_all_combinations.csv'
+DEFAULT_WORKERS = os.cpu_count() or 1
+
+# Column the shared arrays are partitioned on; one worker task per value, plus one for "All"
+PARTITION_COLUMN = "DC_NAME"
+
+# Categorical columns whose labels appear in the output; other categoricals (the ID columns)
+# only need their codes, so their categories are not written
+LABEL_COLUMNS = ("DC_NAME", "BUSINESSUNIT", "ORDERTYPE")
+
+LAYOUT_FILE = 'layout.json'
+
+
+# Write the columns of a frame as .npy arrays, rows grouped by DC_NAME (each group keeping its
+# DATE order). Returns the partitions as (DC label, first row, end row).
+def write_shared_columns(frame, directory):
+    codes = frame[PARTITION_COLUMN].cat.codes.to_numpy()
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+
+    layout = {"row_count": len(frame), "columns": {}}
+    for column in frame.columns:
+        values = frame[column]
+        path = os.path.join(directory, f'{column}.npy')
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            np.save(path, values.cat.codes.to_numpy()[order])
+            if column in LABEL_COLUMNS:
+                layout["columns"][column] = {"categories": [str(label) for label in values.cat.categories]}
+            else:
+                layout["columns"][column] = {"cardinality": len(values.cat.categories)}
+        else:
+            np.save(path, values.to_numpy()[order])
+            layout["columns"][column] = {}
+    with open(os.path.join(directory, LAYOUT_FILE), 'w') as f:
+        json.dump(layout, f)
+
+    labels = layout["columns"][PARTITION_COLUMN]["categories"]
+    boundaries = np.searchsorted(sorted_codes, np.arange(len(labels) + 1))
+    return [(label, int(boundaries[i]), int(boundaries[i + 1]))
+            for i, label in enumerate(labels) if boundaries[i] < boundaries[i + 1]]
+
+
+# Rebuild rows [start, stop) of a shared frame from its memory-mapped column arrays
+def read_shared_columns(directory, start, stop):
+    with open(os.path.join(directory, LAYOUT_FILE)) as f:
+        layout = json.load(f)
+    data = {}
+    for column, spec in layout["columns"].items():
+        values = np.load(os.path.join(directory, f'{column}.npy'), mmap_mode='r')[start:stop]
+        if "categories" in spec:
+            data[column] = pd.Categorical.from_codes(values, categories=spec["categories"])
+        elif "cardinality" in spec:
+            data[column] = pd.Categorical.from_codes(values, categories=pd.RangeIndex(spec["cardinality"]))
+        else:
+            data[column] = np.asarray(values)
+    return pd.DataFrame(data)
+
+
+# Worker task: the summaries of every combination whose DC is dc_label ("All" for the roll-ups)
+def summarize_partition(directory, direction, dc_label, start, stop, start_date, end_date):
+    loaded = LoadedDirection(direction, read_shared_columns(directory, start, stop))
+    return [summary_record(loaded, start_date, end_date, combination)
+            for combination in filter_grid(loaded.catalog)
+            if combination[PARTITION_COLUMN] == dc_label]
+
+
+# Reshape summary records into one row per (filters, KPI)
+def to_long_format(records):
+    wide = pd.DataFrame.from_records(records)
+    id_columns = [column for column in OUTPUT_FILTER_COLUMNS if column in wide.columns]
+    long = wide.melt(id_vars=id_columns, var_name="kpi", value_name="value").dropna(subset=["value"])
+    # Keep the KPIs of each combination together
+    return long.sort_values(id_columns, kind='stable', na_position='first').reset_index(drop=True)
+
+
+# Summaries of every filter combination of the given frames (direction -> frame) in long format
+def bulk_summaries(frames, start_date=None, end_date=None, workers=DEFAULT_WORKERS):
+    records = []
+    with tempfile.TemporaryDirectory(prefix='bulk_export_') as shared_root, \
+            ProcessPoolExecutor(max_workers=max(workers, 1)) as executor:
+        futures = []
+        for direction, frame in frames.items():
+            directory = os.path.join(shared_root, direction)
+            os.makedirs(directory)
+            partitions = write_shared_columns(frame, directory)
+            start = pd.Timestamp(start_date) if start_date else frame['DATE'].min()
+            end = pd.Timestamp(end_date) if end_date else frame['DATE'].max()
+            # The "All" roll-ups need every row; each DC only needs its own partition
+            for dc_label, first_row, end_row in [("All", 0, len(frame))] + partitions:
+                futures.append(executor.submit(summarize_partition, directory, direction, dc_label,
+                                               first_row, end_row, start, end))
+        for future in futures:
+            records.extend(future.result())
+    return to_long_format(records)
+
+
+# Compute every combination and write the single long-format table
+def bulk_export(frames, output_path=DEFAULT_OUTPUT, start_date=None, end_date=None, workers=DEFAULT_WORKERS):
+    started = time.perf_counter()
+    table = bulk_summaries(frames, start_date, end_date, workers)
+    write_output(table, output_path)
+    print(f"{len(table):,} rows written to {output_path} in {time.perf_counter() - started:.1f}s")
+    return table
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Export the summary KPIs of every filter combination in long format.")
+    parser.add_argument('--start', help="first DATE included (default: earliest loaded date)")
+    parser.add_argument('--end', help="last DATE included (default: latest loaded date)")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="worker processes")
+    parser.add_argument('--no-cache', action='store_true', help="stream the full tables instead of using the snapshot cache")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="output file (.csv, .xlsx or .parquet)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        frames = {direction: load_direction(direction, not args.no_cache).data for direction in DIRECTIONS}
+        bulk_export(frames, args.output, args.start, args.end, args.workers)
+    except Exception as e:
+        print(f"Bulk export failed: {str(e)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+# Presentation of metric values on the summary cards. The metrics layer only returns raw numbers;
+# K/M abbreviation happens here and nowhere else, so exports keep exact values.
+
+# Card labels shown as plain integers
+UNFORMATTED_LABELS = {"Days of Data"}
+
+# Card labels that depend on a distinct count, so carry its error bound in approximate mode
+ESTIMATED_LABELS = {
+    "Total IB Loads", "Total Orders", "SKUs with Movement",
+    "IB Lines Per PO", "IB Units Per PO", "OB Lines Per PO", "OB Units Per PO",
+}
+
+
+# Helper function to format numbers in K/M style
+def format_number(value):
+    if value >= 1_000_000:
+        return f"{value/1_000_000:.2f} M"
+    elif value >= 1_000:
+        return f"{value/1_000:.1f} K"
+    else:
+        return f"{value:.2f}"
+
+
+# Format an estimated count with its relative error, e.g. "~1.25 M ±2.3%"; exact when error is 0
+def format_estimate(value, error=0.0):
+    if not error:
+        return format_number(value)
+    return f"~{format_number(value)} ±{error:.1%}"
+
+
+# Card text of every value of a label -> raw value dict
+def format_cards(values, distinct_error=0.0):
+    cards = {}
+    for label, value in values.items():
+        if label in UNFORMATTED_LABELS:
+            cards[label] = value
+        elif label in ESTIMATED_LABELS:
+            cards[label] = format_estimate(value, distinct_error)
+        else:
+            cards[label] = format_number(value)
+    return cards
+
+
+# Card texts of the volumes and order profile sections of an Inbound/OutboundMetrics
+def volume_cards(metrics):
+    return format_cards(metrics.volumes(), metrics.distinct_error)
+
+
+def order_profile_cards(metrics):
+    return format_cards(metrics.order_profile(), metrics.distinct_error)
@@ -0,0 +1,52 @@
+import tkinter as tk
+
+from instrumentation import span
+
+
+# Grid of metric cards built once. Each card's value label is bound to a StringVar, so a filter
+# change only sets variables instead of destroying and recreating frames and labels. Updates are
+# batched: update() records the new values and a single after_idle() callback applies them.
+class CardGrid:
+    # sections: list of (title, first column, columnspan, metric names)
+    def __init__(self, parent, sections):
+        self.parent = parent
+        self.values = {}
+        self.pending = {}
+        self.redraw_scheduled = False
+
+        for title, first_col, columnspan, metrics in sections:
+            section_label = tk.Label(parent, text=title, font=('Arial', 14, 'bold'), anchor='w')
+            section_label.grid(row=0, column=first_col, columnspan=columnspan, pady=10, sticky='w')
+            for offset, metric in enumerate(metrics):
+                self.create_card(metric, 1, first_col + offset)
+
+    def create_card(self, metric, row, col):
+        frame = tk.Frame(self.parent, relief='solid', borderwidth=1, padx=5, pady=5, bg='white')
+        frame.config(highlightbackground="red", highlightcolor="red", highlightthickness=2)
+        frame.grid(row=row, column=col, padx=5, pady=5, ipadx=5, ipady=5)
+        label_title = tk.Label(frame, text=metric, font=('Arial', 10, 'bold'))
+        label_title.pack(side='top', anchor='center')
+
+        value = tk.StringVar(self.parent, value="...")
+        label_value = tk.Label(frame, textvariable=value, font=('Arial', 10))
+        label_value.pack(side='top', anchor='center')
+        self.values[metric] = value
+
+    # Queue new card values (any number of metric -> value dicts); applied on the next idle
+    def update(self, *card_dicts):
+        for cards in card_dicts:
+            for metric, value in cards.items():
+                if metric in self.values:
+                    self.pending[metric] = str(value)
+        if not self.redraw_scheduled:
+            self.redraw_scheduled = True
+            self.parent.after_idle(self.flush)
+
+    # Apply the queued values in one batch, skipping cards whose text did not change
+    def flush(self):
+        self.redraw_scheduled = False
+        pending, self.pending = self.pending, {}
+        with span("display.cards_flush", cards=len(pending)):
+            for metric, text in pending.items():
+                if self.values[metric].get() != text:
+                    self.values[metric].set(text)
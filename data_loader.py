@@ -0,0 +1,28 @@
+import pymysql.cursors
+
+from db_access import pooled_connection, INBOUND_TABLE, OUTBOUND_TABLE
+from typed_frames import (build_typed_chunk, concat_typed_chunks, read_cursor_chunks, INBOUND_COLUMNS,
+                          OUTBOUND_COLUMNS, DEFAULT_CHUNK_SIZE)
+from instrumentation import span
+
+
+# Stream a table through an unbuffered server-side cursor
+def stream_table(table, columns, chunk_size=DEFAULT_CHUNK_SIZE, progress_callback=None, where_clause="", params=None):
+    with pooled_connection() as connection:
+        cursor = connection.cursor(pymysql.cursors.SSCursor)
+        select_query = f"SELECT {','.join(columns)} FROM {table}{where_clause}"
+        with span("db.query", table=table):
+            cursor.execute(select_query, params)
+        frame = read_cursor_chunks(cursor, columns, chunk_size, progress_callback)
+        # The unbuffered result is fully read here, so the connection can go back to the pool
+        cursor.close()
+    return frame
+
+
+# Streaming loaders for the two summary tables
+def stream_inbound_table(chunk_size=DEFAULT_CHUNK_SIZE, progress_callback=None):
+    return stream_table(INBOUND_TABLE, INBOUND_COLUMNS, chunk_size, progress_callback)
+
+
+def stream_outbound_table(chunk_size=DEFAULT_CHUNK_SIZE, progress_callback=None):
+    return stream_table(OUTBOUND_TABLE, OUTBOUND_COLUMNS, chunk_size, progress_callback)
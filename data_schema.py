@@ -0,0 +1,119 @@
+import sys
+import datetime
+
+import numpy as np
+import pandas as pd
+
+# Compact in-memory type of every column loaded from the inbound and outbound tables:
+#   "date"     - datetime64 at second resolution (pandas has no day unit; 8 bytes per row either way)
+#   "id"       - dictionary-encoded categorical (int codes + one copy of each distinct string)
+#   "category" - low-cardinality text, also categorical
+#   "quantity" - int32 when every value is whole, else float64
+COLUMN_TYPES = {
+    "DATE": "date",
+    "LOAD_NUMBER": "id",
+    "PO_NUMBER": "id",
+    "ORDER_NUMBER": "id",
+    "SKU": "id",
+    "Qty": "quantity",
+    "DC_NAME": "category",
+    "BUSINESSUNIT": "category",
+    "ORDERTYPE": "category",
+}
+
+# Columns stored as pandas categoricals
+CATEGORY_COLUMNS = tuple(column for column, kind in COLUMN_TYPES.items() if kind in ("id", "category"))
+
+
+INT32_RANGE = (np.iinfo('int32').min, np.iinfo('int32').max)
+
+
+# Convert a Qty column (int, float or Decimal from pymysql) to int32 when every value is present,
+# whole and inside the int32 range, else float64. NULL and unparseable values stay NaN, so they
+# are left out of the unit sums instead of counting as 0.
+def to_compact_quantity(values):
+    quantity = pd.to_numeric(values, errors='coerce')
+    if len(quantity) and quantity.notna().all() and (quantity % 1 == 0).all() \
+            and INT32_RANGE[0] <= quantity.min() and quantity.max() <= INT32_RANGE[1]:
+        return quantity.astype('int32')
+    return quantity.astype('float64')
+
+
+# Number of values that were present but could not be converted
+def count_unparsed(values, converted):
+    return int((converted.isna() & pd.notna(values)).sum())
+
+
+# Convert a DATE column to datetime64[s]
+def to_compact_date(values):
+    dates = pd.to_datetime(values)
+    if dates.dtype != 'datetime64[s]':
+        dates = dates.astype('datetime64[s]')
+    return dates
+
+
+# Apply COLUMN_TYPES to a frame in place; columns already in their compact type are left alone.
+# The number of Qty values that could not be read is kept in frame.attrs["unparsed_quantities"].
+def apply_schema(frame):
+    unparsed = 0
+    for column in frame.columns:
+        kind = COLUMN_TYPES.get(column)
+        if kind == "date":
+            frame[column] = to_compact_date(frame[column])
+        elif kind == "quantity" and frame[column].dtype not in ('int32', 'float64'):
+            quantity = to_compact_quantity(frame[column])
+            unparsed += count_unparsed(frame[column], quantity)
+            frame[column] = quantity
+        elif kind in ("id", "category") and not isinstance(frame[column].dtype, pd.CategoricalDtype):
+            frame[column] = frame[column].astype('category')
+    frame.attrs["unparsed_quantities"] = unparsed
+    return frame
+
+
+# Bytes held by a frame, counting the strings behind object columns
+def memory_bytes(frame):
+    return int(frame.memory_usage(deep=True, index=False).sum())
+
+
+# Rows and bytes of a DataFrame result, as span fields for traced(measure=frame_size)
+def frame_size(frame):
+    if frame is None or not hasattr(frame, 'memory_usage'):
+        return {}
+    return {"rows": len(frame), "bytes": memory_bytes(frame)}
+
+
+# Estimated bytes of the same frame held as Python objects, as pd.DataFrame(fetchall()) builds it.
+# Computed from the categories and their counts, without materializing the object columns.
+def object_memory_estimate(frame):
+    pointer = np.dtype(object).itemsize
+    total = 0
+    for column in frame.columns:
+        values = frame[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            codes = values.cat.codes.to_numpy()
+            counts = np.bincount(codes[codes >= 0], minlength=len(values.cat.categories))
+            sizes = np.fromiter((sys.getsizeof(category) for category in values.cat.categories), dtype='int64',
+                                count=len(values.cat.categories))
+            total += int(counts @ sizes) + pointer * len(values)
+        elif COLUMN_TYPES.get(column) == "date":
+            total += (sys.getsizeof(datetime.datetime(2024, 1, 1)) + pointer) * len(values)
+        elif COLUMN_TYPES.get(column) == "quantity":
+            total += (sys.getsizeof(1.0) + pointer) * len(values)
+        else:
+            total += int(values.memory_usage(deep=True, index=False))
+    return total
+
+
+# Print the memory of a loaded frame against its object-dtype equivalent, and how many Qty values
+# could not be read
+def report_memory(name, frame, before_bytes=None):
+    if before_bytes is None:
+        before_bytes = object_memory_estimate(frame)
+    after_bytes = memory_bytes(frame)
+    ratio = before_bytes / after_bytes if after_bytes else 0
+    message = (f"{name}: {len(frame):,} rows, {before_bytes / 2**20:,.1f} MB as objects -> "
+               f"{after_bytes / 2**20:,.1f} MB compact ({ratio:.1f}x smaller)")
+    unparsed = frame.attrs.get("unparsed_quantities", 0)
+    if unparsed:
+        message += f"; {unparsed:,} Qty values could not be read as numbers and are left empty"
+    print(message)
@@ -0,0 +1,218 @@
+from collections import OrderedDict
+
+import pandas as pd
+from tkinter import ttk, messagebox
+from tkcalendar import DateEntry
+
+from data_loader import INBOUND_COLUMNS, OUTBOUND_COLUMNS
+from snapshot_cache import load_table_cached
+from batch_summary import LoadedDirection
+from card_grid import CardGrid
+from card_format import volume_cards, order_profile_cards
+from instrumentation import span
+
+# Loaded dataset tabs are unloaded (least recently opened first) above this many bytes
+DEFAULT_MEMORY_BUDGET_BYTES = 1024 * 2**20
+
+COLUMNS = {"inbound": INBOUND_COLUMNS, "outbound": OUTBOUND_COLUMNS}
+# Filter label text, shared with the main summary tab
+FILTER_LABELS = {"DC_NAME": "DC NAME", "BUSINESSUNIT": "BUSINESSUNIT", "ORDERTYPE": "ORDERTYPE"}
+
+
+# Load one direction of a dataset and index it (runs on a worker thread). The snapshot cache makes
+# reopening an unloaded tab cheap: only rows newer than its high-water mark are fetched.
+def load_dataset_direction(dataset, direction, progress_callback=None):
+    spec = dataset.table(direction)
+    with span("tab.load", dataset=dataset.name, direction=direction) as load_span:
+        data = load_table_cached(spec.source, COLUMNS[direction], progress_callback=progress_callback,
+                                 cache_name=spec.cache_name)
+        loaded = LoadedDirection(direction, data)
+        load_span.update(rows=len(loaded.data), bytes=loaded.memory_bytes())
+    return loaded
+
+
+# Filters, date pickers and cards of one direction inside a dataset tab
+class DirectionSection:
+    def __init__(self, tab, parent, direction):
+        self.tab = tab
+        self.direction = direction
+        self.loaded = None
+        self.card_grid = None
+
+        filter_frame = ttk.Frame(parent)
+        filter_frame.pack(fill='x')
+        heading_label = ttk.Label(filter_frame, text=f"{direction.capitalize()} Data Summary", font=('Arial', 14, 'bold'),
+                                  background="#FF3B00", foreground="white")
+        heading_label.pack(side="top", pady=(10, 5))
+        self.filters = {}
+        for column in (["DC_NAME"] if direction == "inbound" else ["DC_NAME", "BUSINESSUNIT", "ORDERTYPE"]):
+            ttk.Label(filter_frame, text=FILTER_LABELS[column], font=('Arial', 10)).pack(side="left", padx=10)
+            combobox = ttk.Combobox(filter_frame, values=["All"], state='readonly', font=('Arial', 10))
+            combobox.set("All")
+            combobox.pack(side="left", padx=10)
+            combobox.bind("<<ComboboxSelected>>", self.on_filter_change)
+            self.filters[column] = combobox
+        self.date_entries = []
+        for text in ("From Date:", "To Date:"):
+            ttk.Label(filter_frame, text=text).pack(side='left', padx=10)
+            entry = DateEntry(filter_frame, selectmode='day', state='disabled')
+            entry.pack(side='left', padx=10)
+            entry.bind("<<DateEntrySelected>>", self.on_filter_change)
+            self.date_entries.append(entry)
+        self.card_frame = ttk.Frame(parent)
+        self.card_frame.pack(fill='x', pady=10)
+
+    # A freshly loaded frame: fill the filter lists and date bounds, then compute
+    def set_loaded(self, loaded):
+        self.loaded = loaded
+        catalog = loaded.catalog
+        if catalog.min_date is not None:
+            for entry in self.date_entries:
+                entry.config(mindate=catalog.min_date, maxdate=catalog.max_date, state='normal')
+            self.date_entries[0].set_date(catalog.min_date)
+            self.date_entries[1].set_date(catalog.max_date)
+        self.refresh_filter_values()
+        self.recompute()
+
+    def unload(self):
+        self.loaded = None
+        self.tab.scheduler.cancel(self.key)
+        if self.card_grid is not None:
+            self.card_grid.update({metric: "..." for metric in self.card_grid.values})
+
+    @property
+    def key(self):
+        return f"{self.tab.dataset.name}:{self.direction}"
+
+    # Cascading filter lists (the BUs of the chosen DC, ...); a stale choice falls back to "All"
+    def refresh_filter_values(self):
+        selections = {}
+        for column, combobox in self.filters.items():
+            values = self.loaded.catalog.values(column, selections)
+            combobox.config(values=values)
+            if combobox.get() not in values:
+                combobox.set("All")
+            selections[column] = combobox.get()
+
+    def on_filter_change(self, event=None):
+        if self.loaded is None:
+            return
+        self.refresh_filter_values()
+        self.recompute()
+
+    def recompute(self):
+        loaded = self.loaded
+        start_date, end_date = (pd.Timestamp(entry.get_date()) for entry in self.date_entries)
+        combination = {column: combobox.get() for column, combobox in self.filters.items()}
+        self.tab.scheduler.request(
+            self.key,
+            lambda: loaded.summary(start_date, end_date, combination),
+            self.paint,
+            lambda error: messagebox.showerror("Error", f"Failed to compute {self.direction} metrics: {str(error)}"))
+
+    def paint(self, metrics):
+        volumes, order_profile = volume_cards(metrics), order_profile_cards(metrics)
+        # The cards are built on first use and afterwards only have their values updated
+        if self.card_grid is None:
+            title = self.direction.capitalize()
+            self.card_grid = CardGrid(self.card_frame, [
+                (f"{title} Volumes", 0, 6, list(volumes)),
+                (f"{title} Order Profile", 6, 3, list(order_profile)),
+            ])
+        self.card_grid.update(volumes, order_profile)
+
+
+# Notebook tab of one registered dataset. Nothing is fetched until the tab is first opened;
+# the budget may unload it later, and opening it again reloads it.
+class DatasetTab:
+    def __init__(self, notebook, dataset, loader, scheduler, budget):
+        self.dataset = dataset
+        self.loader = loader
+        self.scheduler = scheduler
+        self.budget = budget
+        self.state = "unloaded"  # "loading" / "loaded"
+        self.pending = set()
+
+        self.frame = ttk.Frame(notebook)
+        notebook.add(self.frame, text=dataset.name)
+        self.status_label = ttk.Label(self.frame, text="Opens on first view", font=('Arial', 9))
+        self.status_label.pack(side='bottom')
+        self.sections = {direction: DirectionSection(self, self.frame, direction) for direction in ("inbound", "outbound")}
+
+    # Called when the tab is selected
+    def on_opened(self):
+        self.budget.touch(self)
+        if self.state == "unloaded":
+            self.load()
+
+    def load(self):
+        self.state = "loading"
+        self.pending = set(self.sections)
+        self.status_label.config(text=f"Loading {self.dataset.name}...")
+        for direction in self.sections:
+            self.loader.submit(load_dataset_direction, self.dataset, direction, self.progress(direction),
+                               on_done=lambda loaded, direction=direction: self.apply_loaded(direction, loaded),
+                               on_error=self.show_load_error)
+
+    def progress(self, direction):
+        def callback(rows_loaded):
+            self.loader.post(self.status_label.config, text=f"Loading {self.dataset.name} {direction} data... {rows_loaded:,} rows")
+        return callback
+
+    def apply_loaded(self, direction, loaded):
+        if self.state != "loading":
+            return
+        self.sections[direction].set_loaded(loaded)
+        self.pending.discard(direction)
+        if not self.pending:
+            self.state = "loaded"
+            self.status_label.config(text="")
+            self.budget.enforce(keep=self)
+
+    # The first failed direction cancels the load: directions that already loaded are dropped, and
+    # a second failure of the same load shows no further dialog
+    def show_load_error(self, error):
+        if self.state != "loading":
+            return
+        self.state = "unloaded"
+        self.pending = set()
+        for section in self.sections.values():
+            if section.loaded is not None:
+                section.unload()
+        self.status_label.config(text=f"Failed to load {self.dataset.name}")
+        messagebox.showerror("Error", f"Failed to load {self.dataset.name}: {str(error)}")
+
+    # Drop the loaded frames; the tab reloads when it is opened again
+    def unload(self):
+        with span("tab.unload", dataset=self.dataset.name, bytes=self.memory_bytes()):
+            for section in self.sections.values():
+                section.unload()
+        self.state = "unloaded"
+        self.status_label.config(text="Unloaded to stay within the memory budget; reloads when opened")
+
+    # Bytes of every loaded direction: frames, date indexes, cubes and catalogs
+    def memory_bytes(self):
+        return sum(section.loaded.memory_bytes() for section in self.sections.values() if section.loaded is not None)
+
+
+# Memory budget over the dataset tabs: after a tab loads, the least recently opened loaded tabs
+# are unloaded until the total is back under budget_bytes (the tab just loaded is always kept)
+class TabMemoryBudget:
+    def __init__(self, budget_bytes=DEFAULT_MEMORY_BUDGET_BYTES):
+        self.budget_bytes = budget_bytes
+        self.tabs = OrderedDict()
+
+    # Mark a tab as the most recently opened
+    def touch(self, tab):
+        self.tabs[tab] = True
+        self.tabs.move_to_end(tab)
+
+    def total_bytes(self):
+        return sum(tab.memory_bytes() for tab in self.tabs)
+
+    def enforce(self, keep=None):
+        for tab in list(self.tabs):
+            if self.total_bytes() <= self.budget_bytes:
+                return
+            if tab is not keep and tab.state == "loaded":
+                tab.unload()
@@ -0,0 +1,92 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+# Columns that get a partition map (row positions per value) next to the date index
+PARTITION_COLUMNS = ("DC_NAME",)
+
+
+# Sort a frame by DATE once, so date ranges become contiguous row ranges
+def sort_by_date(frame):
+    if not pd.api.types.is_datetime64_any_dtype(frame['DATE']):
+        frame = frame.assign(DATE=pd.to_datetime(frame['DATE']))
+    if frame['DATE'].is_monotonic_increasing:
+        return frame.reset_index(drop=True)
+    return frame.sort_values('DATE', kind='stable', ignore_index=True)
+
+
+# Date index over a frame already sorted by DATE.
+# A date range is found with two binary searches and returned as an iloc slice (no boolean
+# masks, no copy); a DC filter narrows the DC's sorted row positions to that range, so only
+# the matching rows are gathered. BU/channel filters then run on the slice only.
+class DateIndex:
+    def __init__(self, frame):
+        self.frame = frame
+        self.dates = frame['DATE'].to_numpy()
+
+        self.partitions = {}
+        for column in PARTITION_COLUMNS:
+            if column not in frame.columns:
+                continue
+            codes, uniques = pd.factorize(frame[column])
+            order = np.argsort(codes, kind='stable')
+            boundaries = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+            self.partitions[column] = {
+                value: order[boundaries[i]:boundaries[i + 1]] for i, value in enumerate(uniques)
+            }
+
+    # Index of frame, which is this index's frame with the rows from first_row on replaced by new
+    # ones (still sorted by DATE): partition positions before first_row are kept and those of the
+    # new rows are appended, so only the new rows are factorized
+    def replace_tail(self, frame, first_row):
+        tail = DateIndex(frame.iloc[first_row:])
+        index = copy.copy(self)
+        index.frame = frame
+        index.dates = frame['DATE'].to_numpy()
+        index.partitions = {}
+        empty = np.empty(0, dtype=np.intp)
+        for column, partition in self.partitions.items():
+            tail_partition = tail.partitions.get(column, {})
+            merged = {}
+            for value in list(partition) + [value for value in tail_partition if value not in partition]:
+                kept = partition.get(value, empty)
+                merged[value] = np.concatenate([kept[:np.searchsorted(kept, first_row)],
+                                                tail_partition.get(value, empty) + first_row])
+            index.partitions[column] = merged
+        return index
+
+    # Row range [lo, hi) of the dates between start_date and end_date, both inclusive
+    def date_range(self, start_date, end_date):
+        lo = np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start_date)), side='left')
+        hi = np.searchsorted(self.dates, np.datetime64(pd.Timestamp(end_date)), side='right')
+        return lo, max(lo, hi)
+
+    # Bytes held by the index: the partition positions, plus the dates when they are not a view
+    # of the frame's DATE column
+    def memory_bytes(self):
+        total = sum(positions.nbytes for partition in self.partitions.values() for positions in partition.values())
+        if not np.shares_memory(self.dates, self.frame['DATE'].to_numpy()):
+            total += self.dates.nbytes
+        return total
+
+    # Rows matching the summary filters; "All" or empty means the filter is not applied
+    def select(self, start_date=None, end_date=None, dc_name=None, bu_name=None, channel_name=None):
+        lo, hi = (0, len(self.frame))
+        if start_date and end_date:
+            lo, hi = self.date_range(start_date, end_date)
+
+        if dc_name and dc_name != "All" and "DC_NAME" in self.partitions:
+            positions = self.partitions["DC_NAME"].get(dc_name, np.empty(0, dtype=np.intp))
+            first, last = np.searchsorted(positions, [lo, hi])
+            selected = self.frame.take(positions[first:last])
+        else:
+            selected = self.frame.iloc[lo:hi]
+            if dc_name and dc_name != "All":
+                selected = selected[selected['DC_NAME'] == dc_name]
+
+        if bu_name and bu_name != "All":
+            selected = selected[selected['BUSINESSUNIT'] == bu_name]
+        if channel_name and channel_name != "All":
+            selected = selected[selected['ORDERTYPE'] == channel_name]
+        return selected
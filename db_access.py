@@ -0,0 +1,119 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+import pymysql
+
+from instrumentation import span
+from table_registry import default_dataset
+
+# Connection settings shared by every query against the client MySQL server
+DB_HOST = '10.216.252.8'
+DB_PORT = 3306
+DB_NAME = 'client_data'
+
+sslca = 'server-ca.pem'
+sslkey = 'client-key.pem'
+sslcert = 'client-cert.pem'
+
+# Source tables for the inbound and outbound summaries: those of the registry's default dataset
+# (see table_registry.json)
+DEFAULT_DATASET = default_dataset()
+INBOUND_TABLE = DEFAULT_DATASET.inbound.source
+OUTBOUND_TABLE = DEFAULT_DATASET.outbound.source
+
+
+# Function to open a new SSL connection to the MySQL server. The credentials module is imported
+# here, so modules that only import the pool (the benchmark, the tests) run without it.
+def open_connection(db=DB_NAME, **kwargs):
+    import Shared
+    return pymysql.connect(
+        host=DB_HOST,
+        user=Shared.userid,
+        passwd=Shared.password,
+        db=db,
+        port=DB_PORT,
+        ssl_ca=sslca,
+        ssl_key=sslkey,
+        ssl_cert=sslcert,
+        **kwargs
+    )
+
+
+# Maximum number of open connections kept by the shared pool
+DEFAULT_POOL_SIZE = 8
+# Idle connections older than this are closed instead of being reused
+POOL_MAX_IDLE_SECONDS = 300
+
+
+# Bounded pool of reusable connections, so concurrent queries share a few SSL sessions
+# instead of each paying a TLS handshake. A connection is pinged (reconnecting if the
+# server dropped it) when it is checked out, and discarded when a query fails on it.
+class ConnectionPool:
+    def __init__(self, max_size=DEFAULT_POOL_SIZE, max_idle_seconds=POOL_MAX_IDLE_SECONDS, connect=open_connection):
+        self.max_size = max_size
+        self.max_idle_seconds = max_idle_seconds
+        self.connect = connect
+        self.idle = queue.LifoQueue()
+        self.slots = threading.BoundedSemaphore(max_size)
+
+    # Most recently used healthy idle connection, or a new one
+    def checkout(self):
+        while True:
+            try:
+                connection, released_at = self.idle.get_nowait()
+            except queue.Empty:
+                with span("db.connect"):
+                    return self.connect()
+            if time.monotonic() - released_at > self.max_idle_seconds:
+                self.discard(connection)
+                continue
+            try:
+                with span("db.ping"):
+                    connection.ping(reconnect=True)
+                return connection
+            except pymysql.Error:
+                self.discard(connection)
+
+    def discard(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    # Borrow a connection for a with-block; blocks while max_size connections are in use
+    @contextmanager
+    def connection(self):
+        self.slots.acquire()
+        connection = None
+        try:
+            connection = self.checkout()
+            yield connection
+        except Exception:
+            if connection is not None:
+                self.discard(connection)
+                connection = None
+            raise
+        finally:
+            if connection is not None:
+                self.idle.put((connection, time.monotonic()))
+            self.slots.release()
+
+    # Close every idle connection (e.g. when the application exits)
+    def close_all(self):
+        while True:
+            try:
+                connection, _ = self.idle.get_nowait()
+            except queue.Empty:
+                return
+            self.discard(connection)
+
+
+pool = ConnectionPool()
+
+
+# Borrow a connection from the shared pool
+def pooled_connection():
+    return pool.connection()
+
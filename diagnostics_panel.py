@@ -0,0 +1,99 @@
+import time
+from tkinter import ttk, messagebox
+
+# Most recent spans listed in the panel (the recorder may hold more)
+DEFAULT_VISIBLE_SPANS = 500
+
+SUMMARY_COLUMNS = [("name", "Span", 220), ("count", "Count", 60), ("total_seconds", "Total s", 80),
+                   ("mean_seconds", "Mean s", 80), ("max_seconds", "Max s", 80)]
+SPAN_COLUMNS = [("started_at", "Started", 90), ("name", "Span", 220), ("thread", "Thread", 110),
+                ("seconds", "Seconds", 80), ("rows", "Rows", 90), ("bytes", "MB", 70),
+                ("rss_delta", "RSS delta MB", 90), ("error", "Error", 200)]
+
+
+# Text of one span field in the tables
+def format_field(key, value):
+    if value is None or value == "":
+        return ""
+    if key == "started_at":
+        return time.strftime("%H:%M:%S", time.localtime(value))
+    if key in ("bytes", "rss_delta"):
+        return f"{value / 2**20:,.1f}"
+    if key.endswith("seconds"):
+        return f"{value:.4f}"
+    if isinstance(value, int):
+        return f"{value:,}"
+    return str(value)
+
+
+# One-line text of MetricsCache.stats()
+def format_cache_stats(stats):
+    return (f"Metrics cache: {stats['hits']:,} hits, {stats['misses']:,} misses "
+            f"({stats['hit_rate']:.1%} hit rate), {stats['size']:,}/{stats['max_size']:,} entries")
+
+
+# Diagnostics tab: per-span totals and the most recent spans of a SpanRecorder, with buttons to
+# refresh, clear and dump the trace to a JSON file. cache_stats, when given, returns the metrics
+# cache counters shown above the tables. Nothing is redrawn unless refresh() is called.
+class DiagnosticsPanel:
+    def __init__(self, parent, recorder, visible_spans=DEFAULT_VISIBLE_SPANS, cache_stats=None):
+        self.recorder = recorder
+        self.visible_spans = visible_spans
+        self.cache_stats = cache_stats
+
+        buttons = ttk.Frame(parent)
+        buttons.pack(side='top', fill='x', pady=5)
+        ttk.Button(buttons, text="Refresh", command=self.refresh).pack(side='left', padx=5)
+        ttk.Button(buttons, text="Clear", command=self.clear).pack(side='left', padx=5)
+        ttk.Button(buttons, text="Dump Trace", command=self.dump).pack(side='left', padx=5)
+        self.status_label = ttk.Label(buttons, text="", font=('Arial', 9))
+        self.status_label.pack(side='left', padx=10)
+        self.cache_label = ttk.Label(parent, text="", font=('Arial', 9))
+        self.cache_label.pack(side='top', anchor='w', padx=5)
+
+        self.summary_table = self.create_table(parent, SUMMARY_COLUMNS, height=8)
+        self.span_table = self.create_table(parent, SPAN_COLUMNS, height=15)
+
+    def create_table(self, parent, columns, height):
+        frame = ttk.Frame(parent)
+        frame.pack(side='top', fill='both', expand=True, padx=5, pady=5)
+        table = ttk.Treeview(frame, columns=[key for key, _, _ in columns], show='headings', height=height)
+        for key, heading, width in columns:
+            table.heading(key, text=heading)
+            table.column(key, width=width, anchor='w' if key in ("name", "thread", "error") else 'e')
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=table.yview)
+        table.configure(yscrollcommand=scrollbar.set)
+        table.pack(side='left', fill='both', expand=True)
+        scrollbar.pack(side='right', fill='y')
+        return table
+
+    # Reload both tables from the recorder (newest spans first)
+    def refresh(self):
+        spans = self.recorder.snapshot()
+        self.fill(self.summary_table, SUMMARY_COLUMNS, self.recorder.summary())
+        self.fill(self.span_table, SPAN_COLUMNS, reversed(spans[-self.visible_spans:]))
+        self.status_label.config(text=f"{len(spans):,} spans recorded")
+        if self.cache_stats is not None:
+            self.cache_label.config(text=format_cache_stats(self.cache_stats()))
+
+    def fill(self, table, columns, records):
+        table.delete(*table.get_children())
+        for record in records:
+            # Nested spans are indented under their caller
+            values = [format_field(key, record.get(key)) for key, _, _ in columns]
+            if "depth" in record:
+                values[[key for key, _, _ in columns].index("name")] = "  " * record["depth"] + record["name"]
+            table.insert('', 'end', values=values)
+
+    def clear(self):
+        self.recorder.clear()
+        self.refresh()
+
+    def dump(self):
+        path = f'diagnostics_trace_{time.strftime("%Y%m%d_%H%M%S")}.json'
+        try:
+            count = self.recorder.dump(path)
+        except OSError as e:
+            messagebox.showerror("Error", f"Failed to write trace file: {str(e)}")
+            return
+        messagebox.showinfo("Success", f"{count:,} spans written to {path}")
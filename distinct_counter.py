@@ -0,0 +1,59 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+# Dense integer codes of an ID column and the number of possible codes.
+# Categorical columns (see data_schema) already carry their codes, so nothing is hashed;
+# any other column is factorized once. Missing values have code -1.
+def dense_codes(values):
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), len(values.cat.categories)
+    codes, uniques = pd.factorize(values)
+    return codes, len(uniques)
+
+
+# Distinct counts over dense integer codes using a reusable bitmap per thread.
+# Counting is one pass marking codes in the bitmap plus a popcount; the bitmap has one
+# extra slot at the end, so the -1 of a missing ID marks that slot and is not counted,
+# without building a filtered copy of the codes. After counting, only the marked
+# entries are cleared when that is cheaper than clearing the whole bitmap.
+class DistinctCounter:
+    def __init__(self):
+        self.local = threading.local()
+
+    def bitmap(self, cardinality):
+        bitmap = getattr(self.local, 'bitmap', None)
+        if bitmap is None or len(bitmap) < cardinality + 1:
+            bitmap = np.zeros(cardinality + 1, dtype=bool)
+            self.local.bitmap = bitmap
+        return bitmap
+
+    # Number of distinct non-negative codes, each below cardinality
+    def count(self, codes, cardinality):
+        if len(codes) == 0 or cardinality == 0:
+            return 0
+        bitmap = self.bitmap(cardinality)
+        view = bitmap[:cardinality + 1]
+        # -1 indexes the last slot of the view, i.e. the sentinel
+        view[codes] = True
+        distinct = int(np.count_nonzero(view[:cardinality]))
+        if len(codes) < cardinality // 8:
+            view[codes] = False
+        else:
+            view[:] = False
+        return distinct
+
+    # Number of distinct non-missing values of a column (same result as Series.nunique())
+    def count_column(self, values):
+        codes, cardinality = dense_codes(values)
+        return self.count(codes, cardinality)
+
+
+counter = DistinctCounter()
+
+
+# Distinct count of a column through the shared counter
+def count_distinct(values):
+    return counter.count_column(values)
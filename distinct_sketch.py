@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+
+from metrics_cube import MetricsCube, FILTER_COLUMNS, INBOUND_CUBE_SPEC, OUTBOUND_CUBE_SPEC
+
+# HyperLogLog precision: 2**11 one-byte registers per sketch, about 2.3% relative standard error.
+# At least 11 so the 64 - precision hash bits left for the rank fit exactly in a float64.
+DEFAULT_PRECISION = 11
+
+# Slices with fewer lines than this are counted exactly instead of estimated
+DEFAULT_EXACT_BELOW_ROWS = 1_000_000
+
+# Sketches are kept per day and DC for both directions
+SKETCH_DIMENSIONS = ["DC_NAME"]
+
+
+# 64-bit hash of every value of an ID column; missing values are returned as a mask.
+# For categoricals only the categories are hashed and the row hashes are gathered by code.
+def hash_ids(values):
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes = values.cat.codes.to_numpy()
+        category_hashes = pd.util.hash_array(values.cat.categories.to_numpy(dtype=object))
+        return category_hashes[np.maximum(codes, 0)], codes >= 0
+    hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+    return hashes, values.notna().to_numpy()
+
+
+# Register index (top bits) and rank (position of the first 1 bit in the rest) of each hash
+def register_updates(hashes, precision=DEFAULT_PRECISION):
+    remaining_bits = 64 - precision
+    index = (hashes >> np.uint64(remaining_bits)).astype('int64')
+    rest = (hashes & np.uint64((1 << remaining_bits) - 1)).astype('float64')
+    bit_length = np.frexp(rest)[1]
+    rank = (remaining_bits - bit_length + 1).astype('uint8')
+    return index, rank
+
+
+# Cardinality estimate of one merged sketch, with the small-range (linear counting) correction
+def estimate(registers):
+    m = len(registers)
+    alpha = 0.7213 / (1 + 1.079 / m)
+    raw = alpha * m * m / np.sum(np.exp2(-registers.astype('float64')))
+    zeros = int(np.count_nonzero(registers == 0))
+    if raw <= 2.5 * m and zeros:
+        return m * np.log(m / zeros)
+    return raw
+
+
+# Relative standard error of a sketch of the given precision
+def relative_error(precision=DEFAULT_PRECISION):
+    return 1.04 / np.sqrt(1 << precision)
+
+
+# Cube of per-(day, DC) HyperLogLog sketches. Lines, units and dates are summed exactly as in
+# MetricsCube; distinct counts are estimated by taking the register-wise max of the selected
+# sketches, which is the sketch of their union. Filters the sketches are not keyed on
+# (business unit, channel) and small slices are left to the exact path: query() returns None.
+class SketchCube(MetricsCube):
+    def __init__(self, frame, distinct, precision=DEFAULT_PRECISION, exact_below_rows=DEFAULT_EXACT_BELOW_ROWS):
+        self.precision = precision
+        self.exact_below_rows = exact_below_rows
+        super().__init__(frame, SKETCH_DIMENSIONS, distinct)
+
+    def build_distinct(self, frame, cell_ids):
+        size = 1 << self.precision
+        self.registers = {}
+        for column in set(self.distinct.values()):
+            hashes, valid = hash_ids(frame[column])
+            index, rank = register_updates(hashes[valid], self.precision)
+            registers = np.zeros(len(self.cells) * size, dtype='uint8')
+            np.maximum.at(registers, cell_ids[valid].astype('int64') * size + index, rank)
+            self.registers[column] = registers.reshape(len(self.cells), size)
+
+    # Registers are kept per cell, so the first keep cells' rows are kept and tail's appended
+    def replace_tail_distinct(self, previous, keep, tail):
+        self.registers = {column: np.concatenate([registers[:keep], tail.registers[column]])
+                          for column, registers in previous.registers.items()}
+
+    def distinct_bytes(self):
+        return sum(registers.nbytes for registers in self.registers.values())
+
+    def distinct_count(self, column, cell_mask):
+        if not cell_mask.any():
+            return 0
+        merged = self.registers[column][cell_mask].max(axis=0)
+        return int(round(estimate(merged)))
+
+    def query(self, start_date=None, end_date=None, **filters):
+        for argument, value in filters.items():
+            if value and value != "All" and FILTER_COLUMNS[argument] not in self.dimensions:
+                return None
+        cell_mask = self.select_cells(start_date, end_date, **filters)
+        if int(self.cells['lines'].to_numpy()[cell_mask].sum()) < self.exact_below_rows:
+            return None
+        kpis = super().query(start_date, end_date, **filters)
+        kpis["distinct_error"] = relative_error(self.precision)
+        return kpis
+
+
+# Build the sketch cubes for the inbound and outbound frames
+def build_inbound_sketches(inbound_data, exact_below_rows=DEFAULT_EXACT_BELOW_ROWS):
+    return SketchCube(inbound_data, INBOUND_CUBE_SPEC["distinct"], exact_below_rows=exact_below_rows)
+
+
+def build_outbound_sketches(outbound_data, exact_below_rows=DEFAULT_EXACT_BELOW_ROWS):
+    return SketchCube(outbound_data, OUTBOUND_CUBE_SPEC["distinct"], exact_below_rows=exact_below_rows)
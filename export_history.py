@@ -0,0 +1,117 @@
+import os
+import sqlite3
+import time
+
+import pandas as pd
+
+# Single SQLite store every export run is appended to, instead of one pair of CSV files per click.
+# export_runs has one row per run; export_kpis one row per direction (and filter combination) of a run.
+DEFAULT_HISTORY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'export_history.sqlite')
+
+FILTER_COLUMNS = ["direction", "DC_NAME", "BUSINESSUNIT", "ORDERTYPE", "start_date", "end_date"]
+KPI_COLUMNS = ["days_of_data", "total_loads", "total_orders", "total_lines", "total_units", "total_skus",
+               "distinct_error", "units_per_line", "lines_per_po", "units_per_po"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS export_runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    exported_at TEXT NOT NULL,
+    source TEXT
+);
+CREATE TABLE IF NOT EXISTS export_kpis (
+    run_id INTEGER NOT NULL REFERENCES export_runs(run_id),
+    direction TEXT NOT NULL,
+    DC_NAME TEXT,
+    BUSINESSUNIT TEXT,
+    ORDERTYPE TEXT,
+    start_date TEXT,
+    end_date TEXT,
+    days_of_data INTEGER,
+    total_loads INTEGER,
+    total_orders INTEGER,
+    total_lines INTEGER,
+    total_units REAL,
+    total_skus INTEGER,
+    distinct_error REAL,
+    units_per_line REAL,
+    lines_per_po REAL,
+    units_per_po REAL
+);
+CREATE INDEX IF NOT EXISTS export_kpis_filters ON export_kpis (direction, DC_NAME, BUSINESSUNIT, ORDERTYPE);
+"""
+
+
+def open_history(path=DEFAULT_HISTORY_PATH):
+    connection = sqlite3.connect(path)
+    connection.executescript(SCHEMA)
+    return connection
+
+
+# One history row for a direction's metrics (InboundMetrics/OutboundMetrics) and its filters
+def export_record(direction, metrics, start_date, end_date, dc_name="All", bu_name=None, channel_name=None):
+    record = {"direction": direction, "DC_NAME": dc_name, "BUSINESSUNIT": bu_name, "ORDERTYPE": channel_name,
+              "start_date": start_date, "end_date": end_date}
+    record.update(metrics.kpi_record())
+    return record
+
+
+# SQLite-friendly value: dates as ISO day strings, numpy scalars as Python numbers, NaN as NULL
+def to_sql_value(value):
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if hasattr(value, 'isoformat'):
+        return pd.Timestamp(value).date().isoformat()
+    if hasattr(value, 'item'):  # numpy scalar
+        return value.item()
+    return value
+
+
+# Append one run (a list of records shaped like export_record()) in a single transaction; returns its run_id
+def append_run(records, path=DEFAULT_HISTORY_PATH, source="ui", exported_at=None):
+    exported_at = exported_at or time.strftime("%Y-%m-%dT%H:%M:%S")
+    columns = FILTER_COLUMNS + KPI_COLUMNS
+    insert = f"INSERT INTO export_kpis (run_id, {', '.join(columns)}) VALUES ({', '.join('?' * (len(columns) + 1))})"
+    connection = open_history(path)
+    try:
+        with connection:
+            run_id = connection.execute("INSERT INTO export_runs (exported_at, source) VALUES (?, ?)",
+                                        (exported_at, source)).lastrowid
+            connection.executemany(insert, [[run_id] + [to_sql_value(record.get(column)) for column in columns]
+                                            for record in records])
+    finally:
+        connection.close()
+    return run_id
+
+
+# Every exported run of one direction and filter combination, oldest first, for trend charts.
+# Inbound rows have no BU or channel. kpis defaults to all KPI columns; since (a date) keeps only
+# runs exported from then on.
+def query_trend(direction, dc_name="All", bu_name=None, channel_name=None, kpis=None, since=None,
+                path=DEFAULT_HISTORY_PATH):
+    if direction == "outbound":
+        bu_name, channel_name = bu_name or "All", channel_name or "All"
+    conditions = ["k.direction = ?", "k.DC_NAME IS ?", "k.BUSINESSUNIT IS ?", "k.ORDERTYPE IS ?"]
+    params = [direction, dc_name, bu_name, channel_name]
+    if since:
+        conditions.append("r.exported_at >= ?")
+        params.append(pd.Timestamp(since).isoformat())
+    selected = ", ".join(f"k.{kpi}" for kpi in (kpis or KPI_COLUMNS))
+    query = (f"SELECT r.run_id, r.exported_at, k.start_date, k.end_date, {selected} "
+             f"FROM export_kpis k JOIN export_runs r ON r.run_id = k.run_id "
+             f"WHERE {' AND '.join(conditions)} ORDER BY r.exported_at, r.run_id")
+    connection = open_history(path)
+    try:
+        return pd.read_sql_query(query, connection, params=params, parse_dates=["exported_at"])
+    finally:
+        connection.close()
+
+
+# The rows of one run (the latest when run_id is None), e.g. to derive a CSV or Excel file from it
+def load_run(run_id=None, path=DEFAULT_HISTORY_PATH):
+    connection = open_history(path)
+    try:
+        if run_id is None:
+            run_id = connection.execute("SELECT MAX(run_id) FROM export_runs").fetchone()[0]
+        return pd.read_sql_query("SELECT * FROM export_kpis WHERE run_id = ?", connection, params=[run_id])
+    finally:
+        connection.close()
@@ -0,0 +1,122 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+try:
+    import psutil
+except ImportError:  # RSS is read from /proc/self/statm without psutil
+    psutil = None
+
+# Spans kept in the ring buffer; older ones are dropped
+DEFAULT_CAPACITY = 2000
+DEFAULT_TRACE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'diagnostics_trace.json')
+
+
+# Resident set size of this process in bytes, or None where it cannot be read
+def current_rss():
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+# Lightweight timing spans recorded into a fixed-size ring buffer. Each span stores its wall
+# time, the RSS change over its duration (process-wide, so concurrent spans overlap) and any
+# fields the caller sets, such as rows and bytes. Safe to use from worker threads.
+#
+#   with recorder.span("db.query", table=INBOUND_TABLE) as span:
+#       ...
+#       span["rows"] = len(rows)
+#
+#   @recorder.traced("metrics.inbound")
+#   def compute(...): ...
+class SpanRecorder:
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.spans = deque(maxlen=capacity)
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.enabled = True
+
+    @contextmanager
+    def span(self, name, **fields):
+        if not self.enabled:
+            yield {}
+            return
+        depth = getattr(self.local, 'depth', 0)
+        record = {"name": name, "thread": threading.current_thread().name, "depth": depth,
+                  "started_at": time.time(), **fields}
+        rss_before = current_rss()
+        started = time.perf_counter()
+        self.local.depth = depth + 1
+        try:
+            yield record
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {str(e)}"
+            raise
+        finally:
+            self.local.depth = depth
+            record["seconds"] = time.perf_counter() - started
+            rss_after = current_rss()
+            record["rss_delta"] = None if rss_before is None or rss_after is None else rss_after - rss_before
+            with self.lock:
+                self.spans.append(record)
+
+    # Decorator running the function inside a span; measure(result) may add fields (e.g. data_schema.frame_size)
+    def traced(self, name=None, measure=None):
+        def decorator(function):
+            span_name = name or function.__qualname__
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name) as record:
+                    result = function(*args, **kwargs)
+                    if measure is not None:
+                        record.update(measure(result))
+                    return result
+            return wrapper
+        return decorator
+
+    # Copy of the recorded spans, oldest first
+    def snapshot(self):
+        with self.lock:
+            return list(self.spans)
+
+    def clear(self):
+        with self.lock:
+            self.spans.clear()
+
+    # Count, total, mean and max seconds per span name, slowest total first
+    def summary(self):
+        totals = {}
+        for record in self.snapshot():
+            entry = totals.setdefault(record["name"], {"name": record["name"], "count": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+            entry["count"] += 1
+            entry["total_seconds"] += record["seconds"]
+            entry["max_seconds"] = max(entry["max_seconds"], record["seconds"])
+        for entry in totals.values():
+            entry["mean_seconds"] = entry["total_seconds"] / entry["count"]
+        return sorted(totals.values(), key=lambda entry: entry["total_seconds"], reverse=True)
+
+    # Write the spans as a Chrome trace-event JSON file (opens in chrome://tracing or Perfetto);
+    # rows, bytes, RSS delta and other fields are kept in each event's args
+    def dump(self, path=DEFAULT_TRACE_PATH):
+        events = []
+        for record in self.snapshot():
+            args = {key: value for key, value in record.items() if key not in ("name", "thread", "started_at", "seconds")}
+            events.append({"name": record["name"], "ph": "X", "pid": os.getpid(), "tid": record["thread"],
+                           "ts": int(record["started_at"] * 1e6), "dur": int(record["seconds"] * 1e6), "args": args})
+        with open(path, 'w') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, indent=1, default=str)
+        return len(events)
+
+
+recorder = SpanRecorder()
+span = recorder.span
+traced = recorder.traced
@@ -0,0 +1,47 @@
+import tkinter as tk
+
+from card_format import format_number
+
+
+# Minimal line chart drawn on a Tk canvas (no plotting library). Redrawing deletes the previous
+# items and draws one polyline, so a year of daily points repaints instantly.
+class LineChart:
+    def __init__(self, parent, width=900, height=240, margin=50):
+        self.width = width
+        self.height = height
+        self.margin = margin
+        self.canvas = tk.Canvas(parent, width=width, height=height, bg='white', highlightthickness=0)
+        self.canvas.pack(side='top', anchor='w', padx=10, pady=5)
+
+    # Plot values against their period labels (Timestamps); an empty series shows a message
+    def plot(self, labels, values, title=""):
+        canvas = self.canvas
+        canvas.delete('all')
+        canvas.create_text(self.margin, 12, text=title, anchor='w', font=('Arial', 10, 'bold'))
+        if len(values) == 0:
+            canvas.create_text(self.width / 2, self.height / 2, text="No data for the selected filters",
+                               font=('Arial', 10))
+            return
+
+        left, top = self.margin, 30
+        right, bottom = self.width - 20, self.height - 30
+        top_value = max(float(max(values)), 1.0)
+        step = (right - left) / max(len(values) - 1, 1)
+
+        canvas.create_line(left, bottom, right, bottom, fill='#999999')
+        canvas.create_line(left, top, left, bottom, fill='#999999')
+        canvas.create_text(left - 5, top, text=format_number(top_value), anchor='e', font=('Arial', 8))
+        canvas.create_text(left - 5, bottom, text="0", anchor='e', font=('Arial', 8))
+
+        points = []
+        for i, value in enumerate(values):
+            points.extend((left + i * step, bottom - (bottom - top) * float(value) / top_value))
+        if len(points) >= 4:
+            canvas.create_line(*points, fill='#FF3B00', width=2)
+        else:
+            x, y = points
+            canvas.create_oval(x - 3, y - 3, x + 3, y + 3, fill='#FF3B00', outline='')
+
+        # First, middle and last period labels
+        for i in sorted({0, len(labels) // 2, len(labels) - 1}):
+            canvas.create_text(left + i * step, bottom + 12, text=str(labels[i].date()), font=('Arial', 8))
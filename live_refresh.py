@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+from data_loader import stream_table, concat_typed_chunks
+from date_index import sort_by_date
+from instrumentation import span
+
+# Seconds between automatic refreshes (0 turns them off; the Refresh button still works)
+DEFAULT_REFRESH_SECONDS = 300
+
+
+# Rows of a table from first_day on. The last loaded day is fetched again, because DATE holds
+# calendar days and the current day keeps receiving lines.
+def fetch_tail(table, columns, first_day, progress_callback=None):
+    return stream_table(table, columns, progress_callback=progress_callback, where_clause=" WHERE DATE >= %s",
+                        params=[pd.Timestamp(first_day).to_pydatetime()])
+
+
+# Order-insensitive fingerprint of a frame's rows: the sorted hashes of their values (category
+# columns hash by value, so frames with different category codes still compare equal)
+def row_fingerprint(frame):
+    return np.sort(pd.util.hash_pandas_object(frame, index=False).to_numpy())
+
+
+# Apply new rows from first_day on to a prepared (data, index, cube, sketches, catalog) tuple.
+# The loaded rows from first_day on are replaced by tail, and the date index, cube, sketches and
+# catalog are extended from the new rows only (see the replace_tail methods). Returns the new
+# tuple, or None when tail holds exactly the rows already loaded for those days (nothing new);
+# rows that were corrected in place are picked up even when the row count did not change.
+def apply_tail(prepared, tail, first_day, build_cube=None, build_sketches=None):
+    data, index, cube, sketches, catalog = prepared
+    first_row = int(np.searchsorted(index.dates, np.datetime64(pd.Timestamp(first_day)), side='left'))
+    if len(tail) == len(data) - first_row and \
+            np.array_equal(row_fingerprint(tail[list(data.columns)]), row_fingerprint(data.iloc[first_row:])):
+        return None
+
+    with span("refresh.apply", rows=len(tail)):
+        # The loaded rows come first, so their category codes stay valid in the merged frame
+        merged = concat_typed_chunks([data.iloc[:first_row], sort_by_date(tail)], data.columns)
+        new_rows = merged.iloc[first_row:]
+        merged_index = index.replace_tail(merged, first_row)
+        if cube is not None and build_cube is not None:
+            cube = cube.replace_tail(first_day, build_cube(new_rows))
+        if sketches is not None and build_sketches is not None:
+            sketches = sketches.replace_tail(first_day, build_sketches(new_rows))
+        catalog = catalog.extended(new_rows, len(merged))
+    return merged, merged_index, cube, sketches, catalog
+
+
+# Day of the last loaded row (frames are sorted by DATE), or None for an empty frame
+def last_loaded_day(data):
+    return pd.Timestamp(data['DATE'].iloc[-1]).normalize() if len(data) else None
+
+
+# Fetch the rows of a loaded direction from its last loaded day on and apply them (worker thread)
+def refresh_prepared(prepared, table, columns, build_cube=None, build_sketches=None, progress_callback=None):
+    first_day = last_loaded_day(prepared[0])
+    if first_day is None:
+        return None
+    with span("refresh.fetch", table=table) as fetch_span:
+        tail = fetch_tail(table, columns, first_day, progress_callback)
+        fetch_span["rows"] = len(tail)
+    return apply_tail(prepared, tail, first_day, build_cube, build_sketches)
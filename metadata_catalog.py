@@ -0,0 +1,53 @@
+import copy
+
+import pandas as pd
+
+# Filter columns of each direction, in cascade order (a choice narrows the columns after it)
+INBOUND_FILTER_COLUMNS = ["DC_NAME"]
+OUTBOUND_FILTER_COLUMNS = ["DC_NAME", "BUSINESSUNIT", "ORDERTYPE"]
+
+
+# Filter domains and date bounds derived once from a loaded (or cached) frame, replacing the
+# DISTINCT and MIN/MAX queries. The distinct filter combinations are kept (a few hundred rows
+# at most) so cascading lists, e.g. the BUs of the chosen DC, are computed locally.
+class MetadataCatalog:
+    def __init__(self, frame, filter_columns):
+        self.filter_columns = list(filter_columns)
+        dates = frame['DATE']
+        self.min_date = pd.Timestamp(dates.min()) if len(dates) else None
+        self.max_date = pd.Timestamp(dates.max()) if len(dates) else None
+        self.combinations = frame[self.filter_columns].drop_duplicates().reset_index(drop=True)
+        self.row_count = len(frame)
+
+    # Catalog after new rows were added (filter combinations only ever grow)
+    def extended(self, new_rows, row_count):
+        catalog = copy.copy(self)
+        catalog.combinations = pd.concat([self.combinations, new_rows[self.filter_columns].drop_duplicates()],
+                                         ignore_index=True).drop_duplicates().reset_index(drop=True)
+        if len(new_rows):
+            catalog.min_date = min(filter(None, [self.min_date, pd.Timestamp(new_rows['DATE'].min())]))
+            catalog.max_date = max(filter(None, [self.max_date, pd.Timestamp(new_rows['DATE'].max())]))
+        catalog.row_count = row_count
+        return catalog
+
+    def memory_bytes(self):
+        return int(self.combinations.memory_usage(deep=True, index=False).sum())
+
+    # Combobox values ("All" first) for one column, narrowed by the selections of the
+    # columns before it in the cascade; selections maps column -> selected value
+    def values(self, column, selections=None):
+        combinations = self.combinations
+        for other in self.filter_columns[:self.filter_columns.index(column)]:
+            selected = (selections or {}).get(other)
+            if selected and selected != "All":
+                combinations = combinations[combinations[other] == selected]
+        levels = combinations[column].dropna().unique()
+        return ["All"] + sorted(str(level) for level in levels)
+
+
+def build_inbound_catalog(inbound_data):
+    return MetadataCatalog(inbound_data, INBOUND_FILTER_COLUMNS)
+
+
+def build_outbound_catalog(outbound_data):
+    return MetadataCatalog(outbound_data, OUTBOUND_FILTER_COLUMNS)
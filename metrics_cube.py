@@ -0,0 +1,130 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+from distinct_counter import counter, dense_codes
+from metrics_engine import INBOUND_DISTINCT, OUTBOUND_DISTINCT
+
+# Cube layout per direction: the dimensions a cell is keyed on (besides the day) and
+# the ID columns whose distinct counts are kept, by KPI name (the same as the slice path's)
+INBOUND_CUBE_SPEC = {
+    "dimensions": ["DC_NAME"],
+    "distinct": INBOUND_DISTINCT,
+}
+OUTBOUND_CUBE_SPEC = {
+    "dimensions": ["DC_NAME", "BUSINESSUNIT", "ORDERTYPE"],
+    "distinct": OUTBOUND_DISTINCT,
+}
+
+# Filter arguments of the summary functions and the column each one applies to
+FILTER_COLUMNS = {"dc_name": "DC_NAME", "bu_name": "BUSINESSUNIT", "channel_name": "ORDERTYPE"}
+
+
+# Daily aggregate cube keyed by (day, DC_NAME[, BUSINESSUNIT, ORDERTYPE]).
+# Each cell holds its line count, Qty sum and first/last DATE. Distinct counts stay exact
+# and mergeable: for every ID column the cube keeps the de-duplicated (cell, id code) pairs,
+# so any set of cells is answered by marking the codes of its pairs in a bitmap.
+class MetricsCube:
+    def __init__(self, frame, dimensions, distinct):
+        self.dimensions = list(dimensions)
+        self.distinct = dict(distinct)
+
+        day = frame['DATE'].dt.normalize().rename('DAY')
+        keys = [day] + [frame[column] for column in self.dimensions]
+        grouped = frame.groupby(keys, observed=True, dropna=False, sort=True)
+        cell_ids = grouped.ngroup().to_numpy()
+
+        self.cells = grouped.agg(
+            lines=('DATE', 'size'),
+            units=('Qty', 'sum'),
+            first_date=('DATE', 'min'),
+            last_date=('DATE', 'max'),
+        ).reset_index()
+        self.cell_days = self.cells['DAY'].to_numpy()
+        self.build_distinct(frame, cell_ids)
+
+    # (cell, id code) pairs per ID column, sorted by cell
+    def build_distinct(self, frame, cell_ids):
+        self.pairs = {}
+        self.cardinality = {}
+        for column in set(self.distinct.values()):
+            codes, cardinality = dense_codes(frame[column])
+            cardinality = max(cardinality, 1)
+            valid = codes >= 0  # missing IDs are not counted, as in nunique()
+            combined = np.unique(cell_ids[valid].astype('int64') * cardinality + codes[valid])
+            self.pairs[column] = (combined // cardinality, combined % cardinality)
+            self.cardinality[column] = cardinality
+
+    # Cube of the frame after its rows from first_day on were replaced by new ones: the cells before
+    # first_day are kept and the cells of tail (a cube of the new rows, built on the merged frame so
+    # the ID codes agree) are appended. Cells are ordered by day first, so this is a truncation and a
+    # concatenation; no old row is aggregated again. The cube itself is left unchanged.
+    def replace_tail(self, first_day, tail):
+        keep = int(np.searchsorted(self.cell_days, np.datetime64(pd.Timestamp(first_day)), side='left'))
+        merged = copy.copy(self)
+        merged.cells = pd.concat([self.cells.iloc[:keep], tail.cells], ignore_index=True)
+        merged.cell_days = merged.cells['DAY'].to_numpy()
+        merged.replace_tail_distinct(self, keep, tail)
+        return merged
+
+    # Keep the (cell, id code) pairs of the first keep cells and append those of tail
+    def replace_tail_distinct(self, previous, keep, tail):
+        self.pairs = {}
+        self.cardinality = dict(tail.cardinality)
+        for column, (pair_cells, pair_codes) in previous.pairs.items():
+            end = np.searchsorted(pair_cells, keep)  # pairs are sorted by cell
+            tail_cells, tail_codes = tail.pairs[column]
+            self.pairs[column] = (np.concatenate([pair_cells[:end], tail_cells + keep]),
+                                  np.concatenate([pair_codes[:end], tail_codes]))
+
+    # Bytes held by the cells and the distinct-count pairs
+    def memory_bytes(self):
+        return (int(self.cells.memory_usage(deep=True, index=False).sum()) + self.cell_days.nbytes
+                + self.distinct_bytes())
+
+    def distinct_bytes(self):
+        return sum(pair_cells.nbytes + pair_codes.nbytes for pair_cells, pair_codes in self.pairs.values())
+
+    # Boolean mask of the cells matching the filters; "All" or empty means no filter
+    def select_cells(self, start_date=None, end_date=None, **filters):
+        mask = np.ones(len(self.cells), dtype=bool)
+        if start_date and end_date:
+            # The DATE column holds calendar days, so day-level bounds match the row-level filter
+            mask &= (self.cell_days >= np.datetime64(pd.Timestamp(start_date))) & \
+                    (self.cell_days <= np.datetime64(pd.Timestamp(end_date)))
+        for argument, value in filters.items():
+            column = FILTER_COLUMNS[argument]
+            if value and value != "All" and column in self.dimensions:
+                mask &= (self.cells[column] == value).to_numpy()
+        return mask
+
+    # Number of distinct IDs of one column across the selected cells
+    def distinct_count(self, column, cell_mask):
+        pair_cells, pair_codes = self.pairs[column]
+        return counter.count(pair_codes[cell_mask[pair_cells]], self.cardinality[column])
+
+    # Raw KPIs for a filter combination, summed over the matching cells
+    def query(self, start_date=None, end_date=None, **filters):
+        cell_mask = self.select_cells(start_date, end_date, **filters)
+        selected = self.cells[cell_mask]
+
+        kpis = {
+            "min_date": selected['first_date'].min() if len(selected) else None,
+            "max_date": selected['last_date'].max() if len(selected) else None,
+            "total_lines": int(selected['lines'].sum()),
+            "total_units": float(selected['units'].sum()),
+        }
+        kpis["days_of_data"] = (kpis["max_date"] - kpis["min_date"]).days if len(selected) else 0
+        for kpi, column in self.distinct.items():
+            kpis[kpi] = self.distinct_count(column, cell_mask)
+        return kpis
+
+
+# Build the cubes for the inbound and outbound frames
+def build_inbound_cube(inbound_data):
+    return MetricsCube(inbound_data, **INBOUND_CUBE_SPEC)
+
+
+def build_outbound_cube(outbound_data):
+    return MetricsCube(outbound_data, **OUTBOUND_CUBE_SPEC)
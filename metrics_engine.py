@@ -0,0 +1,256 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+
+import pandas as pd
+
+from distinct_counter import count_distinct
+
+# Number of filter combinations kept by the metrics result cache
+DEFAULT_CACHE_SIZE = 256
+
+
+# Rows matching the summary filters, through the sorted-date index when there is one
+def filter_rows(data, start_date=None, end_date=None, dc_name=None, bu_name=None, channel_name=None, date_index=None):
+    if start_date:
+        start_date = pd.to_datetime(start_date)
+    if end_date:
+        end_date = pd.to_datetime(end_date)
+    if date_index is not None:
+        return date_index.select(start_date, end_date, dc_name, bu_name, channel_name)
+
+    filtered_data = data
+    if start_date and end_date:
+        if not pd.api.types.is_datetime64_any_dtype(filtered_data['DATE']):
+            filtered_data = filtered_data.assign(DATE=pd.to_datetime(filtered_data['DATE']))
+        filtered_data = filtered_data[(filtered_data['DATE'] >= start_date) & (filtered_data['DATE'] <= end_date)]
+    if dc_name and dc_name != "All":
+        filtered_data = filtered_data[filtered_data['DC_NAME'] == dc_name]
+    if bu_name and bu_name != "All":
+        filtered_data = filtered_data[filtered_data['BUSINESSUNIT'] == bu_name]
+    if channel_name and channel_name != "All":
+        filtered_data = filtered_data[filtered_data['ORDERTYPE'] == channel_name]
+    return filtered_data
+
+
+# Every raw KPI of a filtered slice, each computed once.
+# distinct maps KPI name -> ID column, e.g. {"total_orders": "PO_NUMBER"}.
+def slice_kpis(filtered_data, distinct):
+    dates = filtered_data['DATE']
+    kpis = {
+        "total_lines": int(filtered_data.shape[0]),
+        "total_units": float(filtered_data['Qty'].sum()),
+        "days_of_data": (dates.max() - dates.min()).days if len(dates) else 0,
+    }
+    for kpi, column in distinct.items():
+        kpis[kpi] = count_distinct(filtered_data[column])
+    return kpis
+
+
+def safe_ratio(numerator, denominator):
+    return numerator / denominator if denominator > 0 else 0
+
+
+# Inbound KPIs for one filter combination
+@dataclass
+class InboundMetrics:
+    days_of_data: int
+    total_loads: int
+    total_orders: int
+    total_lines: int
+    total_units: float
+    total_skus: int
+    # Relative standard error of the distinct counts; 0 when they are exact
+    distinct_error: float = 0.0
+
+    @classmethod
+    def from_kpis(cls, kpis):
+        return cls(kpis["days_of_data"], kpis["total_loads"], kpis["total_orders"],
+                   kpis["total_lines"], kpis["total_units"], kpis["total_skus"], kpis.get("distinct_error", 0.0))
+
+    @property
+    def units_per_line(self):
+        return safe_ratio(self.total_units, self.total_lines)
+
+    @property
+    def lines_per_po(self):
+        return safe_ratio(self.total_lines, self.total_orders)
+
+    @property
+    def units_per_po(self):
+        return safe_ratio(self.total_units, self.total_orders)
+
+    # Raw KPI values (no formatting), including the order profile ratios
+    def kpi_record(self):
+        record = asdict(self)
+        record.update(units_per_line=self.units_per_line, lines_per_po=self.lines_per_po,
+                      units_per_po=self.units_per_po)
+        return record
+
+    # Raw values of the "Inbound Volumes" cards, by card label
+    def volumes(self):
+        return {
+            "Days of Data": self.days_of_data,
+            "Total IB Loads": self.total_loads,
+            "Total Orders": self.total_orders,
+            "Total Lines": self.total_lines,
+            "Total Units": self.total_units,
+            "SKUs with Movement": self.total_skus
+        }
+
+    # Raw values of the "Inbound Order Profile" cards, by card label
+    def order_profile(self):
+        return {
+            "IB Units Per Line": self.units_per_line,
+            "IB Lines Per PO": self.lines_per_po,
+            "IB Units Per PO": self.units_per_po
+        }
+
+
+# Outbound KPIs for one filter combination
+@dataclass
+class OutboundMetrics:
+    days_of_data: int
+    total_orders: int
+    total_lines: int
+    total_units: float
+    total_skus: int
+    # Relative standard error of the distinct counts; 0 when they are exact
+    distinct_error: float = 0.0
+
+    @classmethod
+    def from_kpis(cls, kpis):
+        return cls(kpis["days_of_data"], kpis["total_orders"], kpis["total_lines"],
+                   kpis["total_units"], kpis["total_skus"], kpis.get("distinct_error", 0.0))
+
+    @property
+    def units_per_line(self):
+        return safe_ratio(self.total_units, self.total_lines)
+
+    @property
+    def lines_per_po(self):
+        return safe_ratio(self.total_lines, self.total_orders)
+
+    @property
+    def units_per_po(self):
+        return safe_ratio(self.total_units, self.total_orders)
+
+    # Raw KPI values (no formatting), including the order profile ratios
+    def kpi_record(self):
+        record = asdict(self)
+        record.update(units_per_line=self.units_per_line, lines_per_po=self.lines_per_po,
+                      units_per_po=self.units_per_po)
+        return record
+
+    # Raw values of the "Outbound Volumes" cards, by card label
+    def volumes(self):
+        return {
+            "Days of Data": self.days_of_data,
+            "Total Orders": self.total_orders,
+            "Total Lines": self.total_lines,
+            "Total Units": self.total_units,
+            "SKUs with Movement": self.total_skus
+        }
+
+    # Raw values of the "Outbound Order Profile" cards, by card label
+    def order_profile(self):
+        return {
+            "OB Units Per Line": self.units_per_line,
+            "OB Lines Per PO": self.lines_per_po,
+            "OB Units Per PO": self.units_per_po
+        }
+
+
+# ID column of each distinct-count KPI, by direction; the cubes and sketches count the same columns
+INBOUND_DISTINCT = {"total_loads": "LOAD_NUMBER", "total_orders": "PO_NUMBER", "total_skus": "SKU"}
+OUTBOUND_DISTINCT = {"total_orders": "ORDER_NUMBER", "total_skus": "SKU"}
+
+
+# Inbound volumes and order profile in one pass: estimated from the sketches when given and the slice
+# is large, else from the cube when given, else from one filtered slice
+def inbound_summary(inbound_data, start_date=None, end_date=None, dc_name=None, date_index=None, cube=None,
+                    sketches=None):
+    if sketches is not None:
+        kpis = sketches.query(start_date, end_date, dc_name=dc_name)
+        if kpis is not None:
+            return InboundMetrics.from_kpis(kpis)
+    if cube is not None:
+        return InboundMetrics.from_kpis(cube.query(start_date, end_date, dc_name=dc_name))
+    filtered_data = filter_rows(inbound_data, start_date, end_date, dc_name, date_index=date_index)
+    return InboundMetrics.from_kpis(slice_kpis(filtered_data, INBOUND_DISTINCT))
+
+
+# Outbound volumes and order profile in one pass: estimated from the sketches when given and the slice
+# is large, else from the cube when given, else from one filtered slice
+def outbound_summary(outbound_data, start_date=None, end_date=None, dc_name=None, bu_name=None, channel_name=None,
+                     date_index=None, cube=None, sketches=None):
+    if sketches is not None:
+        kpis = sketches.query(start_date, end_date, dc_name=dc_name, bu_name=bu_name, channel_name=channel_name)
+        if kpis is not None:
+            return OutboundMetrics.from_kpis(kpis)
+    if cube is not None:
+        return OutboundMetrics.from_kpis(cube.query(start_date, end_date, dc_name=dc_name, bu_name=bu_name,
+                                                    channel_name=channel_name))
+    filtered_data = filter_rows(outbound_data, start_date, end_date, dc_name, bu_name, channel_name, date_index)
+    return OutboundMetrics.from_kpis(slice_kpis(filtered_data, OUTBOUND_DISTINCT))
+
+
+# LRU cache of metrics results keyed by (direction, start, end, dc, bu, channel, data version).
+# invalidate() bumps the direction's data version when its frame is reloaded, so results
+# computed on the old frame can never be returned again.
+class MetricsCache:
+    def __init__(self, max_size=DEFAULT_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.data_versions = {}
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def make_key(self, direction, start_date, end_date, dc_name=None, bu_name=None, channel_name=None):
+        start_date = pd.Timestamp(start_date) if start_date else None
+        end_date = pd.Timestamp(end_date) if end_date else None
+        return (direction, start_date, end_date, dc_name or "All", bu_name or "All", channel_name or "All",
+                self.data_versions.get(direction, 0))
+
+    # Cached result for the filters, or compute() stored as the most recently used entry
+    def get_or_compute(self, compute, direction, start_date, end_date, dc_name=None, bu_name=None, channel_name=None):
+        with self.lock:
+            key = self.make_key(direction, start_date, end_date, dc_name, bu_name, channel_name)
+            if key in self.entries:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return self.entries[key]
+            self.misses += 1
+
+        result = compute()
+        if result is None:
+            return None
+
+        with self.lock:
+            # Drop the result if the data was reloaded while it was being computed
+            if key[-1] == self.data_versions.get(direction, 0):
+                self.entries[key] = result
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.max_size:
+                    self.entries.popitem(last=False)
+        return result
+
+    # Forget every result of a direction (or of all directions) after its data changed
+    def invalidate(self, direction=None):
+        with self.lock:
+            directions = [direction] if direction else list({key[0] for key in self.entries} | set(self.data_versions))
+            for name in directions:
+                self.data_versions[name] = self.data_versions.get(name, 0) + 1
+            self.entries = OrderedDict((key, value) for key, value in self.entries.items() if key[0] not in directions)
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self.entries),
+                "max_size": self.max_size,
+            }
@@ -3,224 +3,322 @@ from tkinter import ttk, messagebox
 from tkcalendar import DateEntry
 import pandas as pd
 import pymysql
-import Shared
-
-sslca = 'server-ca.pem'
-sslkey = 'client-key.pem'
-sslcert = 'client-cert.pem'
+import sqlite3
+from db_access import pool, pooled_connection, DEFAULT_POOL_SIZE, INBOUND_TABLE, OUTBOUND_TABLE
+from query_pushdown import fetch_inbound_kpis, fetch_outbound_kpis
+from data_schema import apply_schema, memory_bytes, report_memory, frame_size
+from data_loader import stream_inbound_table, stream_outbound_table, INBOUND_COLUMNS, OUTBOUND_COLUMNS
+from snapshot_cache import load_inbound_cached, load_outbound_cached
+from windowed_source import inbound_source, outbound_source, DEFAULT_WINDOW_DAYS
+from live_refresh import refresh_prepared, last_loaded_day, DEFAULT_REFRESH_SECONDS
+from metrics_cube import build_inbound_cube, build_outbound_cube
+from distinct_sketch import build_inbound_sketches, build_outbound_sketches
+from date_index import DateIndex, sort_by_date
+from metrics_engine import InboundMetrics, OutboundMetrics, MetricsCache, inbound_summary, outbound_summary
+from card_format import volume_cards, order_profile_cards
+from export_history import append_run, export_record, DEFAULT_HISTORY_PATH
+from background_loader import BackgroundLoader
+from metadata_catalog import build_inbound_catalog, build_outbound_catalog
+from card_grid import CardGrid
+from line_chart import LineChart
+from time_breakdown import inbound_breakdown, outbound_breakdown, INBOUND_SERIES, OUTBOUND_SERIES, FREQUENCIES
+from recompute_scheduler import RecomputeScheduler
+from instrumentation import recorder, span, traced
+from diagnostics_panel import DiagnosticsPanel
+from table_registry import load_registry
+from dataset_tab import DatasetTab, TabMemoryBudget, FILTER_LABELS
+
+# When True, each filter change runs one aggregate query on MySQL instead of
+# loading the full inbound/outbound tables into pandas at startup
+USE_QUERY_PUSHDOWN = False
+# When True, the full-table loads stream through a server-side cursor in typed chunks
+USE_STREAMING_LOAD = True
+# When True, loads start from the local Feather snapshot and only fetch rows newer than its
+# high-water-mark DATE (minus SNAPSHOT_LOOKBACK_DAYS for late-arriving lines)
+USE_SNAPSHOT_CACHE = True
+SNAPSHOT_LOOKBACK_DAYS = 7
+# When True, startup loads only the last LOAD_WINDOW_DAYS of each table (or, with USE_SNAPSHOT_CACHE,
+# the snapshot plus rows after its high-water mark when there is one); moving the date pickers
+# outside the loaded days fetches just the missing ranges
+USE_WINDOWED_LOAD = True
+LOAD_WINDOW_DAYS = DEFAULT_WINDOW_DAYS
+# When True, filter changes are answered from a daily aggregate cube built once after loading
+USE_METRICS_CUBE = True
+# When True, distinct counts of large slices (APPROX_EXACT_BELOW_ROWS lines or more, no BU/channel
+# filter) are HyperLogLog estimates shown with their error bound; exports stay exact
+USE_APPROX_DISTINCT = False
+APPROX_EXACT_BELOW_ROWS = 1_000_000
+
+# Every export is appended to this history store (see export_history.query_trend for trends);
+# the per-click CSV files are only written when WRITE_EXPORT_CSV is True
+EXPORT_HISTORY_PATH = DEFAULT_HISTORY_PATH
+WRITE_EXPORT_CSV = False
+
+# Timing/memory spans (DB calls, metrics, display, export) are recorded when True. The hidden
+# Diagnostics tab showing them is toggled with DIAGNOSTICS_SHORTCUT.
+USE_INSTRUMENTATION = True
+DIAGNOSTICS_SHORTCUT = '<Control-D>'  # Ctrl+Shift+D
+recorder.enabled = USE_INSTRUMENTATION
+
+# Rows from the last loaded day on are re-fetched every LIVE_REFRESH_SECONDS (0 = only with the
+# Refresh Data button) and applied to the loaded frames and aggregates without a full reload
+LIVE_REFRESH_SECONDS = DEFAULT_REFRESH_SECONDS
+
+# Datasets registered in table_registry.json after the default one get a tab each, loaded when first
+# opened; loaded tabs are unloaded (least recently opened first) above TAB_MEMORY_BUDGET_MB
+TAB_MEMORY_BUDGET_MB = 1024
+
+# Size bound of the LRU cache of metrics results per filter combination
+METRICS_CACHE_SIZE = 256
+
+metrics_cache = MetricsCache(METRICS_CACHE_SIZE)
+inbound_cube = None
+outbound_cube = None
+inbound_sketches = None
+outbound_sketches = None
+# Sorted-date indexes over the loaded frames, used for range slicing instead of boolean masks
+inbound_index = None
+outbound_index = None
+# Filter values and date bounds derived from the loaded frames (no DISTINCT/MIN/MAX queries)
+inbound_catalog = None
+outbound_catalog = None
+# Persistent card grids, created by the first display_*_summary call
+inbound_card_grid = None
+outbound_card_grid = None
+# Time-series breakdown chart shown in chart_frame_inbound
+breakdown_chart = None
+diagnostics_panel = None
+# Quiet period after the last filter event before the metrics are recomputed
+FILTER_DEBOUNCE_MS = 250
+recompute_scheduler = None
+
+# Loaded date ranges of each table when USE_WINDOWED_LOAD is on
+inbound_window = inbound_source(LOAD_WINDOW_DAYS, USE_SNAPSHOT_CACHE, SNAPSHOT_LOOKBACK_DAYS)
+outbound_window = outbound_source(LOAD_WINDOW_DAYS, USE_SNAPSHOT_CACHE, SNAPSHOT_LOOKBACK_DAYS)
+
+# Data and date bounds are filled in by the background loader after the window is shown
+inbound_data = None
+outbound_data = None
+min_date_sql_inbound = max_date_sql_inbound = None
+min_date_sql_outbound = max_date_sql_outbound = None
+# Startup parts still loading per direction; metrics are computed once a direction's set is empty
+startup_pending = {"inbound": set(), "outbound": set()}
+# Background jobs replacing a direction's frame; a refresh waits for window extensions and date
+# changes wait for a refresh, so one job never builds on a frame another is replacing
+refreshing = {"inbound": False, "outbound": False}
+window_extensions = {"inbound": 0, "outbound": 0}
 
 # Function to fetch data from the MySQL table
-def connect_to_database_inbound():
-    connection = pymysql.connect(
-        host='10.216.252.8',  #
-        user=Shared.userid,
-        passwd=Shared.password,
-        db='client_data',
-        port=3306,
-        ssl_ca=sslca,
-        ssl_key=sslkey,
-        ssl_cert=sslcert
-    )
+@traced("load.inbound", measure=frame_size)
+def connect_to_database_inbound(progress_callback=None):
+    if USE_WINDOWED_LOAD or USE_SNAPSHOT_CACHE or USE_STREAMING_LOAD:
+        try:
+            if USE_WINDOWED_LOAD:
+                df_inbound = inbound_window.load_initial(progress_callback)
+            elif USE_SNAPSHOT_CACHE:
+                df_inbound = load_inbound_cached(SNAPSHOT_LOOKBACK_DAYS, progress_callback=progress_callback)
+            else:
+                df_inbound = stream_inbound_table(progress_callback=progress_callback)
+            report_memory("Inbound", df_inbound)
+            return df_inbound
+        except Exception as e:
+            print(f"Error fetching data: {str(e)}")
+            return None
 
     try:
-        cursor = connection.cursor()
-        select_query = """ SELECT DATE,LOAD_NUMBER,PO_NUMBER,SKU,Qty,DC_NAME FROM temporary_data.ALPARGATAS_2024_INBOUND_STANDARD_TESTING """
-        cursor.execute(select_query)
-        rows = cursor.fetchall()
-        columns = [col[0] for col in cursor.description]
-        df_inbound = pd.DataFrame(rows, columns=columns)
-
-        print("Data fetched successfully!")
+        with pooled_connection() as connection:
+            cursor = connection.cursor()
+            select_query = f""" SELECT {','.join(INBOUND_COLUMNS)} FROM {INBOUND_TABLE} """
+            with span("db.query"):
+                cursor.execute(select_query)
+            with span("db.fetchall") as fetch_span:
+                rows = cursor.fetchall()
+                fetch_span["rows"] = len(rows)
+            columns = [col[0] for col in cursor.description]
+            cursor.close()
+        with span("frame.build") as build_span:
+            df_inbound = pd.DataFrame(rows, columns=columns)
+            object_bytes = memory_bytes(df_inbound)
+            build_span.update(rows=len(df_inbound), bytes=object_bytes)
+        with span("frame.schema"):
+            apply_schema(df_inbound)
+
+        report_memory("Inbound", df_inbound, object_bytes)
         return df_inbound
-
     except Exception as e:
         print(f"Error fetching data: {str(e)}")
         return None
 
-    finally:
-        connection.close()
-
-
-
-# Helper function to format numbers in K/M style
-def format_number(value):
-    if value >= 1_000_000:
-        return f"{value/1_000_000:.2f} M"
-    elif value >= 1_000:
-        return f"{value/1_000:.1f} K"
-    else:
-        return f"{value:.2f}"
-
 
 
 
 ####
 # Inbound Volumes Calculation
-def inbound_volumes(inbound_data, start_date=None, end_date=None, dc_name=None):
+@traced("metrics.inbound_volumes")
+def inbound_volumes(inbound_data, start_date=None, end_date=None, dc_name=None, date_index=None):
     try:
-        # Ensure 'DATE' column is in datetime format
-        if pd.api.types.is_datetime64_any_dtype(inbound_data['DATE']) == False:
-            inbound_data['DATE'] = pd.to_datetime(inbound_data['DATE'])
-        # Convert start_date and end_date to pandas Timestamps for correct comparison
-        if start_date:
-            start_date = pd.to_datetime(start_date)
-        if end_date:
-            end_date = pd.to_datetime(end_date)
-
-        filtered_data = inbound_data
-        if start_date and end_date:
-            filtered_data = filtered_data[(filtered_data['DATE'] >= start_date) & (filtered_data['DATE'] <= end_date)]
-        if dc_name and dc_name != "All":
-            filtered_data = filtered_data[filtered_data['DC_NAME'] == dc_name]
-
-        days_of_data = (filtered_data['DATE'].max() - filtered_data['DATE'].min()).days
-        total_ib_loads = filtered_data['LOAD_NUMBER'].nunique()
-        total_orders = filtered_data['PO_NUMBER'].nunique()
-        total_lines = filtered_data.shape[0]
-        total_units = filtered_data['Qty'].sum()
-        skus_with_movement = filtered_data['SKU'].nunique()
-
-        total_ib_loads_formatted = format_number(total_ib_loads)
-        total_orders_formatted = format_number(total_orders)
-        total_lines_formatted = format_number(total_lines)
-        total_units_formatted = format_number(total_units)
-        skus_with_movement_formatted = format_number(skus_with_movement)
-
-        metrics = {
-            "Days of Data": days_of_data,
-            "Total IB Loads": total_ib_loads_formatted,
-            "Total Orders": total_orders_formatted,
-            "Total Lines": total_lines_formatted,
-            "Total Units": total_units_formatted,
-            "SKUs with Movement": skus_with_movement_formatted
-        }
-        return metrics
+        return volume_cards(inbound_summary(inbound_data, start_date, end_date, dc_name, date_index=date_index))
     except KeyError as e:
         messagebox.showerror("Error", f"Missing column in inbound data: {str(e)}")
         return None
 
 # Inbound Order Profile Calculation
-def inbound_order_profile(inbound_data, start_date=None, end_date=None, dc_name=None):
+@traced("metrics.inbound_order_profile")
+def inbound_order_profile(inbound_data, start_date=None, end_date=None, dc_name=None, date_index=None):
     try:
-        # Convert start_date and end_date to pandas Timestamps for correct comparison
-        if start_date:
-            start_date = pd.to_datetime(start_date)
-        if end_date:
-            end_date = pd.to_datetime(end_date)
-
-        filtered_data = inbound_data
-        if start_date and end_date:
-            filtered_data = filtered_data[(filtered_data['DATE'] >= start_date) & (filtered_data['DATE'] <= end_date)]
-        if dc_name and dc_name != "All":
-            filtered_data = filtered_data[filtered_data['DC_NAME'] == dc_name]
-
-        total_units = filtered_data['Qty'].sum()
-        total_lines = filtered_data.shape[0]
-        total_orders = filtered_data['PO_NUMBER'].nunique()
-
-        # Prevent division by zero
-        ib_units_per_line = total_units / total_lines if total_lines > 0 else 0
-        ib_lines_per_po = total_lines / total_orders if total_orders > 0 else 0
-        ib_units_per_po = total_units / total_orders if total_orders > 0 else 0
-
-        ib_units_per_line_formatted = format_number(ib_units_per_line)
-        ib_lines_per_po_formatted = format_number(ib_lines_per_po)
-        ib_units_per_po_formatted = format_number(ib_units_per_po)
-
-        metrics = {
-            "IB Units Per Line": ib_units_per_line_formatted,
-            "IB Lines Per PO": ib_lines_per_po_formatted,
-            "IB Units Per PO": ib_units_per_po_formatted
-        }
-        return metrics
+        return order_profile_cards(inbound_summary(inbound_data, start_date, end_date, dc_name, date_index=date_index))
     except KeyError as e:
         messagebox.showerror("Error", f"Missing column in inbound data: {str(e)}")
         return None
 
+# Inbound metrics (volumes and order profile in one pass) using the active computation mode.
+# Safe to run on a worker thread: errors are raised, and shown by show_metrics_error on the Tk thread.
+@traced("metrics.inbound", measure=lambda metrics: {"rows": metrics.total_lines})
+def compute_inbound_metrics_uncached(inbound_data, start_date, end_date, dc_name, approximate=USE_APPROX_DISTINCT):
+    if USE_QUERY_PUSHDOWN:
+        return InboundMetrics.from_kpis(fetch_inbound_kpis(start_date, end_date, dc_name))
+    cube = inbound_cube if USE_METRICS_CUBE else None
+    sketches = inbound_sketches if approximate else None
+    return inbound_summary(inbound_data, start_date, end_date, dc_name, date_index=inbound_index, cube=cube, sketches=sketches)
+
+# Inbound metrics, served from the LRU result cache when this filter combination was seen before.
+# The cache holds results of the USE_APPROX_DISTINCT mode, so the other mode is computed directly.
+@traced("metrics.inbound_cached")
+def compute_inbound_metrics(inbound_data, start_date, end_date, dc_name, approximate=USE_APPROX_DISTINCT):
+    if approximate != USE_APPROX_DISTINCT:
+        return compute_inbound_metrics_uncached(inbound_data, start_date, end_date, dc_name, approximate)
+    return metrics_cache.get_or_compute(
+        lambda: compute_inbound_metrics_uncached(inbound_data, start_date, end_date, dc_name),
+        "inbound", start_date, end_date, dc_name)
+
+
+# Show a metrics computation error (runs on the Tk thread)
+def show_metrics_error(direction, error):
+    if isinstance(error, KeyError):
+        messagebox.showerror("Error", f"Missing column in {direction} data: {str(error)}")
+    else:
+        messagebox.showerror("Error", f"Failed to compute {direction} metrics: {str(error)}")
+
 
 # Display function for inbound data, order profile, and the line chart
+@traced("display.inbound_summary")
 def display_inbound_summary(inbound_metrics, inbound_order_profile_metrics, inbound_data, start_date, end_date, dc_name):
+    global inbound_card_grid
     if not inbound_metrics or not inbound_order_profile_metrics:
         return
 
-    for widget in card_frame_inbound.winfo_children():
-        widget.destroy()
-
-    def create_card(parent, metric, value, row, col):
-        frame = tk.Frame(parent, relief='solid', borderwidth=1, padx=5, pady=5, bg='white')
-        frame.config(highlightbackground="red", highlightcolor="red", highlightthickness=2)
-        frame.grid(row=row, column=col, padx=5, pady=5, ipadx=5, ipady=5)
-        label_title = tk.Label(frame, text=metric, font=('Arial', 10, 'bold'))
-        label_title.pack(side='top', anchor='center')
-
-        label_value = tk.Label(frame, text=str(value), font=('Arial', 10))
-        label_value.pack(side='top', anchor='center')
-
-    inbound_volumes_label = tk.Label(card_frame_inbound, text="Inbound Volumes", font=('Arial', 14, 'bold'), anchor='w')
-    inbound_volumes_label.grid(row=0, column=0, columnspan=6, pady=10, sticky='w')
-
-    inbound_order_profile_label = tk.Label(card_frame_inbound, text="Inbound Order Profile", font=('Arial', 14, 'bold'), anchor='w')
-    inbound_order_profile_label.grid(row=0, column=6, columnspan=3, pady=10, sticky='w')
-
-    col = 0
-    for metric, value in inbound_metrics.items():
-        create_card(card_frame_inbound, metric, value, 1, col)
-        col += 1
-
-    col = 6
-    for metric, value in inbound_order_profile_metrics.items():
-        create_card(card_frame_inbound, metric, value, 1, col)
-        col += 1
+    # The cards are built on first use and afterwards only have their values updated
+    if inbound_card_grid is None:
+        inbound_card_grid = CardGrid(card_frame_inbound, [
+            ("Inbound Volumes", 0, 6, list(inbound_metrics)),
+            ("Inbound Order Profile", 6, 3, list(inbound_order_profile_metrics)),
+        ])
+    inbound_card_grid.update(inbound_metrics, inbound_order_profile_metrics)
 
 
 
 # Function to update metrics and line chart based on filters
 def update_metrics_on_filter_change(inbound_data, start_date, end_date, dc_name):
+    # Nothing to compute until the startup load has finished
+    if startup_pending["inbound"]:
+        return
     # Convert dates to pandas Timestamps
     start_date = pd.Timestamp(start_date)
     end_date = pd.Timestamp(end_date)
 
-    # Fetch metrics and display the summary
-    inbound_metrics = inbound_volumes(inbound_data, start_date, end_date, dc_name)
-    inbound_order_profile_metrics = inbound_order_profile(inbound_data, start_date, end_date, dc_name)
-    display_inbound_summary(inbound_metrics, inbound_order_profile_metrics, inbound_data, start_date, end_date, dc_name)
+    # Fetch metrics (one pass for both sections) off the Tk thread and display the newest result;
+    # rapid filter changes are coalesced by the scheduler
+    recompute_scheduler.request(
+        "inbound",
+        lambda: compute_inbound_metrics(inbound_data, start_date, end_date, dc_name),
+        lambda metrics: display_inbound_summary(volume_cards(metrics), order_profile_cards(metrics), inbound_data, start_date, end_date, dc_name),
+        lambda error: show_metrics_error("inbound", error))
+    refresh_breakdown_chart(changed_direction="inbound")
+
+# Breakdown chart controls (direction, series, period) and the chart itself
+def create_breakdown_chart(parent_frame):
+    global breakdown_chart, chart_direction, chart_series, chart_frequency
+    controls = ttk.Frame(parent_frame)
+    controls.pack(side='top', fill='x')
+    heading_label = ttk.Label(controls, text="Breakdown", font=('Arial', 12, 'bold'))
+    heading_label.pack(side='left', padx=10)
+    chart_direction = ttk.Combobox(controls, values=["Inbound", "Outbound"], state='readonly', font=('Arial', 10), width=10)
+    chart_direction.set("Inbound")
+    chart_series = ttk.Combobox(controls, values=list(INBOUND_SERIES), state='readonly', font=('Arial', 10), width=10)
+    chart_series.set("Lines")
+    chart_frequency = ttk.Combobox(controls, values=list(FREQUENCIES), state='readonly', font=('Arial', 10), width=10)
+    chart_frequency.set("Daily")
+    for combobox in (chart_direction, chart_series, chart_frequency):
+        combobox.pack(side='left', padx=10)
+        combobox.bind("<<ComboboxSelected>>", refresh_breakdown_chart)
+    breakdown_chart = LineChart(parent_frame)
+
+# Recompute the breakdown of the chosen direction with its current filters (off the Tk thread);
+# changed_direction skips the refresh when the filters of the other direction changed
+def refresh_breakdown_chart(event=None, changed_direction=None):
+    if breakdown_chart is None:
+        return
+    direction = chart_direction.get().lower()
+    if changed_direction and changed_direction != direction:
+        return
+    series = INBOUND_SERIES if direction == "inbound" else OUTBOUND_SERIES
+    chart_series.config(values=list(series))
+    if chart_series.get() not in series:
+        chart_series.set("Lines")
+    # The breakdown needs the loaded frame (not available in query pushdown mode)
+    data = inbound_data if direction == "inbound" else outbound_data
+    if startup_pending[direction] or data is None:
+        return
+
+    # Read the widgets here, on the Tk thread
+    name, frequency = chart_series.get(), chart_frequency.get()
+    if direction == "inbound":
+        start_date, end_date = pd.Timestamp(order_start_date_entry.get_date()), pd.Timestamp(order_end_date_entry.get_date())
+        dc_name = dc_filter_inbound.get()
+        compute = lambda: inbound_breakdown(data, frequency, start_date, end_date, dc_name, inbound_index)
+    else:
+        start_date, end_date = pd.Timestamp(order_start_date_entry_outbound.get_date()), pd.Timestamp(order_end_date_entry_outbound.get_date())
+        dc_name, bu_name, channel_name = dc_filter.get(), bu_filter.get(), channel_filter.get()
+        compute = lambda: outbound_breakdown(data, frequency, start_date, end_date, dc_name, bu_name, channel_name, outbound_index)
+    title = f"{direction.capitalize()} {name} ({frequency})"
+    recompute_scheduler.request(
+        "chart",
+        compute,
+        lambda table: breakdown_chart.plot(list(table.index), table[name].to_numpy(), title),
+        lambda error: show_metrics_error(direction, error))
 ##############new function inbound onchange ################
 def on_date_change_inbound(event=None):
+    if refreshing["inbound"]:
+        return  # re-run once the refresh is applied
     start_date = order_start_date_entry.get_date()
     end_date = order_end_date_entry.get_date()  # Corrected to fetch from order_end_date_entry
 
     # Ensure both dates are valid
     if start_date and end_date:
+        # Days outside the loaded window are fetched first; the metrics follow once they are in
+        if USE_WINDOWED_LOAD and not startup_pending["inbound"] and not inbound_window.covers(start_date, end_date):
+            extend_inbound_window(start_date, end_date)
+            return
         update_metrics_on_filter_change(inbound_data, start_date, end_date, dc_filter_inbound.get())
 ##########new function inbound onchange ################
 # Function to fetch distinct DC names Inbound from the database
+@traced("db.distinct.inbound_dc")
 def get_distinct_dc_names():
     try:
-        # Set up your database connection (replace with your actual connection parameters)
-        conn = pymysql.connect(
-        host='10.216.252.8',  #
-        user=Shared.userid,
-        passwd=Shared.password,
-        db='temporary_data',
-        port=3306,
-        ssl_ca=sslca,
-        ssl_key=sslkey,
-        ssl_cert=sslcert
-    )
+        # Borrow a connection from the shared pool
+        with pooled_connection() as conn:
+            # Create a cursor to execute the query
+            cursor = conn.cursor()
 
-        # Create a cursor to execute the query
-        cursor = conn.cursor()
+            # SQL query to get distinct DC_NAME
+            query = f"SELECT DISTINCT DC_NAME FROM {INBOUND_TABLE}"
+            cursor.execute(query)
 
-        # SQL query to get distinct DC_NAME
-        query = "SELECT DISTINCT DC_NAME FROM temporary_data.ALPARGATAS_2024_INBOUND_STANDARD_TESTING"
-        cursor.execute(query)
+            # Fetch all distinct DC_NAME values from the result
+            dc_names = cursor.fetchall()
 
-        # Fetch all distinct DC_NAME values from the result
-        dc_names = cursor.fetchall()
-
-        # Close the cursor and connection
-        cursor.close()
-        conn.close()
+            # Close the cursor; the connection goes back to the pool
+            cursor.close()
 
         # Extract the DC names from the result tuples and add "All" at the beginning
         dc_values = ["All"] + [dc[0] for dc in dc_names]
@@ -243,10 +341,10 @@ def create_dc_filter(parent_frame):
     # Add a blank line (optional for extra spacing)
     spacer_label = ttk.Label(parent_frame, text="")
     spacer_label.pack(side="top", pady=(5, 5))  # Add vertical padding to create space
-    dc_label_inbound = ttk.Label(parent_frame, text="DC NAME", font=('Arial', 10))
+    dc_label_inbound = ttk.Label(parent_frame, text=FILTER_LABELS["DC_NAME"], font=('Arial', 10))
     dc_label_inbound.pack(side="left", padx=10)
-    dc_values = get_distinct_dc_names()
-    dc_filter_inbound = ttk.Combobox(parent_frame, values=dc_values, state='readonly', font=('Arial', 10))
+    # The DC list is filled in once the data has loaded (from the metadata catalog)
+    dc_filter_inbound = ttk.Combobox(parent_frame, values=["All"], state='readonly', font=('Arial', 10))
     dc_filter_inbound.set("All")  # Set the default value to "All"
     # dc_filter.pack(side="left", padx=10)
     # Position DC filter in the grid after inbound order profile
@@ -256,230 +354,159 @@ def create_dc_filter(parent_frame):
     dc_filter_inbound.bind("<<ComboboxSelected>>", lambda event: update_metrics_on_filter_change(inbound_data, order_start_date_entry.get_date(), order_end_date_entry.get_date(), dc_filter_inbound.get()))
 
 # Function to fetch min and max dates from the database
+@traced("db.min_max_dates.inbound")
 def fetch_min_max_dates_inbound():
     global min_date_sql_inbound, max_date_sql_inbound
-    connection = pymysql.connect(
-        host='10.216.252.8',
-        user=Shared.userid,
-        passwd=Shared.password,
-        db='client_data',
-        port=3306,
-        ssl_ca=sslca,
-        ssl_key=sslkey,
-        ssl_cert=sslcert
-    )
-
     try:
-        cursor = connection.cursor()
-        select_query = """SELECT MIN(DATE), MAX(DATE) FROM temporary_data.ALPARGATAS_2024_INBOUND_STANDARD_TESTING"""
-        cursor.execute(select_query)
-        min_date_sql_inbound, max_date_sql_inbound = cursor.fetchone()
+        with pooled_connection() as connection, span("db.date_bounds", table=INBOUND_TABLE) as bounds_span:
+            cursor = connection.cursor()
+            select_query = f"""SELECT MIN(DATE), MAX(DATE) FROM {INBOUND_TABLE}"""
+            cursor.execute(select_query)
+            min_date_sql_inbound, max_date_sql_inbound = cursor.fetchone()
+            cursor.close()
+            bounds_span.update(min_date=str(min_date_sql_inbound), max_date=str(max_date_sql_inbound))
 
         # Validate data
         if min_date_sql_inbound and max_date_sql_inbound:
             min_date_sql_inbound = pd.Timestamp(min_date_sql_inbound)
             max_date_sql_inbound = pd.Timestamp(max_date_sql_inbound)
-            print(f"Data fetched successfully! Min date: {min_date_sql_inbound}, Max date: {max_date_sql_inbound}")
         else:
             print("No valid date data fetched!")
     except Exception as e:
         print(f"Error fetching data: {str(e)}")
-    finally:
-        connection.close()
 
 
 
 # Function to fetch data from the MySQL table
-def connect_to_database_outbound():
-    connection = pymysql.connect(
-        host='10.216.252.8',  #
-        user=Shared.userid,
-        passwd=Shared.password,
-        db='client_data',
-        port=3306,
-        ssl_ca=sslca,
-        ssl_key=sslkey,
-        ssl_cert=sslcert
-    )
+@traced("load.outbound", measure=frame_size)
+def connect_to_database_outbound(progress_callback=None):
+    if USE_WINDOWED_LOAD or USE_SNAPSHOT_CACHE or USE_STREAMING_LOAD:
+        try:
+            if USE_WINDOWED_LOAD:
+                df_outbound = outbound_window.load_initial(progress_callback)
+            elif USE_SNAPSHOT_CACHE:
+                df_outbound = load_outbound_cached(SNAPSHOT_LOOKBACK_DAYS, progress_callback=progress_callback)
+            else:
+                df_outbound = stream_outbound_table(progress_callback=progress_callback)
+            report_memory("Outbound", df_outbound)
+            return df_outbound
+        except Exception as e:
+            print(f"Error fetching data: {str(e)}")
+            return None
 
     try:
-        cursor = connection.cursor()
-        select_query = """ SELECT DATE,ORDER_NUMBER,SKU,Qty,DC_NAME,BUSINESSUNIT,ORDERTYPE FROM temporary_data.ALPARGATAS_2024_OUTBOUND_STANDARD_TESTING """
-        cursor.execute(select_query)
-        rows = cursor.fetchall()
-        columns = [col[0] for col in cursor.description]
-        df_outbound = pd.DataFrame(rows, columns=columns)
-
-        print("Data fetched successfully!")
+        with pooled_connection() as connection:
+            cursor = connection.cursor()
+            select_query = f""" SELECT {','.join(OUTBOUND_COLUMNS)} FROM {OUTBOUND_TABLE} """
+            with span("db.query"):
+                cursor.execute(select_query)
+            with span("db.fetchall") as fetch_span:
+                rows = cursor.fetchall()
+                fetch_span["rows"] = len(rows)
+            columns = [col[0] for col in cursor.description]
+            cursor.close()
+        with span("frame.build") as build_span:
+            df_outbound = pd.DataFrame(rows, columns=columns)
+            object_bytes = memory_bytes(df_outbound)
+            build_span.update(rows=len(df_outbound), bytes=object_bytes)
+        with span("frame.schema"):
+            apply_schema(df_outbound)
+
+        report_memory("Outbound", df_outbound, object_bytes)
         return df_outbound
-
     except Exception as e:
         print(f"Error fetching data: {str(e)}")
         return None
 
-    finally:
-        connection.close()
 
 
 # Outbound Volumes Calculation
-def outbound_volumes(outbound_data, start_date=None, end_date=None, dc_name=None, bu_name=None, channel_name=None):
+@traced("metrics.outbound_volumes")
+def outbound_volumes(outbound_data, start_date=None, end_date=None, dc_name=None, bu_name=None, channel_name=None, date_index=None):
     try:
-        # Ensure 'DATE' column is in datetime format
-        if pd.api.types.is_datetime64_any_dtype(outbound_data['DATE']) == False:
-            outbound_data['DATE'] = pd.to_datetime(outbound_data['DATE'])
-        # Convert start_date and end_date to pandas Timestamps for correct comparison
-        if start_date:
-            start_date = pd.to_datetime(start_date)
-        if end_date:
-            end_date = pd.to_datetime(end_date)
-
-        filtered_data = outbound_data
-        if start_date and end_date:
-            filtered_data = filtered_data[(filtered_data['DATE'] >= start_date) & (filtered_data['DATE'] <= end_date)]
-        if dc_name and dc_name != "All":
-            filtered_data = filtered_data[filtered_data['DC_NAME'] == dc_name]
-        if bu_name and bu_name != "All":
-            filtered_data = filtered_data[filtered_data['BUSINESSUNIT'] == bu_name]
-        if channel_name and channel_name != "All":
-            filtered_data = filtered_data[filtered_data['ORDERTYPE'] == channel_name]
-
-        days_of_data = (filtered_data['DATE'].max() - filtered_data['DATE'].min()).days
-        total_orders = filtered_data['ORDER_NUMBER'].nunique()
-        total_lines = filtered_data.shape[0]
-        total_units = filtered_data['Qty'].sum()
-        skus_with_movement = filtered_data['SKU'].nunique()
-
-        total_orders_formatted = format_number(total_orders)
-        total_lines_formatted = format_number(total_lines)
-        total_units_formatted = format_number(total_units)
-        skus_with_movement_formatted = format_number(skus_with_movement)
-
-        metrics = {
-            "Days of Data": days_of_data,
-            "Total Orders": total_orders_formatted,
-            "Total Lines": total_lines_formatted,
-            "Total Units": total_units_formatted,
-            "SKUs with Movement": skus_with_movement_formatted
-        }
-        return metrics
+        return volume_cards(outbound_summary(outbound_data, start_date, end_date, dc_name, bu_name, channel_name, date_index=date_index))
     except KeyError as e:
         messagebox.showerror("Error", f"Missing column in outbound data: {str(e)}")
         return None
 
 # Outbound Order Profile Calculation
-def outbound_order_profile(outbound_data, start_date=None, end_date=None, dc_name=None, bu_name=None, channel_name=None):
+@traced("metrics.outbound_order_profile")
+def outbound_order_profile(outbound_data, start_date=None, end_date=None, dc_name=None, bu_name=None, channel_name=None, date_index=None):
     try:
-        # Convert start_date and end_date to pandas Timestamps for correct comparison
-        if start_date:
-            start_date = pd.to_datetime(start_date)
-        if end_date:
-            end_date = pd.to_datetime(end_date)
-
-        filtered_data = outbound_data
-        if start_date and end_date:
-            filtered_data = filtered_data[(filtered_data['DATE'] >= start_date) & (filtered_data['DATE'] <= end_date)]
-        if dc_name and dc_name != "All":
-            filtered_data = filtered_data[filtered_data['DC_NAME'] == dc_name]
-        if bu_name and bu_name != "All":
-            filtered_data = filtered_data[filtered_data['BUSINESSUNIT'] == bu_name]
-        if channel_name and channel_name != "All":
-            filtered_data = filtered_data[filtered_data['ORDERTYPE'] == channel_name]
-
-        total_units = filtered_data['Qty'].sum()
-        total_lines = filtered_data.shape[0]
-        total_orders = filtered_data['ORDER_NUMBER'].nunique()
-
-        # Prevent division by zero
-        ob_units_per_line = total_units / total_lines if total_lines > 0 else 0
-        ob_lines_per_po = total_lines / total_orders if total_orders > 0 else 0
-        ob_units_per_po = total_units / total_orders if total_orders > 0 else 0
-
-        ob_units_per_line_formatted = format_number(ob_units_per_line)
-        ob_lines_per_po_formatted = format_number(ob_lines_per_po)
-        ob_units_per_po_formatted = format_number(ob_units_per_po)
-
-        metrics = {
-            "OB Units Per Line": ob_units_per_line_formatted,
-            "OB Lines Per PO": ob_lines_per_po_formatted,
-            "OB Units Per PO": ob_units_per_po_formatted
-        }
-        return metrics
+        return order_profile_cards(outbound_summary(outbound_data, start_date, end_date, dc_name, bu_name, channel_name, date_index=date_index))
     except KeyError as e:
         messagebox.showerror("Error", f"Missing column in outbound data: {str(e)}")
         return None
 
+# Outbound metrics (volumes and order profile in one pass) using the active computation mode.
+# Safe to run on a worker thread: errors are raised, and shown by show_metrics_error on the Tk thread.
+@traced("metrics.outbound", measure=lambda metrics: {"rows": metrics.total_lines})
+def compute_outbound_metrics_uncached(outbound_data, start_date, end_date, dc_name, bu_name, channel_name, approximate=USE_APPROX_DISTINCT):
+    if USE_QUERY_PUSHDOWN:
+        return OutboundMetrics.from_kpis(fetch_outbound_kpis(start_date, end_date, dc_name, bu_name, channel_name))
+    cube = outbound_cube if USE_METRICS_CUBE else None
+    sketches = outbound_sketches if approximate else None
+    return outbound_summary(outbound_data, start_date, end_date, dc_name, bu_name, channel_name, date_index=outbound_index, cube=cube, sketches=sketches)
+
+# Outbound metrics, served from the LRU result cache when this filter combination was seen before.
+# The cache holds results of the USE_APPROX_DISTINCT mode, so the other mode is computed directly.
+@traced("metrics.outbound_cached")
+def compute_outbound_metrics(outbound_data, start_date, end_date, dc_name, bu_name, channel_name, approximate=USE_APPROX_DISTINCT):
+    if approximate != USE_APPROX_DISTINCT:
+        return compute_outbound_metrics_uncached(outbound_data, start_date, end_date, dc_name, bu_name, channel_name, approximate)
+    return metrics_cache.get_or_compute(
+        lambda: compute_outbound_metrics_uncached(outbound_data, start_date, end_date, dc_name, bu_name, channel_name),
+        "outbound", start_date, end_date, dc_name, bu_name, channel_name)
+
 
 # Display function for outbound data and outbound order profile
+@traced("display.outbound_summary")
 def display_outbound_summary(outbound_metrics, outbound_order_profile_metrics,outbound_data, start_date, end_date, dc_name,bu_name,channel_name):
+    global outbound_card_grid
     if not outbound_metrics or not outbound_order_profile_metrics:
         return
 
-    for widget in card_frame_outbound.winfo_children():
-        widget.destroy()
-
-    def create_card(parent, metric, value, row, col):
-        frame = tk.Frame(parent, relief='solid', borderwidth=1, padx=5, pady=5, bg='white')
-        frame.config(highlightbackground="red", highlightcolor="red", highlightthickness=2)
-        frame.grid(row=row, column=col, padx=5, pady=5, ipadx=5, ipady=5)
-
-        label_title = tk.Label(frame, text=metric, font=('Arial', 10, 'bold'))
-        label_title.pack(side='top', anchor='center')
-
-        label_value = tk.Label(frame, text=str(value), font=('Arial', 10))
-        label_value.pack(side='top', anchor='center')
-
-    outbound_volumes_label = tk.Label(card_frame_outbound, text="Outbound Volumes", font=('Arial', 14, 'bold'), anchor='w')
-    outbound_volumes_label.grid(row=0, column=0, columnspan=6, pady=10, sticky='w')
-
-    outbound_order_profile_label = tk.Label(card_frame_outbound, text="Outbound Order Profile", font=('Arial', 14, 'bold'), anchor='w')
-    outbound_order_profile_label.grid(row=0, column=6, columnspan=3, pady=10, sticky='w')
-
-    col = 0
-    for metric, value in outbound_metrics.items():
-        create_card(card_frame_outbound, metric, value, 1, col)
-        col += 1
-
-    col = 6
-    for metric, value in outbound_order_profile_metrics.items():
-        create_card(card_frame_outbound, metric, value, 1, col)
-        col += 1
+    # The cards are built on first use and afterwards only have their values updated
+    if outbound_card_grid is None:
+        outbound_card_grid = CardGrid(card_frame_outbound, [
+            ("Outbound Volumes", 0, 6, list(outbound_metrics)),
+            ("Outbound Order Profile", 6, 3, list(outbound_order_profile_metrics)),
+        ])
+    outbound_card_grid.update(outbound_metrics, outbound_order_profile_metrics)
 
 
 
 
 # Function to update metrics based on outbound data filters
 def update_outbound_metrics_on_filter_change(outbound_data, start_date, end_date, dc_name, bu_name, channel_name):
-    outbound_metrics = outbound_volumes(outbound_data, start_date, end_date, dc_name, bu_name, channel_name)
-    outbound_order_profile_metrics = outbound_order_profile(outbound_data, start_date, end_date, dc_name, bu_name, channel_name)
-    display_outbound_summary(outbound_metrics, outbound_order_profile_metrics,outbound_data, start_date, end_date, dc_name,bu_name,channel_name)
+    # Nothing to compute until the startup load has finished
+    if startup_pending["outbound"]:
+        return
+    # Computed off the Tk thread; rapid filter changes are coalesced by the scheduler
+    recompute_scheduler.request(
+        "outbound",
+        lambda: compute_outbound_metrics(outbound_data, start_date, end_date, dc_name, bu_name, channel_name),
+        lambda metrics: display_outbound_summary(volume_cards(metrics), order_profile_cards(metrics), outbound_data, start_date, end_date, dc_name, bu_name, channel_name),
+        lambda error: show_metrics_error("outbound", error))
+    refresh_breakdown_chart(changed_direction="outbound")
 # Function to fetch distinct DC names outbound from the database
+@traced("db.distinct.outbound_dc")
 def get_distinct_dc_names_outbound():
     try:
-        # Set up your database connection (replace with your actual connection parameters)
-        conn = pymysql.connect(
-        host='10.216.252.8',  #
-        user=Shared.userid,
-        passwd=Shared.password,
-        db='temporary_data',
-        port=3306,
-        ssl_ca=sslca,
-        ssl_key=sslkey,
-        ssl_cert=sslcert
-    )
+        # Borrow a connection from the shared pool
+        with pooled_connection() as conn:
+            # Create a cursor to execute the query
+            cursor = conn.cursor()
 
-        # Create a cursor to execute the query
-        cursor = conn.cursor()
+            # SQL query to get distinct DC_NAME
+            query = f"SELECT DISTINCT DC_NAME FROM {OUTBOUND_TABLE}"
+            cursor.execute(query)
 
-        # SQL query to get distinct DC_NAME
-        query = "SELECT DISTINCT DC_NAME FROM temporary_data.ALPARGATAS_2024_OUTBOUND_STANDARD_TESTING"
-        cursor.execute(query)
+            # Fetch all distinct DC_NAME outbound values from the result
+            dc_names_outbound = cursor.fetchall()
 
-        # Fetch all distinct DC_NAME outbound values from the result
-        dc_names_outbound = cursor.fetchall()
-
-        # Close the cursor and connection
-        cursor.close()
-        conn.close()
+            # Close the cursor; the connection goes back to the pool
+            cursor.close()
 
         # Extract the DC names outbound from the result tuples and add "All" at the beginning
         dc_values_outbound = ["All"] + [dc[0] for dc in dc_names_outbound]
@@ -502,43 +529,33 @@ def create_dc_filter_outbound(parent_frame):
     spacer_label_outbound = ttk.Label(parent_frame, text="")
     spacer_label_outbound.pack(side="top", pady=(5, 5))  # Add vertical padding to create space
     # Create a label for DC NAME
-    dc_label_outbound = ttk.Label(parent_frame, text="DC NAME", font=('Arial', 10))
+    dc_label_outbound = ttk.Label(parent_frame, text=FILTER_LABELS["DC_NAME"], font=('Arial', 10))
     dc_label_outbound.pack(side="left", padx=10)
-    dc_values_outbound = get_distinct_dc_names_outbound()
-    dc_filter = ttk.Combobox(parent_frame, values=dc_values_outbound, state='readonly', font=('Arial', 10))
+    # The DC list is filled in once the data has loaded (from the metadata catalog)
+    dc_filter = ttk.Combobox(parent_frame, values=["All"], state='readonly', font=('Arial', 10))
     dc_filter.set("All")  # Set the default value to "All"
     dc_filter.pack(side="left", padx=10)
 
     # Bind event to update the metrics on DC selection change
-    dc_filter.bind("<<ComboboxSelected>>", lambda event: update_outbound_metrics_on_filter_change(outbound_data,order_start_date_entry_outbound.get_date(), order_end_date_entry_outbound.get_date(), dc_filter.get(), bu_filter.get(), channel_filter.get()))
+    dc_filter.bind("<<ComboboxSelected>>", on_outbound_filter_change)
 
+@traced("db.distinct.outbound_bu")
 def get_distinct_bu_filter_outbound():
     try:
-        # Set up your database connection (replace with your actual connection parameters)
-        conn = pymysql.connect(
-        host='10.216.252.8',  #
-        user=Shared.userid,
-        passwd=Shared.password,
-        db='temporary_data',
-        port=3306,
-        ssl_ca=sslca,
-        ssl_key=sslkey,
-        ssl_cert=sslcert
-    )
-
-        # Create a cursor to execute the query
-        cursor = conn.cursor()
+        # Borrow a connection from the shared pool
+        with pooled_connection() as conn:
+            # Create a cursor to execute the query
+            cursor = conn.cursor()
 
-        # SQL query to get distinct BU_NAME
-        query = "SELECT DISTINCT BUSINESSUNIT FROM temporary_data.ALPARGATAS_2024_OUTBOUND_STANDARD_TESTING"
-        cursor.execute(query)
+            # SQL query to get distinct BU_NAME
+            query = f"SELECT DISTINCT BUSINESSUNIT FROM {OUTBOUND_TABLE}"
+            cursor.execute(query)
 
-        # Fetch all distinct BUSINESSUNIT outbound values from the result
-        bu_names_outbound = cursor.fetchall()
+            # Fetch all distinct BUSINESSUNIT outbound values from the result
+            bu_names_outbound = cursor.fetchall()
 
-        # Close the cursor and connection
-        cursor.close()
-        conn.close()
+            # Close the cursor; the connection goes back to the pool
+            cursor.close()
 
         # Extract the BUSINESSUNIT names outbound from the result tuples and add "All" at the beginning
         bu_values = ["All"] + [dc[0] for dc in bu_names_outbound]
@@ -552,42 +569,32 @@ def get_distinct_bu_filter_outbound():
 def create_bu_filter(parent_frame):
     global bu_filter
     # bu_values = ["All"] + list(outbound_data['BUSINESSUNIT'].unique())
-    bu_label = ttk.Label(parent_frame, text="BUSINESSUNIT", font=('Arial', 10))
+    bu_label = ttk.Label(parent_frame, text=FILTER_LABELS["BUSINESSUNIT"], font=('Arial', 10))
     bu_label.pack(side="left", padx=10)
-    bu_values = get_distinct_bu_filter_outbound()
-    bu_filter = ttk.Combobox(parent_frame, values=bu_values, state='readonly', font=('Arial', 10))
+    # The BU list is filled in once the data has loaded, narrowed to the chosen DC
+    bu_filter = ttk.Combobox(parent_frame, values=["All"], state='readonly', font=('Arial', 10))
     bu_filter.set("All")  # Set default value
     bu_filter.pack(side="left", padx=10)
 
     # Bind event to update the metrics on BU selection change
-    bu_filter.bind("<<ComboboxSelected>>", lambda event: update_outbound_metrics_on_filter_change(outbound_data, order_start_date_entry_outbound.get_date(), order_end_date_entry_outbound.get_date(), dc_filter.get(), bu_filter.get(), channel_filter.get()))
+    bu_filter.bind("<<ComboboxSelected>>", on_outbound_filter_change)
+@traced("db.distinct.outbound_channel")
 def get_distinct_channel_filter_outbound():
     try:
-        # Set up your database connection (replace with your actual connection parameters)
-        conn = pymysql.connect(
-        host='10.216.252.8',  #
-        user=Shared.userid,
-        passwd=Shared.password,
-        db='temporary_data',
-        port=3306,
-        ssl_ca=sslca,
-        ssl_key=sslkey,
-        ssl_cert=sslcert
-    )
-
-        # Create a cursor to execute the query
-        cursor = conn.cursor()
+        # Borrow a connection from the shared pool
+        with pooled_connection() as conn:
+            # Create a cursor to execute the query
+            cursor = conn.cursor()
 
-        # SQL query to get distinct channel_NAME
-        query = "SELECT DISTINCT ORDERTYPE FROM temporary_data.ALPARGATAS_2024_OUTBOUND_STANDARD_TESTING"
-        cursor.execute(query)
+            # SQL query to get distinct channel_NAME
+            query = f"SELECT DISTINCT ORDERTYPE FROM {OUTBOUND_TABLE}"
+            cursor.execute(query)
 
-        # Fetch all distinct ORDERTYPE outbound values from the result
-        channel_names_outbound = cursor.fetchall()
+            # Fetch all distinct ORDERTYPE outbound values from the result
+            channel_names_outbound = cursor.fetchall()
 
-        # Close the cursor and connection
-        cursor.close()
-        conn.close()
+            # Close the cursor; the connection goes back to the pool
+            cursor.close()
 
         # Extract the channel names outbound from the result tuples and add "All" at the beginning
         channel_values = ["All"] + [dc[0] for dc in channel_names_outbound]
@@ -602,10 +609,10 @@ def create_channel_filter(parent_frame):
     global channel_filter
     # channel_values = ["All"] + list(outbound_data['ORDERTYPE'].unique())
     # Create a label for DC NAME
-    channel_label = ttk.Label(parent_frame, text="ORDERTYPE", font=('Arial', 10))
+    channel_label = ttk.Label(parent_frame, text=FILTER_LABELS["ORDERTYPE"], font=('Arial', 10))
     channel_label.pack(side="left", padx=10)
-    channel_values = get_distinct_channel_filter_outbound()
-    channel_filter = ttk.Combobox(parent_frame, values=channel_values, state='readonly', font=('Arial', 10))
+    # The channel list is filled in once the data has loaded, narrowed to the chosen DC and BU
+    channel_filter = ttk.Combobox(parent_frame, values=["All"], state='readonly', font=('Arial', 10))
     channel_filter.set("All")  # Set default value
     channel_filter.pack(side="left", padx=10)
 
@@ -613,6 +620,364 @@ def create_channel_filter(parent_frame):
     channel_filter.bind("<<ComboboxSelected>>", lambda event: update_outbound_metrics_on_filter_change(outbound_data, order_start_date_entry_outbound.get_date(),order_end_date_entry_outbound.get_date(), dc_filter.get(), bu_filter.get(), channel_filter.get()))
 
 
+# Progress callback that shows the rows loaded so far in a status label.
+# With a loader the update is posted to the Tk thread, so it can be called from a worker.
+def show_rows_loaded(label, direction, loader=None):
+    def callback(rows_loaded):
+        text = f"Loading {direction} data... {rows_loaded:,} rows"
+        if loader is not None:
+            loader.post(label.config, text=text)
+        else:
+            label.config(text=text)
+            label.update_idletasks()
+    return callback
+
+# Placeholder card values shown until a direction has loaded
+def placeholder_cards(metrics):
+    return ({metric: "..." for metric in metrics.volumes()},
+            {metric: "..." for metric in metrics.order_profile()})
+
+# Load, sort and index the inbound frame (runs on a worker thread)
+@traced("load.inbound_frame", measure=lambda loaded: frame_size(loaded and loaded[0]))
+def load_inbound_frame(progress_callback=None):
+    df_inbound = connect_to_database_inbound(progress_callback)
+    if df_inbound is None:
+        return None
+    return prepare_inbound_frame(df_inbound)
+
+# Sort and index a loaded inbound frame
+def prepare_inbound_frame(df_inbound):
+    # Sorted by DATE once so date ranges are binary-searched slices
+    with span("index.sort"):
+        data = sort_by_date(df_inbound)
+    with span("index.cube"):
+        cube = build_inbound_cube(data) if USE_METRICS_CUBE else None
+    sketches = build_inbound_sketches(data, APPROX_EXACT_BELOW_ROWS) if USE_APPROX_DISTINCT else None
+    return data, DateIndex(data), cube, sketches, build_inbound_catalog(data)
+
+# Load, sort and index the outbound frame (runs on a worker thread)
+@traced("load.outbound_frame", measure=lambda loaded: frame_size(loaded and loaded[0]))
+def load_outbound_frame(progress_callback=None):
+    df_outbound = connect_to_database_outbound(progress_callback)
+    if df_outbound is None:
+        return None
+    return prepare_outbound_frame(df_outbound)
+
+# Sort and index a loaded outbound frame
+def prepare_outbound_frame(df_outbound):
+    # Sorted by DATE once so date ranges are binary-searched slices
+    with span("index.sort"):
+        data = sort_by_date(df_outbound)
+    with span("index.cube"):
+        cube = build_outbound_cube(data) if USE_METRICS_CUBE else None
+    sketches = build_outbound_sketches(data, APPROX_EXACT_BELOW_ROWS) if USE_APPROX_DISTINCT else None
+    return data, DateIndex(data), cube, sketches, build_outbound_catalog(data)
+
+# Set the selectable range of a pair of date entries and select all of it
+def set_date_range(start_entry, end_entry, min_date, max_date):
+    for entry in (start_entry, end_entry):
+        entry.config(mindate=min_date, maxdate=max_date, state='normal')
+    start_entry.set_date(min_date)
+    end_entry.set_date(max_date)
+
+# Mark one startup part of a direction as loaded; computes the first metrics once all parts are in
+def mark_startup_ready(direction, part):
+    startup_pending[direction].discard(part)
+    if startup_pending[direction]:
+        return
+    if direction == "inbound":
+        update_metrics_on_filter_change(inbound_data, order_start_date_entry.get_date(), order_end_date_entry.get_date(), dc_filter_inbound.get())
+    else:
+        update_outbound_metrics_on_filter_change(outbound_data, order_start_date_entry_outbound.get_date(), order_end_date_entry_outbound.get_date(), dc_filter.get(), bu_filter.get(), channel_filter.get())
+    if not startup_pending["inbound"] and not startup_pending["outbound"]:
+        load_status_label.config(text="")
+
+# Tk-thread handlers for the background results
+def apply_inbound_frame(loaded):
+    global min_date_sql_inbound, max_date_sql_inbound
+    if loaded is None:
+        load_status_label.config(text="Failed to load inbound data")
+        return
+    with span("frame.apply", direction="inbound") as apply_span:
+        set_inbound_frame(loaded)
+        # Date bounds come from the loaded frame, or from the whole table when only a window is loaded
+        bounds = inbound_window if USE_WINDOWED_LOAD else inbound_catalog
+        min_date_sql_inbound, max_date_sql_inbound = bounds.min_date, bounds.max_date
+        apply_span.update(min_date=str(min_date_sql_inbound), max_date=str(max_date_sql_inbound))
+    apply_inbound_dates()
+    if USE_WINDOWED_LOAD and inbound_catalog.min_date is not None:
+        # Start on the loaded window rather than the whole table
+        order_start_date_entry.set_date(inbound_catalog.min_date)
+    mark_startup_ready("inbound", "data")
+
+# Make a prepared inbound frame the current one (Tk thread)
+def set_inbound_frame(loaded):
+    global inbound_data, inbound_index, inbound_cube, inbound_sketches, inbound_catalog
+    inbound_data, inbound_index, inbound_cube, inbound_sketches, inbound_catalog = loaded
+    metrics_cache.invalidate("inbound")
+    # Filter values come from the loaded frame
+    dc_filter_inbound.config(values=inbound_catalog.values("DC_NAME"))
+
+def apply_outbound_frame(loaded):
+    global min_date_sql_outbound, max_date_sql_outbound
+    if loaded is None:
+        load_status_label.config(text="Failed to load outbound data")
+        return
+    with span("frame.apply", direction="outbound") as apply_span:
+        set_outbound_frame(loaded)
+        # Date bounds come from the loaded frame, or from the whole table when only a window is loaded
+        bounds = outbound_window if USE_WINDOWED_LOAD else outbound_catalog
+        min_date_sql_outbound, max_date_sql_outbound = bounds.min_date, bounds.max_date
+        apply_span.update(min_date=str(min_date_sql_outbound), max_date=str(max_date_sql_outbound))
+    apply_outbound_dates()
+    if USE_WINDOWED_LOAD and outbound_catalog.min_date is not None:
+        # Start on the loaded window rather than the whole table
+        order_start_date_entry_outbound.set_date(outbound_catalog.min_date)
+    mark_startup_ready("outbound", "data")
+
+# Make a prepared outbound frame the current one (Tk thread)
+def set_outbound_frame(loaded):
+    global outbound_data, outbound_index, outbound_cube, outbound_sketches, outbound_catalog
+    outbound_data, outbound_index, outbound_cube, outbound_sketches, outbound_catalog = loaded
+    metrics_cache.invalidate("outbound")
+    # Filter values come from the loaded frame
+    refresh_outbound_filter_values()
+
+# Worker side of a window extension: fetch the days of the selection that are not loaded yet and
+# re-index the merged frame; returns (merged frame, prepared), or None when another extension
+# already fetched them
+def load_window_range(window, prepare, start_date, end_date, progress_callback=None):
+    frame = window.ensure(start_date, end_date, progress_callback)
+    return None if frame is None else (frame, prepare(frame))
+
+# Date selection outside the loaded inbound days: fetch the missing ranges, then recompute
+def extend_inbound_window(start_date, end_date):
+    loader = recompute_scheduler.loader
+    window_extensions["inbound"] += 1
+    load_status_label.config(text=f"Loading inbound data for {start_date} to {end_date}...")
+    loader.submit(load_window_range, inbound_window, prepare_inbound_frame, start_date, end_date,
+                  show_rows_loaded(load_status_label, "inbound", loader),
+                  on_done=apply_inbound_window, on_error=lambda error: show_window_error("inbound", error))
+
+def apply_inbound_window(result):
+    window_extensions["inbound"] -= 1
+    load_status_label.config(text="")
+    if result is not None:
+        frame, loaded = result
+        # A later extension already holds these rows too; its result will be applied instead
+        if not inbound_window.is_current(frame):
+            return
+        set_inbound_frame(loaded)
+    update_metrics_on_filter_change(inbound_data, order_start_date_entry.get_date(), order_end_date_entry.get_date(), dc_filter_inbound.get())
+
+# Date selection outside the loaded outbound days: fetch the missing ranges, then recompute
+def extend_outbound_window(start_date, end_date):
+    loader = recompute_scheduler.loader
+    window_extensions["outbound"] += 1
+    load_status_label.config(text=f"Loading outbound data for {start_date} to {end_date}...")
+    loader.submit(load_window_range, outbound_window, prepare_outbound_frame, start_date, end_date,
+                  show_rows_loaded(load_status_label, "outbound", loader),
+                  on_done=apply_outbound_window, on_error=lambda error: show_window_error("outbound", error))
+
+def apply_outbound_window(result):
+    window_extensions["outbound"] -= 1
+    load_status_label.config(text="")
+    if result is not None:
+        frame, loaded = result
+        # A later extension already holds these rows too; its result will be applied instead
+        if not outbound_window.is_current(frame):
+            return
+        set_outbound_frame(loaded)
+    update_outbound_metrics_on_filter_change(outbound_data, order_start_date_entry_outbound.get_date(), order_end_date_entry_outbound.get_date(), dc_filter.get(), bu_filter.get(), channel_filter.get())
+
+def show_window_error(direction, error):
+    window_extensions[direction] -= 1
+    load_status_label.config(text=f"Failed to load {direction} data")
+    messagebox.showerror("Error", f"Failed to load {direction} data for the selected dates: {str(error)}")
+
+# Narrow the outbound BU and channel lists to the chosen DC (and BU); a selection that is
+# no longer available falls back to "All"
+def refresh_outbound_filter_values():
+    if outbound_catalog is None:
+        return
+    selections = {"DC_NAME": dc_filter.get(), "BUSINESSUNIT": bu_filter.get()}
+    dc_filter.config(values=outbound_catalog.values("DC_NAME"))
+    for combobox, column in ((bu_filter, "BUSINESSUNIT"), (channel_filter, "ORDERTYPE")):
+        values = outbound_catalog.values(column, selections)
+        combobox.config(values=values)
+        if combobox.get() not in values:
+            combobox.set("All")
+        selections[column] = combobox.get()
+
+# Outbound filter change: update the cascading lists, then the metrics
+def on_outbound_filter_change(event=None):
+    refresh_outbound_filter_values()
+    update_outbound_metrics_on_filter_change(outbound_data, order_start_date_entry_outbound.get_date(), order_end_date_entry_outbound.get_date(), dc_filter.get(), bu_filter.get(), channel_filter.get())
+
+def apply_inbound_dates(_=None):
+    global selected_start_date, selected_end_date
+    # Ensure min_date_sql_inbound and max_date_sql_inbound are available
+    if min_date_sql_inbound and max_date_sql_inbound:
+        selected_start_date = min_date_sql_inbound
+        selected_end_date = max_date_sql_inbound
+        date_range_label_inbound.config(text=f"Dates available from {min_date_sql_inbound.date()} to {max_date_sql_inbound.date()}")
+    else:
+        # Handle fallback in case no data is fetched
+        selected_start_date = pd.Timestamp('2000-01-01')
+        selected_end_date = pd.Timestamp('2100-01-01')
+        date_range_label_inbound.config(text="No dates available")
+    set_date_range(order_start_date_entry, order_end_date_entry, selected_start_date, selected_end_date)
+    if USE_QUERY_PUSHDOWN:
+        mark_startup_ready("inbound", "dates")
+
+def apply_outbound_dates(_=None):
+    global selected_start_date_outbound, selected_end_date_outbound
+    # Ensure min_date_sql_outbound and max_date_sql_outbound are available
+    if min_date_sql_outbound and max_date_sql_outbound:
+        selected_start_date_outbound = min_date_sql_outbound
+        selected_end_date_outbound = max_date_sql_outbound
+    else:
+        # Handle fallback in case no data is fetched
+        selected_start_date_outbound = pd.Timestamp('2000-01-01')
+        selected_end_date_outbound = pd.Timestamp('2100-01-01')
+    set_date_range(order_start_date_entry_outbound, order_end_date_entry_outbound, selected_start_date_outbound, selected_end_date_outbound)
+    if USE_QUERY_PUSHDOWN:
+        mark_startup_ready("outbound", "dates")
+
+# Submit every startup fetch to the worker pool; results are applied on the Tk thread as they arrive
+def start_background_loading(loader):
+    startup_pending["inbound"] = {"dates"} if USE_QUERY_PUSHDOWN else {"data"}
+    startup_pending["outbound"] = {"dates"} if USE_QUERY_PUSHDOWN else {"data"}
+    load_status_label.config(text="Loading data...")
+
+    if not USE_QUERY_PUSHDOWN:
+        # Filter values and date bounds are derived from the loaded frames (see MetadataCatalog)
+        loader.submit(load_inbound_frame, show_rows_loaded(load_status_label, "inbound", loader), on_done=apply_inbound_frame)
+        loader.submit(load_outbound_frame, show_rows_loaded(load_status_label, "outbound", loader), on_done=apply_outbound_frame)
+        return
+
+    # Pushdown mode keeps no frame, so the metadata comes from the server
+    loader.submit(fetch_min_max_dates_inbound, on_done=apply_inbound_dates)
+    loader.submit(fetch_min_max_dates_outbound, on_done=apply_outbound_dates)
+    loader.submit(get_distinct_dc_names, on_done=lambda values: dc_filter_inbound.config(values=values))
+    loader.submit(get_distinct_dc_names_outbound, on_done=lambda values: dc_filter.config(values=values))
+    loader.submit(get_distinct_bu_filter_outbound, on_done=lambda values: bu_filter.config(values=values))
+    loader.submit(get_distinct_channel_filter_outbound, on_done=lambda values: channel_filter.config(values=values))
+
+
+# One lazily loaded tab per registered dataset other than the default (which is the summary tab)
+def create_dataset_tabs(notebook, loader):
+    datasets = list(load_registry().values())[1:]
+    if not datasets:
+        return
+    budget = TabMemoryBudget(TAB_MEMORY_BUDGET_MB * 2**20)
+    tabs = {}
+    for dataset in datasets:
+        tab = DatasetTab(notebook, dataset, loader, recompute_scheduler, budget)
+        tabs[str(tab.frame)] = tab
+
+    def on_tab_changed(event=None):
+        tab = tabs.get(notebook.select())
+        if tab is not None:
+            tab.on_opened()
+    notebook.bind("<<NotebookTabChanged>>", on_tab_changed)
+
+# Incremental refresh of one direction: the rows from its last loaded day on are fetched on a worker
+# and applied to the loaded frame, date index, cube and catalog (see live_refresh.apply_tail)
+def refresh_direction(direction):
+    if startup_pending[direction] or refreshing[direction] or window_extensions[direction]:
+        return
+    if USE_QUERY_PUSHDOWN:
+        # Nothing is held locally; recomputing re-runs the aggregate query
+        metrics_cache.invalidate(direction)
+        (on_date_change_inbound if direction == "inbound" else on_date_change_outbound)()
+        return
+    if direction == "inbound":
+        if inbound_data is None:
+            return
+        prepared = (inbound_data, inbound_index, inbound_cube, inbound_sketches, inbound_catalog)
+        table, columns, build_cube = INBOUND_TABLE, INBOUND_COLUMNS, build_inbound_cube
+        build_sketches = lambda rows: build_inbound_sketches(rows, APPROX_EXACT_BELOW_ROWS)
+    else:
+        if outbound_data is None:
+            return
+        prepared = (outbound_data, outbound_index, outbound_cube, outbound_sketches, outbound_catalog)
+        table, columns, build_cube = OUTBOUND_TABLE, OUTBOUND_COLUMNS, build_outbound_cube
+        build_sketches = lambda rows: build_outbound_sketches(rows, APPROX_EXACT_BELOW_ROWS)
+    refreshing[direction] = True
+    recompute_scheduler.loader.submit(
+        refresh_prepared, prepared, table, columns, build_cube, build_sketches,
+        on_done=lambda refreshed: apply_refresh(direction, prepared, refreshed),
+        on_error=lambda error: finish_refresh(direction, f"Failed to refresh {direction} data: {str(error)}"))
+
+# Tk-thread side of a refresh: adopt the extended frame, move the date bounds, then recompute
+def apply_refresh(direction, prepared, refreshed):
+    global max_date_sql_inbound, max_date_sql_outbound
+    current = inbound_data if direction == "inbound" else outbound_data
+    if refreshed is None or current is not prepared[0]:
+        finish_refresh(direction, f"No new {direction} rows at {time.strftime('%H:%M:%S')}")
+        return
+    first_day = last_loaded_day(prepared[0])
+    if direction == "inbound":
+        set_inbound_frame(refreshed)
+        if USE_WINDOWED_LOAD:
+            inbound_window.adopt_refresh(refreshed[0], first_day)
+        previous_max = max_date_sql_inbound
+        max_date_sql_inbound = max(filter(None, [previous_max, last_loaded_day(refreshed[0])]))
+        new_max = max_date_sql_inbound
+        entries = (order_start_date_entry, order_end_date_entry)
+    else:
+        set_outbound_frame(refreshed)
+        if USE_WINDOWED_LOAD:
+            outbound_window.adopt_refresh(refreshed[0], first_day)
+        previous_max = max_date_sql_outbound
+        max_date_sql_outbound = max(filter(None, [previous_max, last_loaded_day(refreshed[0])]))
+        new_max = max_date_sql_outbound
+        entries = (order_start_date_entry_outbound, order_end_date_entry_outbound)
+    for entry in entries:
+        entry.config(maxdate=new_max)
+    # A selection running to the last day follows the new last day
+    if previous_max is not None and pd.Timestamp(entries[1].get_date()) >= previous_max.normalize():
+        entries[1].set_date(new_max)
+    finish_refresh(direction, f"{direction.capitalize()} refreshed at {time.strftime('%H:%M:%S')}: {len(refreshed[0]) - len(prepared[0]):+,} rows")
+
+def finish_refresh(direction, message):
+    refreshing[direction] = False
+    load_status_label.config(text=message)
+    # Recompute with the current selection (date changes made during the refresh were deferred)
+    (on_date_change_inbound if direction == "inbound" else on_date_change_outbound)()
+
+def refresh_all():
+    refresh_direction("inbound")
+    refresh_direction("outbound")
+
+# Periodic refresh on the Tk timer
+def schedule_live_refresh():
+    if LIVE_REFRESH_SECONDS <= 0:
+        return
+    def tick():
+        refresh_all()
+        root.after(LIVE_REFRESH_SECONDS * 1000, tick)
+    root.after(LIVE_REFRESH_SECONDS * 1000, tick)
+
+# Hidden Diagnostics tab listing the recorded spans; toggled with DIAGNOSTICS_SHORTCUT
+def create_diagnostics_tab(notebook):
+    global diagnostics_panel
+    diagnostics_frame = ttk.Frame(notebook)
+    notebook.add(diagnostics_frame, text="Diagnostics")
+    notebook.hide(diagnostics_frame)
+    diagnostics_panel = DiagnosticsPanel(diagnostics_frame, recorder, cache_stats=metrics_cache.stats)
+
+    def toggle(event=None):
+        if notebook.tab(diagnostics_frame, 'state') == 'hidden':
+            notebook.add(diagnostics_frame)  # re-adding a hidden tab shows it again
+            notebook.select(diagnostics_frame)
+            diagnostics_panel.refresh()
+        else:
+            notebook.hide(diagnostics_frame)
+    notebook.winfo_toplevel().bind(DIAGNOSTICS_SHORTCUT, toggle)
+
+
 # Function to create a scrollable frame
 def create_scrollable_frame(parent):
     canvas = tk.Canvas(parent)
@@ -638,66 +1003,44 @@ def create_scrollable_frame(parent):
 #############OUTBOUND_FUNCTION##################
 ##########new function OUTBOUND onchange ################
 # Function to fetch min and max dates from the database////Minimum /maximum dates OUTBOUND dates
+@traced("db.min_max_dates.outbound")
 def fetch_min_max_dates_outbound():
     global min_date_sql_outbound, max_date_sql_outbound
-    connection = pymysql.connect(
-        host='10.216.252.8',
-        user=Shared.userid,
-        passwd=Shared.password,
-        db='client_data',
-        port=3306,
-        ssl_ca=sslca,
-        ssl_key=sslkey,
-        ssl_cert=sslcert
-    )
-
     try:
-        cursor = connection.cursor()
-        select_query = """SELECT MIN(DATE), MAX(DATE) FROM temporary_data.ALPARGATAS_2024_OUTBOUND_STANDARD_TESTING"""
-        cursor.execute(select_query)
-        min_date_sql_outbound, max_date_sql_outbound = cursor.fetchone()
+        with pooled_connection() as connection, span("db.date_bounds", table=OUTBOUND_TABLE) as bounds_span:
+            cursor = connection.cursor()
+            select_query = f"""SELECT MIN(DATE), MAX(DATE) FROM {OUTBOUND_TABLE}"""
+            cursor.execute(select_query)
+            min_date_sql_outbound, max_date_sql_outbound = cursor.fetchone()
+            cursor.close()
+            bounds_span.update(min_date=str(min_date_sql_outbound), max_date=str(max_date_sql_outbound))
 
         # Validate data
         if min_date_sql_outbound and max_date_sql_outbound:
             min_date_sql_outbound = pd.Timestamp(min_date_sql_outbound)
             max_date_sql_outbound = pd.Timestamp(max_date_sql_outbound)
-            print(f"Data fetched successfully! Min date: {min_date_sql_outbound}, Max date: {max_date_sql_outbound}")
         else:
             print("No valid date data fetched!")
     except Exception as e:
         print(f"Error fetching data: {str(e)}")
-    finally:
-        connection.close()
 #############################
 ##############new function inbound onchange ################
 def on_date_change_outbound(event=None):
+    if refreshing["outbound"]:
+        return  # re-run once the refresh is applied
     start_date_outbound = order_start_date_entry_outbound.get_date()
     end_date_outbound = order_end_date_entry_outbound.get_date()  # Corrected to fetch from order_end_date_entry
 
     # Ensure both dates are valid
     if start_date_outbound and end_date_outbound:
+        # Days outside the loaded window are fetched first; the metrics follow once they are in
+        if USE_WINDOWED_LOAD and not startup_pending["outbound"] and not outbound_window.covers(start_date_outbound, end_date_outbound):
+            extend_outbound_window(start_date_outbound, end_date_outbound)
+            return
         # update_metrics_on_filter_change(inbound_data, start_date, end_date, dc_filter_inbound.get())
         update_outbound_metrics_on_filter_change(outbound_data, start_date_outbound, end_date_outbound, dc_filter.get(), bu_filter.get(), channel_filter.get())
 
 ########################export
-def convert_abbreviated_value(value):
-    """Convert a value like '4.5 K' or '1.56 M' into a full numeric value."""
-    if isinstance(value, str):
-        if 'K' in value:
-            return float(value.replace('K', '').strip()) * 1_000
-        elif 'M' in value:
-            return float(value.replace('M', '').strip()) * 1_000_000
-    return value
-
-def convert_abbreviated_value_outbound(value):
-    """Convert a value like '4.5 K' or '1.56 M' into a full numeric value."""
-    if isinstance(value, str):
-        if 'K' in value:
-            return float(value.replace('K', '').strip()) * 1_000
-        elif 'M' in value:
-            return float(value.replace('M', '').strip()) * 1_000_000
-    return value
-
 # def export_inbound_outbound_data(inbound_metrics, inbound_order_profile_metrics, outbound_metrics, outbound_order_profile_metrics, inbound_dc_name,outbound_dc_name, bu_name, channel_name):
 #     try:
 #         # Export Inbound Data
@@ -743,6 +1086,9 @@ def convert_abbreviated_value_outbound(value):
 #
 import time
 
+# The metrics dicts hold raw numbers (InboundMetrics/OutboundMetrics.volumes() and .order_profile()),
+# so the exported values are exact
+@traced("export.csv")
 def export_inbound_outbound_data(inbound_metrics, inbound_order_profile_metrics, outbound_metrics, outbound_order_profile_metrics, inbound_dc_name, outbound_dc_name, bu_name, channel_name):
     try:
         # Get current timestamp
@@ -752,14 +1098,14 @@ def export_inbound_outbound_data(inbound_metrics, inbound_order_profile_metrics,
         inbound_data_to_export = {
             "DC_NAME": [inbound_dc_name],
             "Days of Data": [inbound_metrics["Days of Data"]],
-            "Total IB Loads": [convert_abbreviated_value(inbound_metrics["Total IB Loads"])],
-            "Total Orders": [convert_abbreviated_value(inbound_metrics["Total Orders"])],
-            "Total Lines": [convert_abbreviated_value(inbound_metrics["Total Lines"])],
-            "Total Units": [convert_abbreviated_value(inbound_metrics["Total Units"])],
-            "SKUs with Movement": [convert_abbreviated_value(inbound_metrics["SKUs with Movement"])],
+            "Total IB Loads": [inbound_metrics["Total IB Loads"]],
+            "Total Orders": [inbound_metrics["Total Orders"]],
+            "Total Lines": [inbound_metrics["Total Lines"]],
+            "Total Units": [inbound_metrics["Total Units"]],
+            "SKUs with Movement": [inbound_metrics["SKUs with Movement"]],
             "IB Units Per Line": [inbound_order_profile_metrics["IB Units Per Line"]],
             "IB Lines Per PO": [inbound_order_profile_metrics["IB Lines Per PO"]],
-            "IB Units Per PO": [convert_abbreviated_value(inbound_order_profile_metrics["IB Units Per PO"])]
+            "IB Units Per PO": [inbound_order_profile_metrics["IB Units Per PO"]]
         }
 
         df_inbound = pd.DataFrame(inbound_data_to_export)
@@ -772,13 +1118,13 @@ def export_inbound_outbound_data(inbound_metrics, inbound_order_profile_metrics,
             "BUSINESSUNIT": [bu_name],
             "ORDERTYPE": [channel_name],
             "Days of Data": [outbound_metrics["Days of Data"]],
-            "Total Orders": [convert_abbreviated_value_outbound(outbound_metrics["Total Orders"])],
-            "Total Lines": [convert_abbreviated_value_outbound(outbound_metrics["Total Lines"])],
-            "Total Units": [convert_abbreviated_value_outbound(outbound_metrics["Total Units"])],
-            "SKUs with Movement": [convert_abbreviated_value_outbound(outbound_metrics["SKUs with Movement"])],
+            "Total Orders": [outbound_metrics["Total Orders"]],
+            "Total Lines": [outbound_metrics["Total Lines"]],
+            "Total Units": [outbound_metrics["Total Units"]],
+            "SKUs with Movement": [outbound_metrics["SKUs with Movement"]],
             "OB Units Per Line": [outbound_order_profile_metrics["OB Units Per Line"]],
             "OB Lines Per PO": [outbound_order_profile_metrics["OB Lines Per PO"]],
-            "OB Units Per PO": [convert_abbreviated_value_outbound(outbound_order_profile_metrics["OB Units Per PO"])]
+            "OB Units Per PO": [outbound_order_profile_metrics["OB Units Per PO"]]
         }
 
         df_outbound = pd.DataFrame(outbound_data_to_export)
@@ -815,23 +1161,50 @@ def export_inbound_outbound_data(inbound_metrics, inbound_order_profile_metrics,
 #         messagebox.showerror("Error", "Failed to compute necessary metrics for export.")
 
 ########################
+@traced("export.handle")
 def handle_export(inbound_data, outbound_data, start_date, end_date, start_date_outbound, end_date_outbound, inbound_dc_name, bu_name, channel_name, outbound_dc_name):
-    # Step 1: Calculate inbound metrics and order profile
-    inbound_metrics = inbound_volumes(inbound_data, start_date, end_date, inbound_dc_name)
-    inbound_order_profile_metrics = inbound_order_profile(inbound_data, start_date, end_date, inbound_dc_name)
+    if startup_pending["inbound"] or startup_pending["outbound"]:
+        messagebox.showinfo("Export", "Data is still loading, please try again in a moment.")
+        return
+    if USE_WINDOWED_LOAD and not (inbound_window.covers(start_date, end_date) and outbound_window.covers(start_date_outbound, end_date_outbound)):
+        messagebox.showinfo("Export", "Data for the selected dates is still loading, please try again in a moment.")
+        return
+    # Step 1: Calculate inbound metrics and order profile in one pass (exact counts, even in approximate mode)
+    try:
+        inbound_result = compute_inbound_metrics(inbound_data, start_date, end_date, inbound_dc_name, approximate=False)
+    except (pymysql.Error, KeyError) as e:
+        show_metrics_error("inbound", e)
+        inbound_result = None
 
-    # Step 2: Calculate outbound metrics and order profile
-    outbound_metrics = outbound_volumes(outbound_data, start_date_outbound, end_date_outbound, outbound_dc_name, bu_name, channel_name)
-    outbound_order_profile_metrics = outbound_order_profile(outbound_data, start_date_outbound, end_date_outbound, outbound_dc_name, bu_name, channel_name)
+    # Step 2: Calculate outbound metrics and order profile in one pass (exact counts, even in approximate mode)
+    try:
+        outbound_result = compute_outbound_metrics(outbound_data, start_date_outbound, end_date_outbound, outbound_dc_name, bu_name, channel_name, approximate=False)
+    except (pymysql.Error, KeyError) as e:
+        show_metrics_error("outbound", e)
+        outbound_result = None
 
     # Step 3: Ensure metrics are not None
-    if inbound_metrics and inbound_order_profile_metrics and outbound_metrics and outbound_order_profile_metrics:
-        # Step 4: Call the export function with the computed metrics
+    if inbound_result and outbound_result:
+        # Step 4: Append the run to the export history store
+        records = [
+            export_record("inbound", inbound_result, start_date, end_date, inbound_dc_name),
+            export_record("outbound", outbound_result, start_date_outbound, end_date_outbound, outbound_dc_name, bu_name, channel_name),
+        ]
+        try:
+            with span("export.history"):
+                run_id = append_run(records, EXPORT_HISTORY_PATH)
+        except sqlite3.Error as e:
+            messagebox.showerror("Error", f"Failed to save export history: {str(e)}")
+            return
+        if not WRITE_EXPORT_CSV:
+            messagebox.showinfo("Success", f"Export run {run_id} saved to {EXPORT_HISTORY_PATH}")
+            return
+        # Step 5: Optionally also write the per-click CSV files
         export_inbound_outbound_data(
-            inbound_metrics,
-            inbound_order_profile_metrics,
-            outbound_metrics,
-            outbound_order_profile_metrics,
+            inbound_result.volumes(),
+            inbound_result.order_profile(),
+            outbound_result.volumes(),
+            outbound_result.order_profile(),
             inbound_dc_name,  # Inbound DC Name
             outbound_dc_name,  # Outbound DC Name
             bu_name,
@@ -849,6 +1222,7 @@ def create_notebook_page_inbound_outbound():
     global selected_start_date, selected_end_date, selected_start_date_outbound, selected_end_date_outbound
     global inbound_data, outbound_data, order_start_date_entry, order_end_date_entry, min_date_sql_inbound, max_date_sql_inbound, min_date_sql_outbound, max_date_sql_outbound, order_start_date_entry_outbound, order_end_date_entry_outbound
     global export_button_frame_inbound,export_button_frame_outbound
+    global load_status_label, date_range_label_inbound, recompute_scheduler
     # global inbound_metrics, inbound_order_profile_metrics, outbound_metrics, outbound_order_profile_metrics, dc_name,bu_name, channel_name
 
     # Initialize root window
@@ -863,6 +1237,7 @@ def create_notebook_page_inbound_outbound():
     # Create Inbound and Outbound Summary Tab
     summary_frame = ttk.Frame(notebook, width=800, height=1000)
     notebook.add(summary_frame, text="Inbound and Outbound Summary")
+    create_diagnostics_tab(notebook)
     # export button
     # Create a style for the button
     style = ttk.Style()
@@ -884,26 +1259,22 @@ def create_notebook_page_inbound_outbound():
                                )
                                )
     export_button.pack(side='bottom', pady=20)
+    # Fetch and apply rows added since the data was loaded
+    refresh_button = ttk.Button(summary_frame, text="Refresh Data", style='Export.TButton', command=refresh_all)
+    refresh_button.pack(side='bottom')
+    # Status line showing load progress
+    load_status_label = ttk.Label(summary_frame, text="", font=('Arial', 9))
+    load_status_label.pack(side='bottom')
+
+    # One worker per pooled connection, so the independent startup queries all run at once
+    loader = BackgroundLoader(root, max_workers=DEFAULT_POOL_SIZE)
+    root.protocol("WM_DELETE_WINDOW", lambda: (loader.shutdown(), pool.close_all(), root.destroy()))
+    # Filter changes are debounced and computed on the same worker pool
+    recompute_scheduler = RecomputeScheduler(root, loader, FILTER_DEBOUNCE_MS)
 
     #####################################################################
-    # Load data from the inbound database
-    df_inbound = connect_to_database_inbound()  # Make sure this function is defined
-    if df_inbound is not None:
-        inbound_data = df_inbound.copy()
-        min_date_inbound = inbound_data['DATE'].min()
-        max_date_inbound = inbound_data['DATE'].max()
-        print(f"Inbound - Min Date: {min_date_inbound}, Max Date: {max_date_inbound}")
-    # Fetch min and max order dates
-    fetch_min_max_dates_inbound()  # Fetch inbound min dates and max dates from the database
-    # Initialize start and end dates for inbound data
-    # Ensure min_date_sql_inbound and max_date_sql_inbound are available
-    if min_date_sql_inbound and max_date_sql_inbound:
-        selected_start_date = min_date_sql_inbound
-        selected_end_date = max_date_sql_inbound
-    else:
-        # Handle fallback in case no data is fetched
-        selected_start_date = pd.Timestamp('2000-01-01')
-        selected_end_date = pd.Timestamp('2100-01-01')
+    # The window is built straight away with placeholder cards; data, date bounds and
+    # filter values are fetched on worker threads by start_background_loading()
 
     # Create scrollable frame for inbound data
     scrollable_frame_inbound = create_scrollable_frame(summary_frame)  # Assuming you have a function to create this
@@ -915,20 +1286,14 @@ def create_notebook_page_inbound_outbound():
     create_dc_filter(filter_frame_inbound)  # Assuming this function is defined
     ################
     ####dates min and max dates inbound
-    # Create date entries for selecting date range
-    order_start_date_entry = DateEntry(filter_frame_inbound, selectmode='day', year=min_date_sql_inbound.year, month=min_date_sql_inbound.month,
-                                                day=min_date_sql_inbound.day, mindate=selected_start_date,
-                                       maxdate=selected_end_date)
-    order_start_date_entry.set_date(min_date_sql_inbound)
+    # Create date entries for selecting date range (enabled once the date bounds are fetched)
+    order_start_date_entry = DateEntry(filter_frame_inbound, selectmode='day', state='disabled')
     order_start_date_entry_label = tk.Label(filter_frame_inbound,
                                                      text=f"From Date:")
     order_start_date_entry_label.pack(side='left', padx=10)
     order_start_date_entry.pack(side='left', padx=10)
     order_start_date_entry.bind("<<DateEntrySelected>>", on_date_change_inbound)
-    order_end_date_entry = DateEntry(filter_frame_inbound, selectmode='day',year=max_date_sql_inbound.year, month=max_date_sql_inbound.month,
-                                                day=max_date_sql_inbound.day, mindate=selected_start_date,
-                                     maxdate=selected_end_date)
-    order_end_date_entry.set_date(max_date_sql_inbound)
+    order_end_date_entry = DateEntry(filter_frame_inbound, selectmode='day', state='disabled')
     order_end_date_entry_label = tk.Label(filter_frame_inbound,
                                       text=f"To Date:")
     order_end_date_entry_label.pack(side='left', padx=10)
@@ -937,29 +1302,11 @@ def create_notebook_page_inbound_outbound():
     date_range_label_frame_inbound = tk.Frame(filter_frame_inbound)
     date_range_label_frame_inbound.pack(side='left', padx=10)
     # Add a label to display the available date range
-    date_range_label_inbound = tk.Label(date_range_label_frame_inbound,
-                                        text=f"Dates available from {min_date_sql_inbound.date()} to {max_date_sql_inbound.date()}")
+    date_range_label_inbound = tk.Label(date_range_label_frame_inbound, text="Loading available dates...")
     date_range_label_inbound.pack(side='left', padx=10)
-    # Update inbound metrics
-    update_metrics_on_filter_change(inbound_data, selected_start_date, selected_end_date, "All")
-
-    # Load data from the outbound database
-    df_outbound = connect_to_database_outbound()  # Make sure this function is defined
-    if df_outbound is not None:
-        outbound_data = df_outbound.copy()
-        min_date_outbound = outbound_data['DATE'].min()
-        max_date_outbound = outbound_data['DATE'].max()
-        print(f"Outbound - Min Date: {min_date_outbound}, Max Date: {max_date_outbound}")
-    # fetch minimum outbound and maximum outbound dates
-    fetch_min_max_dates_outbound()  # Fetch outbound min dates and max dates from the database
-    # Ensure min_date_sql_outbound and max_date_sql_outbound are available
-    if min_date_sql_outbound and max_date_sql_outbound:
-        selected_start_date_outbound = min_date_sql_outbound
-        selected_end_date_outbound = max_date_sql_outbound
-    else:
-        # Handle fallback in case no data is fetched
-        selected_start_date_outbound = pd.Timestamp('2000-01-01')
-        selected_end_date_outbound = pd.Timestamp('2100-01-01')
+    # Placeholder inbound cards until the data has loaded
+    display_inbound_summary(*placeholder_cards(InboundMetrics(0, 0, 0, 0, 0, 0)), None, None, None, "All")
+
     # Create scrollable frame for outbound data
     # scrollable_frame_outbound = create_scrollable_frame(summary_frame)
     filter_frame_outbound = ttk.Frame(scrollable_frame_inbound)
@@ -971,36 +1318,34 @@ def create_notebook_page_inbound_outbound():
     create_bu_filter(filter_frame_outbound)  # Assuming this function is defined
     create_channel_filter(filter_frame_outbound)  # Assuming this function is defined
 
-    ####dates min and max dates inbound
-    # Create date entries for selecting date range
-    order_start_date_entry_outbound = DateEntry(filter_frame_outbound, selectmode='day',
-                                                year=min_date_sql_outbound.year, month=min_date_sql_outbound.month,
-                                                day=min_date_sql_outbound.day, mindate=selected_start_date_outbound,
-                                                maxdate=selected_end_date_outbound)
-    order_start_date_entry_outbound.set_date(min_date_sql_outbound)
+    ####dates min and max dates outbound
+    # Create date entries for selecting date range (enabled once the date bounds are fetched)
+    order_start_date_entry_outbound = DateEntry(filter_frame_outbound, selectmode='day', state='disabled')
     order_start_date_entry_outbound_label = tk.Label(filter_frame_outbound,
                                                    text=f"From Date:")
     order_start_date_entry_outbound_label.pack(side='left', padx=10)
     order_start_date_entry_outbound.pack(side='left', padx=10)
     order_start_date_entry_outbound.bind("<<DateEntrySelected>>", on_date_change_outbound)
-    order_end_date_entry_outbound = DateEntry(filter_frame_outbound, selectmode='day', year=max_date_sql_outbound.year,
-                                              month=max_date_sql_outbound.month, day=max_date_sql_outbound.day,
-                                              mindate=selected_start_date_outbound, maxdate=selected_end_date_outbound)
-    order_end_date_entry_outbound.set_date(max_date_sql_outbound)
+    order_end_date_entry_outbound = DateEntry(filter_frame_outbound, selectmode='day', state='disabled')
     order_end_date_entry_outbound_label = tk.Label(filter_frame_outbound,
                                          text=f"To Date:")
     order_end_date_entry_outbound_label.pack(side='left', padx=10)
     order_end_date_entry_outbound.pack(side='left', padx=10)
     order_end_date_entry_outbound.bind("<<DateEntrySelected>>", on_date_change_outbound)
-    # date_range_label_frame_outbound = tk.Frame(filter_frame_outbound)
-    # date_range_label_frame_outbound.pack(side='left', padx=10)
-    # # Add a label to display the available date range
-    # date_range_label_outbound = tk.Label(date_range_label_frame_outbound,
-    #                                      text=f"Dates available from {min_date_sql_outbound.date()} to {max_date_sql_outbound.date()}")
-    # date_range_label_outbound.pack(side='left', padx=10)
-    # Update outbound metrics
-    update_outbound_metrics_on_filter_change(outbound_data, selected_start_date_outbound, selected_end_date_outbound,
-                                             "All", "All", "All")
+    # Placeholder outbound cards until the data has loaded
+    display_outbound_summary(*placeholder_cards(OutboundMetrics(0, 0, 0, 0, 0)), None, None, None, "All", "All", "All")
+
+    # Daily/weekly/monthly breakdown of the selected direction, below both card sections
+    chart_frame_inbound = ttk.Frame(scrollable_frame_inbound)
+    chart_frame_inbound.pack(fill='x', pady=10)
+    create_breakdown_chart(chart_frame_inbound)
+
+    # Tabs of the other registered datasets (loaded when first opened)
+    create_dataset_tabs(notebook, loader)
+
+    # Fetch data, date bounds and filter values in the background
+    start_background_loading(loader)
+    schedule_live_refresh()
 
     root.mainloop()
 
@@ -0,0 +1,90 @@
+import pandas as pd
+
+from db_access import pooled_connection, INBOUND_TABLE, OUTBOUND_TABLE
+from instrumentation import span
+
+# Aggregate expressions pushed down to MySQL for each direction.
+# Every query returns exactly one row, whatever the size of the table.
+INBOUND_KPI_EXPRESSIONS = [
+    ("min_date", "MIN(DATE)"),
+    ("max_date", "MAX(DATE)"),
+    ("total_loads", "COUNT(DISTINCT LOAD_NUMBER)"),
+    ("total_orders", "COUNT(DISTINCT PO_NUMBER)"),
+    ("total_lines", "COUNT(*)"),
+    ("total_units", "COALESCE(SUM(Qty), 0)"),
+    ("total_skus", "COUNT(DISTINCT SKU)"),
+]
+
+OUTBOUND_KPI_EXPRESSIONS = [
+    ("min_date", "MIN(DATE)"),
+    ("max_date", "MAX(DATE)"),
+    ("total_orders", "COUNT(DISTINCT ORDER_NUMBER)"),
+    ("total_lines", "COUNT(*)"),
+    ("total_units", "COALESCE(SUM(Qty), 0)"),
+    ("total_skus", "COUNT(DISTINCT SKU)"),
+]
+
+
+# Build the WHERE clause and its parameters for the selected filters.
+# "All" (or an empty value) means the filter is not applied, same as in the pandas path.
+def build_filter_clause(start_date=None, end_date=None, dc_name=None, bu_name=None, channel_name=None):
+    conditions = []
+    params = []
+    if start_date and end_date:
+        conditions.append("DATE >= %s AND DATE <= %s")
+        params.extend([pd.Timestamp(start_date).to_pydatetime(), pd.Timestamp(end_date).to_pydatetime()])
+    if dc_name and dc_name != "All":
+        conditions.append("DC_NAME = %s")
+        params.append(dc_name)
+    if bu_name and bu_name != "All":
+        conditions.append("BUSINESSUNIT = %s")
+        params.append(bu_name)
+    if channel_name and channel_name != "All":
+        conditions.append("ORDERTYPE = %s")
+        params.append(channel_name)
+
+    where_clause = " WHERE " + " AND ".join(conditions) if conditions else ""
+    return where_clause, params
+
+
+# Build the parameterized single-row KPI query for one table
+def build_kpi_query(table, expressions, start_date=None, end_date=None, dc_name=None, bu_name=None, channel_name=None):
+    select_list = ", ".join(f"{expression} AS {alias}" for alias, expression in expressions)
+    where_clause, params = build_filter_clause(start_date, end_date, dc_name, bu_name, channel_name)
+    query = f"SELECT {select_list} FROM {table}{where_clause}"
+    return query, params
+
+
+# Run a KPI query and return its single row as a dict of raw numbers
+def run_kpi_query(query, params, expressions, connection=None):
+    if connection is None:
+        with pooled_connection() as connection:
+            return run_kpi_query(query, params, expressions, connection)
+
+    with span("db.kpi_query"):
+        cursor = connection.cursor()
+        cursor.execute(query, params)
+        row = cursor.fetchone()
+        cursor.close()
+
+    kpis = {alias: value for (alias, _), value in zip(expressions, row)}
+    # Days of data is derived from MIN/MAX(DATE); an empty slice has none
+    if kpis["min_date"] is not None and kpis["max_date"] is not None:
+        kpis["days_of_data"] = (pd.Timestamp(kpis["max_date"]) - pd.Timestamp(kpis["min_date"])).days
+    else:
+        kpis["days_of_data"] = 0
+    # SUM() of a DECIMAL column comes back as Decimal
+    kpis["total_units"] = float(kpis["total_units"] or 0)
+    return kpis
+
+
+# Inbound KPIs for the selected date range and DC, computed by the server
+def fetch_inbound_kpis(start_date=None, end_date=None, dc_name=None, connection=None):
+    query, params = build_kpi_query(INBOUND_TABLE, INBOUND_KPI_EXPRESSIONS, start_date, end_date, dc_name)
+    return run_kpi_query(query, params, INBOUND_KPI_EXPRESSIONS, connection)
+
+
+# Outbound KPIs for the selected date range, DC, business unit and channel, computed by the server
+def fetch_outbound_kpis(start_date=None, end_date=None, dc_name=None, bu_name=None, channel_name=None, connection=None):
+    query, params = build_kpi_query(OUTBOUND_TABLE, OUTBOUND_KPI_EXPRESSIONS, start_date, end_date, dc_name, bu_name, channel_name)
+    return run_kpi_query(query, params, OUTBOUND_KPI_EXPRESSIONS, connection)
@@ -0,0 +1,43 @@
+# Default quiet period after the last filter event before recomputing
+DEFAULT_DEBOUNCE_MS = 250
+
+
+# Coalesces rapid filter events and runs the latest computation off the Tk thread.
+# Each request(key, ...) restarts the debounce timer for that key; when it fires, the
+# computation runs on the loader's worker pool. Every request gets a generation number and
+# only the result of the newest generation is painted; superseded ones are dropped, whether
+# they were still waiting for the timer or already running.
+class RecomputeScheduler:
+    def __init__(self, root, loader, debounce_ms=DEFAULT_DEBOUNCE_MS):
+        self.root = root
+        self.loader = loader
+        self.debounce_ms = debounce_ms
+        self.timers = {}
+        self.generations = {}
+
+    # Schedule compute() (worker thread) followed by paint(result) or on_error(exception) (Tk thread)
+    def request(self, key, compute, paint, on_error=None):
+        generation = self.generations.get(key, 0) + 1
+        self.generations[key] = generation
+        if key in self.timers:
+            self.root.after_cancel(self.timers.pop(key))
+        self.timers[key] = self.root.after(self.debounce_ms, self.launch, key, generation, compute, paint, on_error)
+
+    def launch(self, key, generation, compute, paint, on_error):
+        self.timers.pop(key, None)
+        if not self.is_current(key, generation):
+            return
+        self.loader.submit(
+            compute,
+            on_done=lambda result: self.is_current(key, generation) and paint(result),
+            on_error=lambda error: self.is_current(key, generation) and on_error and on_error(error),
+        )
+
+    def is_current(self, key, generation):
+        return self.generations.get(key) == generation
+
+    # Drop any pending or running request for key (e.g. when its data is being reloaded)
+    def cancel(self, key):
+        self.generations[key] = self.generations.get(key, 0) + 1
+        if key in self.timers:
+            self.root.after_cancel(self.timers.pop(key))
@@ -0,0 +1,107 @@
+import json
+import os
+import time
+
+import pandas as pd
+
+from db_access import INBOUND_TABLE, OUTBOUND_TABLE, DEFAULT_DATASET
+from data_schema import apply_schema, frame_size
+from instrumentation import traced
+from data_loader import stream_table, concat_typed_chunks, INBOUND_COLUMNS, OUTBOUND_COLUMNS, DEFAULT_CHUNK_SIZE
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # snapshot cache is disabled without pyarrow
+    feather = None
+
+# Directory holding one Feather snapshot (+ JSON metadata) per table
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snapshot_cache')
+
+# Days before the high-water mark that are always re-fetched, to pick up late-arriving lines
+DEFAULT_LOOKBACK_DAYS = 7
+
+
+# File paths of the snapshot and its metadata for a table
+def snapshot_paths(table, cache_dir=CACHE_DIR):
+    base = os.path.join(cache_dir, table.replace('.', '__'))
+    return base + '.feather', base + '.json'
+
+
+# True when a snapshot of the table is on disk (it may still turn out unreadable)
+def snapshot_exists(table, cache_dir=CACHE_DIR):
+    return feather is not None and all(os.path.exists(path) for path in snapshot_paths(table, cache_dir))
+
+
+# Read the cached frame and its metadata, or (None, None) when there is no usable snapshot
+@traced("snapshot.read", measure=lambda result: frame_size(result[0]))
+def read_snapshot(table, cache_dir=CACHE_DIR):
+    data_path, meta_path = snapshot_paths(table, cache_dir)
+    if feather is None or not (os.path.exists(data_path) and os.path.exists(meta_path)):
+        return None, None
+    try:
+        with open(meta_path) as f:
+            metadata = json.load(f)
+        # Uncompressed Feather is read through a memory map instead of being parsed
+        frame = feather.read_table(data_path, memory_map=True).to_pandas()
+        # Snapshots written before a schema change are brought up to the current column types
+        apply_schema(frame)
+        return frame, metadata
+    except Exception as e:
+        print(f"Ignoring unreadable snapshot for {table}: {str(e)}")
+        return None, None
+
+
+# Write the frame and its high-water-mark DATE; files are replaced atomically
+@traced("snapshot.write")
+def write_snapshot(table, frame, cache_dir=CACHE_DIR):
+    if feather is None:
+        return
+    os.makedirs(cache_dir, exist_ok=True)
+    data_path, meta_path = snapshot_paths(table, cache_dir)
+    high_water_mark = frame['DATE'].max() if len(frame) else None
+    metadata = {
+        "table": table,
+        "high_water_mark": None if pd.isna(high_water_mark) else pd.Timestamp(high_water_mark).isoformat(),
+        "row_count": len(frame),
+        "saved_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+    feather.write_feather(frame.reset_index(drop=True), data_path + '.tmp', compression='uncompressed')
+    os.replace(data_path + '.tmp', data_path)
+    with open(meta_path + '.tmp', 'w') as f:
+        json.dump(metadata, f)
+    os.replace(meta_path + '.tmp', meta_path)
+
+
+# Load a table from its snapshot, fetching only rows from (high-water mark - look-back) onwards.
+# Rows inside the look-back window are replaced by the fresh copy from the server.
+# cache_name names the snapshot files when table is not a plain table name (a mapped source).
+def load_table_cached(table, columns, lookback_days=DEFAULT_LOOKBACK_DAYS, chunk_size=DEFAULT_CHUNK_SIZE,
+                      progress_callback=None, cache_dir=CACHE_DIR, cache_name=None):
+    cache_name = cache_name or table
+    cached, metadata = read_snapshot(cache_name, cache_dir)
+    if cached is None or not metadata.get("high_water_mark"):
+        frame = stream_table(table, columns, chunk_size, progress_callback)
+        write_snapshot(cache_name, frame, cache_dir)
+        return frame
+
+    refresh_from = pd.Timestamp(metadata["high_water_mark"]) - pd.Timedelta(days=lookback_days)
+    delta = stream_table(table, columns, chunk_size, progress_callback,
+                         where_clause=" WHERE DATE >= %s", params=[refresh_from.to_pydatetime()])
+    kept = cached[cached['DATE'] < refresh_from]
+    frame = concat_typed_chunks([kept, delta], columns)
+    print(f"{cache_name}: {len(kept):,} rows from snapshot, {len(delta):,} rows refreshed")
+
+    write_snapshot(cache_name, frame, cache_dir)
+    return frame
+
+
+# Cached loaders for the two summary tables
+def load_inbound_cached(lookback_days=DEFAULT_LOOKBACK_DAYS, progress_callback=None):
+    return load_table_cached(INBOUND_TABLE, INBOUND_COLUMNS, lookback_days, progress_callback=progress_callback,
+                             cache_name=DEFAULT_DATASET.inbound.cache_name)
+
+
+def load_outbound_cached(lookback_days=DEFAULT_LOOKBACK_DAYS, progress_callback=None):
+    return load_table_cached(OUTBOUND_TABLE, OUTBOUND_COLUMNS, lookback_days, progress_callback=progress_callback,
+                             cache_name=DEFAULT_DATASET.outbound.cache_name)
@@ -0,0 +1,99 @@
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from typed_frames import INBOUND_COLUMNS, OUTBOUND_COLUMNS
+
+# Synthetic inbound/outbound tables with the production column schemas, for benchmarking
+# without access to the MySQL host. Cardinalities scale with the row count the way the
+# client tables do: a year of dates, a handful of DCs, ~40 lines per load, ~8 lines per PO,
+# ~3 lines per outbound order and a Zipf-skewed SKU catalogue.
+
+DEFAULT_SEED = 2024
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_data')
+
+DAYS = 365
+FIRST_DATE = pd.Timestamp('2024-01-01')
+DC_NAMES = ["DC01", "DC02", "DC03", "DC04", "DC05", "DC06"]
+BUSINESS_UNITS = ["FOOTWEAR", "APPAREL", "ACCESSORIES", "OUTLET"]
+ORDER_TYPES = ["B2B", "B2C", "ECOM"]
+SKU_CATALOGUE = 40_000
+
+
+# Zipf-like draw of n codes in [0, cardinality): a few codes are very frequent, most are rare
+def skewed_codes(rng, n, cardinality, exponent=1.2):
+    ranks = rng.zipf(exponent, n) - 1
+    return (ranks % cardinality).astype('int64')
+
+
+# ID strings such as "PO00001234" for a code array, built from one formatted label per code
+def id_labels(prefix, codes, cardinality):
+    labels = np.array([f"{prefix}{i:08d}" for i in range(cardinality)], dtype=object)
+    return labels[codes]
+
+
+# Row DATE values: calendar days spread uniformly over the year
+def random_dates(rng, n):
+    return FIRST_DATE + pd.to_timedelta(rng.integers(0, DAYS, n), unit='D')
+
+
+def generate_inbound(rows, seed=DEFAULT_SEED):
+    rng = np.random.default_rng(seed)
+    loads = max(rows // 40, 1)
+    pos = max(rows // 8, 1)
+    # Lines of a PO share its load; POs are spread over the loads
+    po_codes = rng.integers(0, pos, rows)
+    load_of_po = rng.integers(0, loads, pos)
+    frame = pd.DataFrame({
+        "DATE": random_dates(rng, rows),
+        "LOAD_NUMBER": id_labels("LD", load_of_po[po_codes], loads),
+        "PO_NUMBER": id_labels("PO", po_codes, pos),
+        "SKU": id_labels("SKU", skewed_codes(rng, rows, SKU_CATALOGUE), SKU_CATALOGUE),
+        "Qty": rng.geometric(0.02, rows).astype('int64'),
+        "DC_NAME": rng.choice(DC_NAMES, rows, p=[0.3, 0.25, 0.15, 0.15, 0.1, 0.05]),
+    })
+    return frame[INBOUND_COLUMNS]
+
+
+def generate_outbound(rows, seed=DEFAULT_SEED):
+    rng = np.random.default_rng(seed + 1)
+    orders = max(rows // 3, 1)
+    frame = pd.DataFrame({
+        "DATE": random_dates(rng, rows),
+        "ORDER_NUMBER": id_labels("SO", rng.integers(0, orders, rows), orders),
+        "SKU": id_labels("SKU", skewed_codes(rng, rows, SKU_CATALOGUE), SKU_CATALOGUE),
+        "Qty": rng.geometric(0.3, rows).astype('int64'),
+        "DC_NAME": rng.choice(DC_NAMES, rows, p=[0.3, 0.25, 0.15, 0.15, 0.1, 0.05]),
+        "BUSINESSUNIT": rng.choice(BUSINESS_UNITS, rows, p=[0.5, 0.3, 0.15, 0.05]),
+        "ORDERTYPE": rng.choice(ORDER_TYPES, rows, p=[0.2, 0.5, 0.3]),
+    })
+    return frame[OUTBOUND_COLUMNS]
+
+
+# Local SQLite stand-in for the two MySQL tables; DATE is stored as 'YYYY-MM-DD' text
+def database_path(rows, seed=DEFAULT_SEED, data_dir=DEFAULT_DATA_DIR):
+    return os.path.join(data_dir, f'synthetic_{rows}_{seed}.sqlite')
+
+
+# Path of a SQLite database with inbound and outbound tables of the given size, generated on first use
+def ensure_database(rows, seed=DEFAULT_SEED, data_dir=DEFAULT_DATA_DIR):
+    path = database_path(rows, seed, data_dir)
+    if os.path.exists(path):
+        return path
+    os.makedirs(data_dir, exist_ok=True)
+    if os.path.exists(path + '.tmp'):  # left over from an interrupted run
+        os.remove(path + '.tmp')
+    print(f"Generating {rows:,} synthetic rows per table into {path}")
+    connection = sqlite3.connect(path + '.tmp')
+    try:
+        for table, generate in (("inbound", generate_inbound), ("outbound", generate_outbound)):
+            frame = generate(rows, seed)
+            frame.assign(DATE=frame['DATE'].dt.strftime('%Y-%m-%d')).to_sql(
+                table, connection, index=False, chunksize=100_000)
+        connection.commit()
+    finally:
+        connection.close()
+    os.replace(path + '.tmp', path)
+    return path
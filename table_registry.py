@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+
+from typed_frames import INBOUND_COLUMNS, OUTBOUND_COLUMNS
+
+# Registry of client/year datasets: the inbound and outbound source table of each and, where a
+# client's table uses other column names, the mapping to the standard columns. The first dataset
+# (or the one named by "default") feeds the main summary tab; every other one gets its own tab.
+#
+#   {"default": "ALPARGATAS_2024",
+#    "datasets": [{"client": "ALPARGATAS", "year": 2024,
+#                  "inbound": {"table": "temporary_data.ALPARGATAS_2024_INBOUND_STANDARD_TESTING"},
+#                  "outbound": {"table": "temporary_data.ALPARGATAS_2024_OUTBOUND_STANDARD_TESTING",
+#                               "columns": {"Qty": "QUANTITY"}}}]}
+#
+# The registry file sits next to this module, whatever the working directory.
+DEFAULT_REGISTRY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'table_registry.json')
+
+# Used when there is no registry file
+BUILTIN_REGISTRY = {
+    "datasets": [{
+        "client": "ALPARGATAS",
+        "year": 2024,
+        "inbound": {"table": "temporary_data.ALPARGATAS_2024_INBOUND_STANDARD_TESTING"},
+        "outbound": {"table": "temporary_data.ALPARGATAS_2024_OUTBOUND_STANDARD_TESTING"},
+    }],
+}
+
+DIRECTIONS = ("inbound", "outbound")
+# Standard columns each direction's queries read
+STANDARD_COLUMNS = {"inbound": tuple(INBOUND_COLUMNS), "outbound": tuple(OUTBOUND_COLUMNS)}
+
+
+# One source table and its column mapping (standard column -> column in the table)
+@dataclass(frozen=True)
+class TableSpec:
+    table: str
+    columns: dict = field(default_factory=dict)
+    standard_columns: tuple = ()
+
+    # What goes after FROM in every query: the table itself, or a derived table selecting each
+    # standard column by name, from its mapped column where there is one. Listing the columns
+    # (not *) keeps a table column that already carries a standard name from appearing twice.
+    # MySQL merges the derived table into the outer query, so the DATE/DC_NAME predicates still
+    # use the table's indexes.
+    @property
+    def source(self):
+        if not self.columns:
+            return self.table
+        selected = ", ".join(f"{self.columns[column]} AS {column}" if column in self.columns else column
+                             for column in self.standard_columns)
+        return f"(SELECT {selected} FROM {self.table}) AS mapped"
+
+    # File-system safe name of the source, for snapshot files
+    @property
+    def cache_name(self):
+        if not self.columns:
+            return self.table
+        digest = hashlib.sha1(json.dumps(self.columns, sort_keys=True).encode()).hexdigest()[:8]
+        return f"{self.table}_{digest}"
+
+
+@dataclass(frozen=True)
+class Dataset:
+    client: str
+    year: int
+    inbound: TableSpec
+    outbound: TableSpec
+
+    @property
+    def name(self):
+        return f"{self.client}_{self.year}"
+
+    def table(self, direction):
+        return self.inbound if direction == "inbound" else self.outbound
+
+
+def parse_table_spec(config, where, standard_columns):
+    if not isinstance(config, dict) or not config.get("table"):
+        raise ValueError(f"{where}: a table name is required")
+    columns = dict(config.get("columns") or {})
+    unknown = [column for column in columns if column not in standard_columns]
+    if unknown:
+        raise ValueError(f"{where}: unknown standard columns {unknown}")
+    return TableSpec(config["table"], columns, standard_columns)
+
+
+# Datasets by name, in registry order; the default dataset is first
+def parse_registry(config):
+    datasets = {}
+    for position, entry in enumerate(config.get("datasets") or []):
+        where = f"dataset {position + 1}"
+        if not entry.get("client") or not entry.get("year"):
+            raise ValueError(f"{where}: client and year are required")
+        dataset = Dataset(str(entry["client"]), int(entry["year"]),
+                          *(parse_table_spec(entry.get(direction), f"{where} {direction}", STANDARD_COLUMNS[direction])
+                            for direction in DIRECTIONS))
+        if dataset.name in datasets:
+            raise ValueError(f"{where}: duplicate dataset {dataset.name}")
+        datasets[dataset.name] = dataset
+    if not datasets:
+        raise ValueError("the registry has no datasets")
+
+    default = config.get("default")
+    if default:
+        if default not in datasets:
+            raise ValueError(f"default dataset {default} is not registered")
+        datasets = {default: datasets.pop(default), **datasets}
+    return datasets
+
+
+def load_registry(path=DEFAULT_REGISTRY_PATH):
+    if not os.path.exists(path):
+        return parse_registry(BUILTIN_REGISTRY)
+    with open(path) as f:
+        return parse_registry(json.load(f))
+
+
+def default_dataset(path=DEFAULT_REGISTRY_PATH):
+    return next(iter(load_registry(path).values()))
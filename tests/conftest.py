@@ -0,0 +1,66 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# The modules live flat in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_schema import apply_schema  # noqa: E402
+
+DC_NAMES = ["DC01", "DC02", "DC03", "DC04", "DC05", "DC06"]
+BUSINESS_UNITS = ["FOOTWEAR", "APPAREL", "ACCESSORIES", "OUTLET"]
+ORDER_TYPES = ["B2B", "B2C", "ECOM"]
+
+
+# A year of rows as the server returns them: object columns, DATE as calendar days, a few NULL SKUs
+def raw_rows(columns, rows, seed):
+    rng = np.random.default_rng(seed)
+
+    def ids(prefix, cardinality):
+        labels = np.array([f"{prefix}{i:06d}" for i in range(cardinality)], dtype=object)
+        return labels[rng.integers(0, cardinality, rows)]
+
+    values = {
+        "DATE": pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, rows), unit='D'),
+        "LOAD_NUMBER": ids("LD", max(rows // 40, 1)),
+        "PO_NUMBER": ids("PO", max(rows // 8, 1)),
+        "ORDER_NUMBER": ids("SO", max(rows // 3, 1)),
+        "SKU": np.where(rng.random(rows) < 0.01, None, ids("SKU", 2_000)),
+        "Qty": rng.geometric(0.1, rows).astype('int64'),
+        "DC_NAME": rng.choice(DC_NAMES, rows, p=[0.3, 0.25, 0.15, 0.15, 0.1, 0.05]).astype(object),
+        "BUSINESSUNIT": rng.choice(BUSINESS_UNITS, rows).astype(object),
+        "ORDERTYPE": rng.choice(ORDER_TYPES, rows).astype(object),
+    }
+    return pd.DataFrame({column: values[column] for column in columns})
+
+
+INBOUND = ["DATE", "LOAD_NUMBER", "PO_NUMBER", "SKU", "Qty", "DC_NAME"]
+OUTBOUND = ["DATE", "ORDER_NUMBER", "SKU", "Qty", "DC_NAME", "BUSINESSUNIT", "ORDERTYPE"]
+
+
+# Rows loaded the way the app loads them: compact column types, sorted by DATE
+def loaded(frame):
+    return apply_schema(frame.copy()).sort_values('DATE', kind='stable', ignore_index=True)
+
+
+@pytest.fixture(scope="session")
+def raw_inbound():
+    return raw_rows(INBOUND, 20_000, seed=11)
+
+
+@pytest.fixture(scope="session")
+def raw_outbound():
+    return raw_rows(OUTBOUND, 20_000, seed=12)
+
+
+@pytest.fixture(scope="session")
+def inbound_frame(raw_inbound):
+    return loaded(raw_inbound)
+
+
+@pytest.fixture(scope="session")
+def outbound_frame(raw_outbound):
+    return loaded(raw_outbound)
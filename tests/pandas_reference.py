@@ -0,0 +1,62 @@
+import itertools
+
+import pandas as pd
+
+# Plain pandas answers to the summary filters, which the cube, the date index and the other
+# fast paths are checked against
+
+FILTER_COLUMNS = {"dc_name": "DC_NAME", "bu_name": "BUSINESSUNIT", "channel_name": "ORDERTYPE"}
+
+
+# Plain pandas reference: boolean masks, then sum / nunique on the matching rows
+def reference_rows(data, start_date, end_date, **filters):
+    mask = (data['DATE'] >= pd.Timestamp(start_date)) & (data['DATE'] <= pd.Timestamp(end_date))
+    for argument, value in filters.items():
+        if value != "All":
+            mask &= data[FILTER_COLUMNS[argument]] == value
+    return data[mask]
+
+
+def reference_kpis(data, distinct, start_date, end_date, **filters):
+    rows = reference_rows(data, start_date, end_date, **filters)
+    kpis = {
+        "min_date": rows['DATE'].min() if len(rows) else None,
+        "max_date": rows['DATE'].max() if len(rows) else None,
+        "total_lines": len(rows),
+        "total_units": float(rows['Qty'].sum()),
+        "days_of_data": (rows['DATE'].max() - rows['DATE'].min()).days if len(rows) else 0,
+    }
+    for kpi, column in distinct.items():
+        kpis[kpi] = int(rows[column].nunique())
+    return kpis
+
+
+def date_ranges(data):
+    first, last = data['DATE'].min(), data['DATE'].max()
+    middle = (first + (last - first) / 2).normalize()
+    return [
+        (first, last),                                                # everything
+        (middle, middle),                                             # a single day
+        (first + pd.Timedelta(days=30), first + pd.Timedelta(days=120)),
+        (last - pd.Timedelta(days=6), last + pd.Timedelta(days=30)),  # runs past the data
+        (last + pd.Timedelta(days=1), last + pd.Timedelta(days=10)),  # after the data: empty
+        (middle, middle - pd.Timedelta(days=3)),                      # start after end: empty
+    ]
+
+
+def values(data, column, count=None):
+    return ["All"] + sorted(data[column].dropna().astype(str).unique())[:count]
+
+
+def inbound_filters(data):
+    return [{"dc_name": dc} for dc in values(data, "DC_NAME")]
+
+
+def outbound_filters(data):
+    return [{"dc_name": dc, "bu_name": bu, "channel_name": channel}
+            for dc, bu, channel in itertools.product(values(data, "DC_NAME", 2), values(data, "BUSINESSUNIT", 2),
+                                                     values(data, "ORDERTYPE"))]
+
+
+def cases(data, filters):
+    return [(start, end, combination) for start, end in date_ranges(data) for combination in filters]
@@ -0,0 +1,48 @@
+import itertools
+
+import pandas as pd
+import pytest
+
+import batch_summary
+from batch_summary import filter_grid, run_batch, LoadedDirection
+from metadata_catalog import build_outbound_catalog, OUTBOUND_FILTER_COLUMNS
+from metrics_engine import inbound_summary, outbound_summary
+
+
+# Every combination a row supports, with each filter either set to the row's value or "All"
+def expected_grid(frame, columns):
+    grid = set()
+    for row in frame[columns].dropna().drop_duplicates().itertuples(index=False):
+        for rolled_up in itertools.product([False, True], repeat=len(columns)):
+            grid.add(tuple("All" if all_values else str(value) for value, all_values in zip(row, rolled_up)))
+    return grid
+
+
+@pytest.mark.parametrize("rows", [40, None])
+def test_filter_grid_covers_present_combinations_and_roll_ups(outbound_frame, rows):
+    frame = outbound_frame.iloc[:rows]
+    grid = filter_grid(build_outbound_catalog(frame))
+    combinations = [tuple(combination[column] for column in OUTBOUND_FILTER_COLUMNS) for combination in grid]
+    assert len(combinations) == len(set(combinations))
+    assert set(combinations) == expected_grid(frame, OUTBOUND_FILTER_COLUMNS)
+
+
+def test_parallel_batch_matches_serial_summaries(monkeypatch, inbound_frame, outbound_frame):
+    frames = {"inbound": inbound_frame, "outbound": outbound_frame}
+    monkeypatch.setattr(batch_summary, "load_direction",
+                        lambda direction, use_cache=True: LoadedDirection(direction, frames[direction]))
+    start, end = pd.Timestamp('2024-02-01'), pd.Timestamp('2024-05-31')
+    table = run_batch(start, end, workers=4)
+
+    assert len(table) == len(table.drop_duplicates(["direction", "DC_NAME", "BUSINESSUNIT", "ORDERTYPE"]))
+    assert (table['start_date'] == start).all() and (table['end_date'] == end).all()
+    for row in table.to_dict('records'):
+        if row["direction"] == "inbound":
+            expected = inbound_summary(inbound_frame, start, end, row["DC_NAME"])
+        else:
+            expected = outbound_summary(outbound_frame, start, end, row["DC_NAME"], row["BUSINESSUNIT"],
+                                        row["ORDERTYPE"])
+        assert {kpi: row[kpi] for kpi in expected.kpi_record()} == expected.kpi_record()
+    counts = table['direction'].value_counts()
+    assert counts["inbound"] == len(filter_grid(LoadedDirection("inbound", inbound_frame).catalog))
+    assert counts["outbound"] == len(filter_grid(LoadedDirection("outbound", outbound_frame).catalog))
@@ -0,0 +1,26 @@
+import pandas as pd
+import pandas.testing as tm
+
+from batch_summary import LoadedDirection, OUTPUT_FILTER_COLUMNS, filter_grid, summary_record
+from bulk_export import bulk_summaries, to_long_format
+
+
+def by_combination(table):
+    columns = [column for column in OUTPUT_FILTER_COLUMNS if column in table.columns] + ["kpi"]
+    return table.sort_values(columns, kind='stable', na_position='first').reset_index(drop=True)
+
+
+def test_process_pool_export_matches_batch_records(inbound_frame, outbound_frame):
+    frames = {"inbound": inbound_frame.iloc[::4].reset_index(drop=True),
+              "outbound": outbound_frame.iloc[::4].reset_index(drop=True)}
+    start, end = pd.Timestamp('2024-03-01'), pd.Timestamp('2024-08-31')
+    table = bulk_summaries(frames, start, end, workers=2)
+
+    records = []
+    for direction, frame in frames.items():
+        loaded = LoadedDirection(direction, frame)
+        records.extend(summary_record(loaded, start, end, combination) for combination in filter_grid(loaded.catalog))
+    expected = to_long_format(records)
+
+    assert set(table['kpi']) >= {"total_orders", "total_lines", "total_units", "units_per_line"}
+    tm.assert_frame_equal(by_combination(table), by_combination(expected))
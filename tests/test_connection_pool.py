@@ -0,0 +1,105 @@
+import threading
+
+import pymysql
+import pytest
+
+from db_access import ConnectionPool
+
+
+class FakeConnection:
+    def __init__(self, number, fail_ping=False):
+        self.number = number
+        self.fail_ping = fail_ping
+        self.closed = False
+        self.pings = 0
+
+    def ping(self, reconnect=True):
+        self.pings += 1
+        if self.fail_ping:
+            raise pymysql.OperationalError("gone away")
+
+    def close(self):
+        self.closed = True
+
+
+def counting_connect(**options):
+    opened = []
+
+    def connect():
+        connection = FakeConnection(len(opened), **options)
+        opened.append(connection)
+        return connection
+    return opened, connect
+
+
+def test_connections_are_reused():
+    opened, connect = counting_connect()
+    pool = ConnectionPool(max_size=2, connect=connect)
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        assert second is first
+    assert len(opened) == 1 and first.pings == 1
+
+
+def test_failed_query_discards_the_connection():
+    opened, connect = counting_connect()
+    pool = ConnectionPool(connect=connect)
+    with pytest.raises(RuntimeError):
+        with pool.connection():
+            raise RuntimeError("query failed")
+    assert opened[0].closed
+    with pool.connection() as connection:
+        assert connection is opened[1]
+
+
+def test_unhealthy_and_idle_connections_are_replaced():
+    opened, connect = counting_connect(fail_ping=True)
+    pool = ConnectionPool(connect=connect)
+    with pool.connection():
+        pass
+    with pool.connection() as connection:
+        assert connection is opened[1] and opened[0].closed
+
+    opened, connect = counting_connect()
+    pool = ConnectionPool(max_idle_seconds=-1, connect=connect)
+    with pool.connection():
+        pass
+    with pool.connection() as connection:
+        assert connection is opened[1] and opened[0].closed and opened[0].pings == 0
+
+
+def test_pool_is_bounded():
+    opened, connect = counting_connect()
+    pool = ConnectionPool(max_size=2, connect=connect)
+    held = threading.Event()
+    release = threading.Event()
+    in_use = []
+    peak = []
+
+    def worker():
+        with pool.connection():
+            in_use.append(1)
+            peak.append(len(in_use))
+            if len(in_use) == 2:
+                held.set()
+            release.wait(5)
+            in_use.pop()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    assert held.wait(5)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert max(peak) == 2 and len(opened) == 2
+
+
+def test_close_all_closes_idle_connections():
+    opened, connect = counting_connect()
+    pool = ConnectionPool(connect=connect)
+    with pool.connection():
+        pass
+    pool.close_all()
+    assert opened[0].closed
@@ -0,0 +1,51 @@
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+from data_schema import to_compact_quantity, apply_schema, report_memory, CATEGORY_COLUMNS
+
+
+def test_whole_quantities_become_int32():
+    quantity = to_compact_quantity(pd.Series([1, Decimal("2"), 3.0], dtype=object))
+    assert quantity.dtype == 'int32'
+    assert quantity.tolist() == [1, 2, 3]
+
+
+def test_fractional_quantities_stay_float():
+    quantity = to_compact_quantity(pd.Series([1, Decimal("2.5")], dtype=object))
+    assert quantity.dtype == 'float64'
+    assert quantity.tolist() == [1.0, 2.5]
+
+
+def test_null_and_unparseable_quantities_are_not_zero_filled():
+    quantity = to_compact_quantity(pd.Series([4, None, "n/a", 6], dtype=object))
+    assert quantity.dtype == 'float64'
+    assert quantity.isna().tolist() == [False, True, True, False]
+    assert quantity.sum() == 10
+
+
+def test_quantities_outside_int32_are_not_wrapped():
+    big = 2**31 + 5
+    quantity = to_compact_quantity(pd.Series([1, big], dtype=object))
+    assert quantity.dtype == 'float64'
+    assert quantity.iloc[1] == big
+    assert to_compact_quantity(pd.Series([-2**31, 2**31 - 1])).dtype == 'int32'
+
+
+def test_apply_schema_types_every_column():
+    frame = apply_schema(pd.DataFrame({"DATE": ["2024-01-02", "2024-01-01"], "SKU": ["A", "B"],
+                                       "Qty": [1, 2], "DC_NAME": ["DC01", None]}))
+    assert frame['DATE'].dtype == np.dtype('datetime64[s]')
+    assert frame['Qty'].dtype == 'int32'
+    assert frame.attrs["unparsed_quantities"] == 0
+    for column in ("SKU", "DC_NAME"):
+        assert column in CATEGORY_COLUMNS and isinstance(frame[column].dtype, pd.CategoricalDtype)
+
+
+def test_unparsed_quantities_are_reported_once(capsys):
+    frame = apply_schema(pd.DataFrame({"DATE": ["2024-01-01"] * 3, "Qty": [1, "x", None]}, dtype=object))
+    assert frame.attrs["unparsed_quantities"] == 1
+    assert capsys.readouterr().out == ""
+    report_memory("Inbound", frame)
+    assert "1 Qty values could not be read" in capsys.readouterr().out
@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+
+import dataset_tab
+from dataset_tab import DatasetTab
+
+
+class FakeLabel:
+    def __init__(self):
+        self.text = None
+
+    def config(self, text):
+        self.text = text
+
+
+class FakeSection:
+    def __init__(self, loaded):
+        self.loaded = loaded
+        self.unloads = 0
+
+    def set_loaded(self, loaded):
+        self.loaded = loaded
+
+    def unload(self):
+        self.loaded = None
+        self.unloads += 1
+
+
+# A tab whose inbound direction has loaded while outbound is still loading, without any widgets
+def loading_tab():
+    tab = DatasetTab.__new__(DatasetTab)
+    tab.dataset = SimpleNamespace(name="Client B")
+    tab.state = "loading"
+    tab.pending = {"outbound"}
+    tab.status_label = FakeLabel()
+    tab.sections = {"inbound": FakeSection(loaded=object()), "outbound": FakeSection(loaded=None)}
+    return tab
+
+
+def test_first_load_error_cancels_the_load(monkeypatch):
+    dialogs = []
+    monkeypatch.setattr(dataset_tab.messagebox, "showerror", lambda title, message: dialogs.append(message))
+    tab = loading_tab()
+
+    tab.show_load_error(RuntimeError("connection refused"))
+    tab.show_load_error(RuntimeError("connection refused"))
+    tab.apply_loaded("outbound", object())
+
+    assert dialogs == ["Failed to load Client B: connection refused"]
+    assert tab.state == "unloaded" and not tab.pending
+    assert tab.sections["inbound"].loaded is None and tab.sections["inbound"].unloads == 1
+    assert tab.sections["outbound"].loaded is None and tab.sections["outbound"].unloads == 0
+    assert tab.status_label.text == "Failed to load Client B"
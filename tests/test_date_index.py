@@ -0,0 +1,28 @@
+import pytest
+
+from date_index import DateIndex, sort_by_date
+from pandas_reference import reference_rows, cases, inbound_filters, outbound_filters
+
+
+@pytest.mark.parametrize("direction", ["inbound", "outbound"])
+def test_select_matches_boolean_masks(direction, inbound_frame, outbound_frame):
+    frame = inbound_frame if direction == "inbound" else outbound_frame
+    filters = inbound_filters(frame) if direction == "inbound" else outbound_filters(frame)
+    index = DateIndex(frame)
+    for start, end, combination in cases(frame, filters):
+        selected = index.select(start, end, **combination)
+        assert selected.index.tolist() == reference_rows(frame, start, end, **combination).index.tolist()
+
+
+def test_select_without_filters_is_everything(inbound_frame):
+    assert len(DateIndex(inbound_frame).select()) == len(inbound_frame)
+    assert len(DateIndex(inbound_frame).select(dc_name="NO_SUCH_DC")) == 0
+
+
+def test_sort_by_date_is_stable(raw_inbound):
+    shuffled = raw_inbound.sample(frac=1, random_state=3)
+    ordered = sort_by_date(shuffled)
+    assert ordered['DATE'].is_monotonic_increasing
+    assert ordered.index.tolist() == list(range(len(shuffled)))
+    expected = shuffled.sort_values('DATE', kind='stable')
+    assert ordered['LOAD_NUMBER'].tolist() == expected['LOAD_NUMBER'].tolist()
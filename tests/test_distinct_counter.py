@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from distinct_counter import DistinctCounter, count_distinct, dense_codes
+
+
+@pytest.mark.parametrize("values", [
+    pd.Series(["a", "b", "a", None, "c"], dtype="category"),
+    pd.Series(["a", "b", "a", None, "c"], dtype=object),
+    pd.Series([3, 1, 3, 2], dtype="int64"),
+    pd.Series([None, None], dtype=object),
+    pd.Series([], dtype="category"),
+])
+def test_count_distinct_matches_nunique(values):
+    assert count_distinct(values) == values.nunique()
+
+
+def test_counter_is_clean_between_calls():
+    counter = DistinctCounter()
+    rng = np.random.default_rng(0)
+    for cardinality in (10, 1_000, 50, 5_000, 3):
+        for size in (0, 2, 100, 20_000):
+            codes = rng.integers(-1, cardinality, size)
+            assert counter.count(codes, cardinality) == len(np.unique(codes[codes >= 0]))
+
+
+def test_dense_codes_of_unused_categories(outbound_frame):
+    subset = outbound_frame['SKU'].iloc[:100]
+    codes, cardinality = dense_codes(subset)
+    assert cardinality == len(outbound_frame['SKU'].cat.categories)
+    assert count_distinct(subset) == subset.nunique()
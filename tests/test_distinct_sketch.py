@@ -0,0 +1,38 @@
+import pandas as pd
+
+from distinct_sketch import build_inbound_sketches, build_outbound_sketches, relative_error
+from metrics_cube import build_outbound_cube
+
+
+def test_sketches_estimate_within_error(outbound_frame, inbound_frame):
+    error = relative_error()
+    for frame, build, distinct in ((outbound_frame, build_outbound_sketches, {"ORDER_NUMBER", "SKU"}),
+                                   (inbound_frame, build_inbound_sketches, {"LOAD_NUMBER", "PO_NUMBER", "SKU"})):
+        sketches = build(frame, 0)
+        for dc_name in ("All", "DC01"):
+            rows = frame if dc_name == "All" else frame[frame['DC_NAME'] == dc_name]
+            kpis = sketches.query(frame['DATE'].min(), frame['DATE'].max(), dc_name=dc_name)
+            assert kpis["total_lines"] == len(rows)
+            assert kpis["distinct_error"] == error
+            for kpi, column in sketches.distinct.items():
+                exact = rows[column].nunique()
+                assert abs(kpis[kpi] - exact) <= 4 * error * exact, (kpi, kpis[kpi], exact)
+
+
+def test_sketches_defer_to_the_exact_path(outbound_frame):
+    start, end = outbound_frame['DATE'].min(), outbound_frame['DATE'].max()
+    # Business unit and channel are not sketch dimensions
+    assert build_outbound_sketches(outbound_frame, 0).query(start, end, bu_name="APPAREL") is None
+    # Slices below exact_below_rows lines are counted exactly
+    assert build_outbound_sketches(outbound_frame, len(outbound_frame) + 1).query(start, end) is None
+    # Empty slices estimate zero
+    empty = build_outbound_sketches(outbound_frame, 0).query(end + pd.Timedelta(days=1), end + pd.Timedelta(days=2))
+    assert empty["total_orders"] == 0 and empty["total_lines"] == 0
+
+
+def test_sketch_lines_and_units_match_the_cube(outbound_frame):
+    start, end = outbound_frame['DATE'].min(), outbound_frame['DATE'].max()
+    estimated = build_outbound_sketches(outbound_frame, 0).query(start, end, dc_name="DC02")
+    exact = build_outbound_cube(outbound_frame).query(start, end, dc_name="DC02")
+    for kpi in ("total_lines", "total_units", "min_date", "max_date", "days_of_data"):
+        assert estimated[kpi] == exact[kpi]
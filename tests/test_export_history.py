@@ -0,0 +1,75 @@
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from export_history import append_run, query_trend, load_run, export_record, open_history, KPI_COLUMNS
+from metrics_engine import InboundMetrics, OutboundMetrics
+
+
+def inbound(lines, units):
+    return InboundMetrics(days_of_data=30, total_loads=12, total_orders=np.int64(40), total_lines=lines,
+                          total_units=units, total_skus=25)
+
+
+def outbound(lines, units):
+    return OutboundMetrics(days_of_data=30, total_orders=50, total_lines=lines, total_units=units, total_skus=33,
+                           distinct_error=0.0163)
+
+
+def run_records(lines, units):
+    start, end = pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-31')
+    return [export_record("inbound", inbound(lines, units), start, end),
+            export_record("inbound", inbound(lines + 1, units + 1), start, end, dc_name="DC01"),
+            export_record("outbound", outbound(lines, units), start, end, "All", "All", "All"),
+            export_record("outbound", outbound(lines + 2, units + 0.25), start, end, "DC02", "APPAREL", "ECOM")]
+
+
+@pytest.fixture
+def history(tmp_path):
+    path = str(tmp_path / "history.sqlite")
+    first = append_run(run_records(100, 1234.5), path, exported_at="2024-02-01T08:00:00")
+    second = append_run(run_records(150, 2000.0), path, exported_at="2024-03-01T08:00:00")
+    return path, first, second
+
+
+def test_trend_returns_one_combination_in_run_order(history):
+    path, first, second = history
+    trend = query_trend("outbound", "DC02", "APPAREL", "ECOM", path=path)
+    assert trend['run_id'].tolist() == [first, second]
+    assert trend['total_lines'].tolist() == [102, 152]
+    assert trend['total_units'].tolist() == [1234.75, 2000.25]
+    assert trend['exported_at'].tolist() == [pd.Timestamp('2024-02-01 08:00'), pd.Timestamp('2024-03-01 08:00')]
+    # Inbound rows have no BU or channel; outbound defaults them to "All"
+    assert query_trend("inbound", "DC01", path=path)['total_lines'].tolist() == [101, 151]
+    assert query_trend("outbound", path=path)['total_lines'].tolist() == [100, 150]
+    assert query_trend("outbound", since="2024-02-15", path=path)['run_id'].tolist() == [second]
+
+
+def test_load_run_returns_the_raw_kpis(history):
+    path, first, second = history
+    rows = load_run(first, path)
+    assert len(rows) == 4 and set(rows['run_id']) == {first}
+    for (_, row), record in zip(rows.iterrows(), run_records(100, 1234.5)):
+        for kpi in KPI_COLUMNS:
+            if record.get(kpi) is None:
+                assert pd.isna(row[kpi])
+            else:
+                assert row[kpi] == record[kpi], kpi
+        assert row['start_date'] == '2024-01-01' and row['end_date'] == '2024-01-31'
+    assert set(load_run(path=path)['run_id']) == {second}
+
+
+def test_failed_insert_rolls_back_the_run(history):
+    path, first, second = history
+    records = run_records(200, 10.0)
+    records[-1]["total_units"] = object()  # not bindable: fails on the last row of the run
+    with pytest.raises(sqlite3.Error):
+        append_run(records, path)
+    connection = open_history(path)
+    try:
+        assert connection.execute("SELECT MAX(run_id), COUNT(*) FROM export_runs").fetchone() == (second, 2)
+        assert connection.execute("SELECT COUNT(*) FROM export_kpis").fetchone() == (8,)
+    finally:
+        connection.close()
@@ -0,0 +1,79 @@
+import pandas as pd
+import pytest
+
+from date_index import DateIndex
+from metrics_cube import build_inbound_cube, build_outbound_cube
+from distinct_sketch import build_inbound_sketches, build_outbound_sketches
+from metadata_catalog import build_inbound_catalog, build_outbound_catalog
+from live_refresh import apply_tail, last_loaded_day
+from typed_frames import concat_typed_chunks
+
+BUILDERS = {
+    "inbound": (build_inbound_cube, lambda rows: build_inbound_sketches(rows, 0), build_inbound_catalog),
+    "outbound": (build_outbound_cube, lambda rows: build_outbound_sketches(rows, 0), build_outbound_catalog),
+}
+FILTERS = {
+    "inbound": [{}, {"dc_name": "DC01"}, {"dc_name": "DC06"}],
+    "outbound": [{}, {"dc_name": "DC02"}, {"bu_name": "APPAREL"}, {"channel_name": "ECOM"},
+                 {"dc_name": "DC03", "bu_name": "FOOTWEAR", "channel_name": "B2C"}],
+}
+
+
+def prepare(direction, data):
+    build_cube, build_sketches, build_catalog = BUILDERS[direction]
+    return data, DateIndex(data), build_cube(data), build_sketches(data), build_catalog(data)
+
+
+# The loaded state of a table whose last loaded day was still receiving lines: every row before
+# cutoff plus half the lines of the cutoff day
+def partial_load(frame, cutoff):
+    before = frame[frame['DATE'] < cutoff]
+    day = frame[frame['DATE'].dt.normalize() == cutoff]
+    return concat_typed_chunks([before, day.iloc[:len(day) // 2]], frame.columns)
+
+
+def assert_matches_rebuild(direction, refreshed, full):
+    data, index, cube, sketches, catalog = refreshed
+    rebuilt = prepare(direction, full)
+    assert len(data) == len(full)
+    days = full['DATE'].dt.normalize()
+    ranges = [(days.min(), days.max()), (days.max(), days.max()), (days.max() - pd.Timedelta(days=20), days.max())]
+    for start, end in ranges:
+        for filters in FILTERS[direction]:
+            assert cube.query(start, end, **filters) == rebuilt[2].query(start, end, **filters)
+            assert sketches.query(start, end, **filters) == rebuilt[3].query(start, end, **filters)
+            assert len(index.select(start, end, **filters)) == len(rebuilt[1].select(start, end, **filters))
+    for column in catalog.filter_columns:
+        assert catalog.values(column) == rebuilt[4].values(column)
+    assert (catalog.min_date, catalog.max_date) == (rebuilt[4].min_date, rebuilt[4].max_date)
+
+
+@pytest.mark.parametrize("direction", ["inbound", "outbound"])
+def test_tail_refresh_matches_full_rebuild(direction, inbound_frame, outbound_frame):
+    full = inbound_frame if direction == "inbound" else outbound_frame
+    cutoff = full['DATE'].dt.normalize().max() - pd.Timedelta(days=10)
+    loaded = partial_load(full, cutoff)
+    first_day = last_loaded_day(loaded)
+    assert first_day == cutoff
+
+    tail = full[full['DATE'] >= first_day].sample(frac=1, random_state=0)  # server order is arbitrary
+    build_cube, build_sketches, _ = BUILDERS[direction]
+    refreshed = apply_tail(prepare(direction, loaded), tail, first_day, build_cube, build_sketches)
+    assert refreshed is not None
+    assert_matches_rebuild(direction, refreshed, full)
+
+
+def test_unchanged_tail_is_skipped(outbound_frame):
+    first_day = last_loaded_day(outbound_frame)
+    tail = outbound_frame[outbound_frame['DATE'] >= first_day].iloc[::-1]
+    assert apply_tail(prepare("outbound", outbound_frame), tail, first_day) is None
+
+
+def test_corrected_row_with_same_count_is_applied(outbound_frame):
+    first_day = last_loaded_day(outbound_frame)
+    tail = outbound_frame[outbound_frame['DATE'] >= first_day].copy()
+    tail.iloc[0, tail.columns.get_loc('Qty')] += 100
+    build_cube, build_sketches, _ = BUILDERS["outbound"]
+    refreshed = apply_tail(prepare("outbound", outbound_frame), tail, first_day, build_cube, build_sketches)
+    assert refreshed is not None
+    assert refreshed[2].query()["total_units"] == float(outbound_frame['Qty'].sum()) + 100
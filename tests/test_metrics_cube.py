@@ -0,0 +1,22 @@
+from metrics_cube import build_inbound_cube, build_outbound_cube, INBOUND_CUBE_SPEC, OUTBOUND_CUBE_SPEC
+from pandas_reference import reference_kpis, cases, inbound_filters, outbound_filters
+
+
+def test_inbound_cube_matches_pandas(inbound_frame):
+    cube = build_inbound_cube(inbound_frame)
+    for start, end, filters in cases(inbound_frame, inbound_filters(inbound_frame)):
+        expected = reference_kpis(inbound_frame, INBOUND_CUBE_SPEC["distinct"], start, end, **filters)
+        assert cube.query(start, end, **filters) == expected
+
+
+def test_outbound_cube_matches_pandas(outbound_frame):
+    cube = build_outbound_cube(outbound_frame)
+    for start, end, filters in cases(outbound_frame, outbound_filters(outbound_frame)):
+        expected = reference_kpis(outbound_frame, OUTBOUND_CUBE_SPEC["distinct"], start, end, **filters)
+        assert cube.query(start, end, **filters) == expected
+
+
+def test_unknown_filter_value_is_empty(outbound_frame):
+    cube = build_outbound_cube(outbound_frame)
+    kpis = cube.query(outbound_frame['DATE'].min(), outbound_frame['DATE'].max(), dc_name="NO_SUCH_DC")
+    assert kpis["total_lines"] == 0 and kpis["total_orders"] == 0 and kpis["min_date"] is None
@@ -0,0 +1,20 @@
+from date_index import DateIndex
+from metrics_cube import build_inbound_cube, build_outbound_cube
+from metrics_engine import inbound_summary, outbound_summary
+from pandas_reference import cases, inbound_filters, outbound_filters
+
+
+# The plain slice, the date-index slice and the cube give the same metrics
+def test_summary_paths_agree(inbound_frame, outbound_frame):
+    index, cube = DateIndex(inbound_frame), build_inbound_cube(inbound_frame)
+    for start, end, filters in cases(inbound_frame, inbound_filters(inbound_frame)):
+        plain = inbound_summary(inbound_frame, start, end, filters["dc_name"])
+        assert inbound_summary(inbound_frame, start, end, filters["dc_name"], date_index=index) == plain
+        assert inbound_summary(inbound_frame, start, end, filters["dc_name"], cube=cube) == plain
+
+    index, cube = DateIndex(outbound_frame), build_outbound_cube(outbound_frame)
+    for start, end, filters in cases(outbound_frame, outbound_filters(outbound_frame)):
+        arguments = (start, end, filters["dc_name"], filters["bu_name"], filters["channel_name"])
+        plain = outbound_summary(outbound_frame, *arguments)
+        assert outbound_summary(outbound_frame, *arguments, date_index=index) == plain
+        assert outbound_summary(outbound_frame, *arguments, cube=cube) == plain
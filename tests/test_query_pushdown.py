@@ -0,0 +1,116 @@
+import datetime
+import itertools
+import sqlite3
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+
+from query_pushdown import (build_filter_clause, build_kpi_query, run_kpi_query, INBOUND_KPI_EXPRESSIONS,
+                            OUTBOUND_KPI_EXPRESSIONS)
+from synthetic_data import ensure_database, DC_NAMES, BUSINESS_UNITS, ORDER_TYPES
+from typed_frames import read_cursor_chunks, INBOUND_COLUMNS, OUTBOUND_COLUMNS
+from metrics_engine import filter_rows, slice_kpis, INBOUND_DISTINCT, OUTBOUND_DISTINCT
+
+DATE_RANGES = [(None, None), ("2024-03-01", "2024-03-31"), ("2024-06-15", "2024-06-15"), ("2025-02-01", "2025-02-28")]
+
+
+# The SQLite stand-in behind the pymysql calls run_kpi_query makes: %s placeholders become ?,
+# and dates are passed as the 'YYYY-MM-DD' text the synthetic tables store
+class SQLiteCursor:
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def execute(self, query, params):
+        self.cursor.execute(query.replace("%s", "?"), [value.strftime('%Y-%m-%d') if isinstance(value, datetime.datetime)
+                                                       else value for value in params])
+
+    def fetchone(self):
+        return self.cursor.fetchone()
+
+    def close(self):
+        self.cursor.close()
+
+
+class SQLiteConnection:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def cursor(self):
+        return SQLiteCursor(self.connection.cursor())
+
+
+# A fixed result row, for the conversions of values SQLite does not return
+class RowConnection:
+    def __init__(self, row):
+        self.row = row
+
+    def cursor(self):
+        return self
+
+    def execute(self, query, params):
+        pass
+
+    def fetchone(self):
+        return self.row
+
+    def close(self):
+        pass
+
+
+@pytest.fixture(scope="module")
+def database(tmp_path_factory):
+    connection = sqlite3.connect(ensure_database(5_000, seed=7, data_dir=str(tmp_path_factory.mktemp("synthetic"))))
+    yield connection
+    connection.close()
+
+
+def loaded_table(connection, table, columns):
+    cursor = connection.cursor()
+    cursor.execute(f"SELECT {','.join(columns)} FROM {table}")
+    return read_cursor_chunks(cursor, columns)
+
+
+def assert_pushdown_matches(connection, data, table, expressions, distinct, filters):
+    for start, end in DATE_RANGES:
+        query, params = build_kpi_query(table, expressions, start, end, **filters)
+        kpis = run_kpi_query(query, params, expressions, SQLiteConnection(connection))
+        expected = slice_kpis(filter_rows(data, start, end, **filters), distinct)
+        assert {name: kpis[name] for name in expected} == expected, (start, end, filters)
+
+
+def test_inbound_pushdown_matches_pandas(database):
+    data = loaded_table(database, "inbound", INBOUND_COLUMNS)
+    for dc_name in ["All", "", None] + DC_NAMES:
+        assert_pushdown_matches(database, data, "inbound", INBOUND_KPI_EXPRESSIONS, INBOUND_DISTINCT,
+                                {"dc_name": dc_name})
+
+
+def test_outbound_pushdown_matches_pandas(database):
+    data = loaded_table(database, "outbound", OUTBOUND_COLUMNS)
+    for dc_name, bu_name, channel_name in itertools.product(["All", "DC01", "DC06"], ["All"] + BUSINESS_UNITS,
+                                                            ["All", ""] + ORDER_TYPES):
+        assert_pushdown_matches(database, data, "outbound", OUTBOUND_KPI_EXPRESSIONS, OUTBOUND_DISTINCT,
+                                {"dc_name": dc_name, "bu_name": bu_name, "channel_name": channel_name})
+
+
+def test_all_and_empty_filters_are_not_applied():
+    assert build_filter_clause(dc_name="All", bu_name="", channel_name=None) == ("", [])
+    assert build_filter_clause(start_date="2024-01-01") == ("", [])
+    where_clause, params = build_filter_clause("2024-01-01", "2024-01-31", "DC01", "All", "ECOM")
+    assert where_clause == " WHERE DATE >= %s AND DATE <= %s AND DC_NAME = %s AND ORDERTYPE = %s"
+    assert params == [datetime.datetime(2024, 1, 1), datetime.datetime(2024, 1, 31), "DC01", "ECOM"]
+
+
+def test_days_of_data_comes_from_min_and_max_date():
+    row = (datetime.date(2024, 1, 1), datetime.date(2024, 1, 31), 4, 9, 20, 3)
+    assert run_kpi_query("", [], OUTBOUND_KPI_EXPRESSIONS, RowConnection(row))["days_of_data"] == 30
+    empty = run_kpi_query("", [], OUTBOUND_KPI_EXPRESSIONS, RowConnection((None, None, 0, 0, 0, 0)))
+    assert empty["days_of_data"] == 0
+
+
+@pytest.mark.parametrize("units, expected", [(Decimal("12.5"), 12.5), (Decimal("40"), 40.0), (None, 0.0)])
+def test_total_units_become_float(units, expected):
+    row = (pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-02'), 1, 2, units, 1)
+    kpis = run_kpi_query("", [], OUTBOUND_KPI_EXPRESSIONS, RowConnection(row))
+    assert isinstance(kpis["total_units"], float) and kpis["total_units"] == expected
@@ -0,0 +1,85 @@
+from recompute_scheduler import RecomputeScheduler
+
+
+# Tk's after/after_cancel without a main loop: timers run when fire() is called
+class FakeRoot:
+    def __init__(self):
+        self.timers = {}
+        self.next_id = 0
+
+    def after(self, ms, callback, *args):
+        self.next_id += 1
+        self.timers[self.next_id] = (callback, args)
+        return self.next_id
+
+    def after_cancel(self, timer_id):
+        del self.timers[timer_id]
+
+    def fire(self):
+        timers, self.timers = self.timers, {}
+        for callback, args in timers.values():
+            callback(*args)
+
+
+# Runs each computation at once, or holds it until finish() when deferred
+class FakeLoader:
+    def __init__(self, deferred=False):
+        self.deferred = deferred
+        self.running = []
+
+    def submit(self, compute, on_done=None, on_error=None):
+        if self.deferred:
+            self.running.append((compute, on_done, on_error))
+        else:
+            self.run(compute, on_done, on_error)
+
+    def run(self, compute, on_done, on_error):
+        try:
+            result = compute()
+        except Exception as e:
+            on_error(e)
+        else:
+            on_done(result)
+
+    def finish(self, position):
+        self.run(*self.running.pop(position))
+
+
+def test_rapid_events_collapse_to_one_run():
+    root, loader = FakeRoot(), FakeLoader()
+    scheduler = RecomputeScheduler(root, loader)
+    computed, painted = [], []
+    for value in range(5):
+        scheduler.request("inbound", lambda value=value: computed.append(value) or value, painted.append)
+    assert len(root.timers) == 1 and not computed
+    root.fire()
+    assert computed == [4] and painted == [4]
+
+
+def test_result_of_an_older_generation_is_dropped():
+    root, loader = FakeRoot(), FakeLoader(deferred=True)
+    scheduler = RecomputeScheduler(root, loader)
+    painted, errors = [], []
+    scheduler.request("outbound", lambda: "old", painted.append, errors.append)
+    root.fire()
+    scheduler.request("outbound", lambda: "new", painted.append, errors.append)
+    root.fire()
+    assert len(loader.running) == 2
+
+    loader.finish(1)
+    loader.finish(0)
+    assert painted == ["new"]
+
+
+def test_cancel_drops_pending_and_running_requests():
+    root, loader = FakeRoot(), FakeLoader(deferred=True)
+    scheduler = RecomputeScheduler(root, loader)
+    painted, errors = [], []
+    scheduler.request("inbound", lambda: 1 / 0, painted.append, errors.append)
+    root.fire()
+    scheduler.request("outbound", lambda: "waiting", painted.append, errors.append)
+    scheduler.cancel("inbound")
+    scheduler.cancel("outbound")
+    assert not root.timers
+    loader.finish(0)
+    assert painted == [] and errors == []
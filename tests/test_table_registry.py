@@ -0,0 +1,60 @@
+import json
+import os
+
+import pytest
+
+import table_registry
+from table_registry import parse_registry, load_registry, default_dataset, BUILTIN_REGISTRY, DEFAULT_REGISTRY_PATH
+
+
+def registry(inbound=None, outbound=None, **extra):
+    return {"datasets": [{"client": "ACME", "year": 2024,
+                          "inbound": inbound or {"table": "db.ACME_IN"},
+                          "outbound": outbound or {"table": "db.ACME_OUT"}}], **extra}
+
+
+def test_unmapped_table_is_used_directly():
+    dataset = parse_registry(registry())["ACME_2024"]
+    assert dataset.inbound.source == "db.ACME_IN"
+    assert dataset.outbound.cache_name == "db.ACME_OUT"
+
+
+def test_mapped_columns_are_selected_explicitly():
+    dataset = parse_registry(registry(outbound={"table": "db.ACME_OUT", "columns": {"Qty": "QUANTITY"}}))["ACME_2024"]
+    assert dataset.outbound.source == ("(SELECT DATE, ORDER_NUMBER, SKU, QUANTITY AS Qty, DC_NAME, BUSINESSUNIT, "
+                                       "ORDERTYPE FROM db.ACME_OUT) AS mapped")
+    # No SELECT *: a table column already named Qty cannot come through a second time
+    assert "*" not in dataset.outbound.source
+    assert dataset.outbound.source.count(" Qty") == 1
+    assert dataset.outbound.cache_name != "db.ACME_OUT"
+
+
+def test_mapping_must_name_a_column_of_its_direction():
+    with pytest.raises(ValueError, match="unknown standard columns"):
+        parse_registry(registry(inbound={"table": "db.ACME_IN", "columns": {"ORDER_NUMBER": "ORDER_ID"}}))
+
+
+@pytest.mark.parametrize("config, message", [
+    ({"datasets": []}, "no datasets"),
+    (registry(inbound={"columns": {}}), "table name is required"),
+    (registry(default="OTHER_2024"), "not registered"),
+])
+def test_invalid_registries_are_rejected(config, message):
+    with pytest.raises(ValueError, match=message):
+        parse_registry(config)
+
+
+def test_default_dataset_comes_first():
+    config = registry()
+    config["datasets"].append({"client": "OTHER", "year": 2023, "inbound": {"table": "a"}, "outbound": {"table": "b"}})
+    config["default"] = "OTHER_2023"
+    assert list(parse_registry(config)) == ["OTHER_2023", "ACME_2024"]
+    assert list(parse_registry(BUILTIN_REGISTRY)) == ["ALPARGATAS_2024"]
+
+
+def test_registry_file_is_found_from_any_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert os.path.dirname(DEFAULT_REGISTRY_PATH) == os.path.dirname(os.path.abspath(table_registry.__file__))
+    with open(DEFAULT_REGISTRY_PATH) as f:
+        assert list(load_registry()) == list(parse_registry(json.load(f)))
+    assert default_dataset() == next(iter(load_registry().values()))
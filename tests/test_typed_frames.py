@@ -0,0 +1,70 @@
+import pandas as pd
+import pandas.testing as tm
+import pytest
+
+from data_schema import apply_schema
+from typed_frames import build_typed_chunk, concat_typed_chunks, INBOUND_COLUMNS, OUTBOUND_COLUMNS
+
+
+# Rows as pymysql returns them: tuples of Python values
+def fetched_rows(frame):
+    return list(frame.astype(object).itertuples(index=False, name=None))
+
+
+# The frame pd.DataFrame(fetchall()) built before chunked loading, typed the same way
+def legacy_frame(rows, columns):
+    return apply_schema(pd.DataFrame(rows, columns=columns))
+
+
+def chunked_frame(rows, columns, chunk_size):
+    return concat_typed_chunks([build_typed_chunk(rows[i:i + chunk_size], columns)
+                                for i in range(0, len(rows), chunk_size)], columns)
+
+
+def assert_same_values(actual, expected):
+    assert list(actual.columns) == list(expected.columns)
+    for column in expected.columns:
+        if not isinstance(expected[column].dtype, pd.CategoricalDtype):
+            assert actual[column].dtype == expected[column].dtype
+        tm.assert_series_equal(actual[column].astype(object), expected[column].astype(object), check_names=False)
+
+
+@pytest.mark.parametrize("direction, chunk_size", [("inbound", 700), ("outbound", 333)])
+def test_chunks_match_single_frame(direction, chunk_size, raw_inbound, raw_outbound):
+    raw, columns = (raw_inbound, INBOUND_COLUMNS) if direction == "inbound" else (raw_outbound, OUTBOUND_COLUMNS)
+    rows = fetched_rows(raw)
+    assert_same_values(chunked_frame(rows, columns, chunk_size), legacy_frame(rows, columns))
+
+
+def test_category_columns_stay_categorical(raw_outbound):
+    frame = chunked_frame(fetched_rows(raw_outbound.iloc[:1_000]), OUTBOUND_COLUMNS, 100)
+    for column in ("ORDER_NUMBER", "SKU", "DC_NAME", "BUSINESSUNIT", "ORDERTYPE"):
+        assert isinstance(frame[column].dtype, pd.CategoricalDtype)
+        assert frame[column].cat.categories.is_unique
+
+
+def test_first_chunk_keeps_its_codes(raw_inbound):
+    rows = fetched_rows(raw_inbound.iloc[:2_000])
+    first = build_typed_chunk(rows[:500], INBOUND_COLUMNS)
+    merged = concat_typed_chunks([first, build_typed_chunk(rows[500:], INBOUND_COLUMNS)], INBOUND_COLUMNS)
+    for column in ("LOAD_NUMBER", "PO_NUMBER", "SKU", "DC_NAME"):
+        assert (merged[column].cat.codes.iloc[:500].to_numpy() == first[column].cat.codes.to_numpy()).all()
+
+
+def test_mixed_category_dtypes_and_empty_chunks():
+    first = build_typed_chunk([("2024-01-01", "LD1", "PO1", "SKU1", 3, "DC01")], INBOUND_COLUMNS)
+    second = build_typed_chunk([("2024-01-02", "LD2", "PO2", "SKU2", 4, None)], INBOUND_COLUMNS)
+    empty = build_typed_chunk([], INBOUND_COLUMNS)
+    merged = concat_typed_chunks([first, empty, second], INBOUND_COLUMNS)
+    assert merged['DC_NAME'].astype(object).tolist()[0] == "DC01"
+    assert pd.isna(merged['DC_NAME'].iloc[1])
+    assert merged['LOAD_NUMBER'].astype(object).tolist() == ["LD1", "LD2"]
+    assert len(concat_typed_chunks([empty], INBOUND_COLUMNS)) == 0
+
+
+def test_unparsed_quantities_are_counted_once_per_frame():
+    chunks = [build_typed_chunk([("2024-01-01", "LD1", "PO1", "SKU1", "bad", "DC01"),
+                                 ("2024-01-01", "LD1", "PO1", "SKU2", None, "DC01")], INBOUND_COLUMNS),
+              build_typed_chunk([("2024-01-02", "LD2", "PO2", "SKU1", "n/a", "DC01")], INBOUND_COLUMNS)]
+    assert [chunk.attrs["unparsed_quantities"] for chunk in chunks] == [1, 1]
+    assert concat_typed_chunks(chunks, INBOUND_COLUMNS).attrs["unparsed_quantities"] == 2
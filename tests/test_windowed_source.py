@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+from windowed_source import add_interval, missing_ranges, WindowedSource
+from typed_frames import INBOUND_COLUMNS
+
+DAY = pd.Timedelta(days=1)
+FIRST = pd.Timestamp('2024-01-01')
+
+
+def day(number):
+    return FIRST + number * DAY
+
+
+def covered_days(intervals):
+    return {lo + i * DAY for lo, hi in intervals for i in range((hi - lo).days + 1)}
+
+
+def test_add_interval_merges_overlapping_and_adjacent():
+    intervals = add_interval([], day(10), day(12))
+    intervals = add_interval(intervals, day(13), day(15))  # adjacent
+    intervals = add_interval(intervals, day(20), day(20))
+    intervals = add_interval(intervals, day(0), day(3))
+    assert intervals == [(day(0), day(3)), (day(10), day(15)), (day(20), day(20))]
+    assert add_interval(intervals, day(2), day(19)) == [(day(0), day(20))]
+
+
+def test_intervals_match_a_set_of_days():
+    rng = np.random.default_rng(1)
+    intervals, days = [], set()
+    for _ in range(200):
+        start = int(rng.integers(0, 120))
+        end = start + int(rng.integers(0, 10))
+        intervals = add_interval(intervals, day(start), day(end))
+        days |= {day(i) for i in range(start, end + 1)}
+        assert covered_days(intervals) == days
+        # Disjoint, sorted and never adjacent
+        assert all(hi + DAY < lo for (_, hi), (lo, _) in zip(intervals, intervals[1:]))
+
+        query_start = int(rng.integers(0, 130))
+        query_end = query_start + int(rng.integers(0, 30))
+        missing = missing_ranges(intervals, day(query_start), day(query_end))
+        wanted = {day(i) for i in range(query_start, query_end + 1)}
+        assert covered_days(missing) == wanted - days
+        assert all(lo <= hi for lo, hi in missing)
+
+
+def test_missing_is_clipped_to_the_table():
+    source = WindowedSource("t", INBOUND_COLUMNS)
+    assert source.missing(day(0), day(5)) == []  # bounds not fetched yet
+    source.min_date, source.max_date = day(10), day(40)
+    source.intervals = [(day(30), day(40))]
+    assert source.missing(day(0), day(100)) == [(day(10), day(29))]
+    assert source.missing(day(50), day(60)) == []
+    assert source.covers(day(31), day(35))
+
+
+def test_is_current_tracks_the_frame_object(inbound_frame):
+    source = WindowedSource("t", INBOUND_COLUMNS)
+    source.frame = inbound_frame
+    assert source.is_current(inbound_frame)
+    assert not source.is_current(inbound_frame.copy())
@@ -0,0 +1,45 @@
+import pandas as pd
+
+from metrics_engine import filter_rows
+
+# Breakdown periods: pd.Grouper arguments of each choice. Every period is labelled by its first
+# day; weeks run Monday to Sunday.
+FREQUENCIES = {
+    "Daily": {"freq": "D"},
+    "Weekly": {"freq": "W-MON", "label": "left", "closed": "left"},
+    "Monthly": {"freq": "MS"},
+}
+
+# Series of each direction: name -> (column, aggregation)
+INBOUND_SERIES = {
+    "Lines": ("DATE", "size"),
+    "Units": ("Qty", "sum"),
+    "Orders": ("PO_NUMBER", "nunique"),
+    "Loads": ("LOAD_NUMBER", "nunique"),
+}
+OUTBOUND_SERIES = {
+    "Lines": ("DATE", "size"),
+    "Units": ("Qty", "sum"),
+    "Orders": ("ORDER_NUMBER", "nunique"),
+}
+
+
+# Lines, units, orders (and loads) per period of the filtered slice, in one groupby over DATE.
+# Returns a frame indexed by period start with one column per series; periods without lines are 0.
+def breakdown(data, series, frequency="Daily", start_date=None, end_date=None, dc_name=None, bu_name=None,
+              channel_name=None, date_index=None):
+    filtered_data = filter_rows(data, start_date, end_date, dc_name, bu_name, channel_name, date_index)
+    grouped = filtered_data.groupby(pd.Grouper(key='DATE', **FREQUENCIES[frequency]), observed=False)
+    table = grouped.agg(**{name: spec for name, spec in series.items()})
+    table.index.name = 'PERIOD'
+    return table.fillna(0)
+
+
+def inbound_breakdown(inbound_data, frequency="Daily", start_date=None, end_date=None, dc_name=None, date_index=None):
+    return breakdown(inbound_data, INBOUND_SERIES, frequency, start_date, end_date, dc_name, date_index=date_index)
+
+
+def outbound_breakdown(outbound_data, frequency="Daily", start_date=None, end_date=None, dc_name=None, bu_name=None,
+                       channel_name=None, date_index=None):
+    return breakdown(outbound_data, OUTBOUND_SERIES, frequency, start_date, end_date, dc_name, bu_name, channel_name,
+                     date_index)
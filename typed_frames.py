@@ -0,0 +1,78 @@
+import time
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from data_schema import apply_schema, memory_bytes, CATEGORY_COLUMNS
+from instrumentation import span
+
+# Typed-frame helpers shared by the MySQL loaders and the SQLite benchmark. Nothing here opens a
+# connection, so importing this module needs neither the connection pool nor the credentials.
+
+# Columns pulled for each direction
+INBOUND_COLUMNS = ["DATE", "LOAD_NUMBER", "PO_NUMBER", "SKU", "Qty", "DC_NAME"]
+OUTBOUND_COLUMNS = ["DATE", "ORDER_NUMBER", "SKU", "Qty", "DC_NAME", "BUSINESSUNIT", "ORDERTYPE"]
+
+# Rows fetched from the server-side cursor per round trip
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+# Build a column-typed DataFrame from one chunk of fetched rows
+def build_typed_chunk(rows, columns):
+    return apply_schema(pd.DataFrame.from_records(rows, columns=columns))
+
+
+# Categorical parts whose categories share one dtype, as union_categoricals requires (a snapshot
+# read back from Feather and a freshly fetched chunk can differ, e.g. object vs str). Only the
+# category lists are converted; the codes are reused as they are.
+def align_category_dtypes(parts):
+    if len({part.cat.categories.dtype for part in parts}) <= 1:
+        return parts
+    return [pd.Categorical.from_codes(part.cat.codes, part.cat.categories.astype(object)) for part in parts]
+
+
+# Stitch typed chunks into one frame, merging the categories of each chunk. union_categoricals
+# recodes each part once against the merged categories (linear in the rows); the categories of
+# the first chunk keep their codes, which live_refresh relies on.
+def concat_typed_chunks(chunks, columns):
+    chunks = [chunk for chunk in chunks if len(chunk)]
+    if not chunks:
+        return build_typed_chunk([], columns)
+
+    data = {}
+    for column in columns:
+        parts = [chunk[column] for chunk in chunks]
+        if column in CATEGORY_COLUMNS:
+            data[column] = pd.Series(union_categoricals(align_category_dtypes(parts)))
+        else:
+            data[column] = pd.concat(parts, ignore_index=True)
+    frame = pd.DataFrame(data)
+    frame.attrs["unparsed_quantities"] = sum(chunk.attrs.get("unparsed_quantities", 0) for chunk in chunks)
+    return frame
+
+
+# Read an executed cursor fetchmany() at a time into one typed frame.
+# Only one chunk of raw tuples is alive at once; progress_callback(rows_loaded) runs after each chunk.
+# The time spent waiting on the server and building typed chunks is recorded separately.
+def read_cursor_chunks(cursor, columns, chunk_size=DEFAULT_CHUNK_SIZE, progress_callback=None):
+    chunks = []
+    rows_loaded = 0
+    with span("db.fetch", fetch_seconds=0.0, build_seconds=0.0) as fetch_span:
+        while True:
+            started = time.perf_counter()
+            rows = cursor.fetchmany(chunk_size)
+            fetched = time.perf_counter()
+            fetch_span["fetch_seconds"] += fetched - started
+            if not rows:
+                break
+            chunks.append(build_typed_chunk(rows, columns))
+            fetch_span["build_seconds"] += time.perf_counter() - fetched
+            rows_loaded += len(rows)
+            if progress_callback:
+                progress_callback(rows_loaded)
+        fetch_span["rows"] = rows_loaded
+    with span("frame.concat") as concat_span:
+        frame = concat_typed_chunks(chunks, columns)
+        concat_span.update(rows=len(frame), bytes=memory_bytes(frame),
+                           unparsed_quantities=frame.attrs["unparsed_quantities"])
+    return frame
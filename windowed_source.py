@@ -0,0 +1,168 @@
+import threading
+
+import pandas as pd
+
+from db_access import pooled_connection, INBOUND_TABLE, OUTBOUND_TABLE, DEFAULT_DATASET
+from data_loader import stream_table, concat_typed_chunks, INBOUND_COLUMNS, OUTBOUND_COLUMNS, DEFAULT_CHUNK_SIZE
+from snapshot_cache import load_table_cached, snapshot_exists, write_snapshot, DEFAULT_LOOKBACK_DAYS
+from date_index import sort_by_date
+from instrumentation import span
+
+# Days of data fetched at startup, ending at the table's latest DATE
+DEFAULT_WINDOW_DAYS = 28
+
+ONE_DAY = pd.Timedelta(days=1)
+
+
+# Add the day range [start, end] (both inclusive) to a sorted list of disjoint intervals,
+# merging overlapping and adjacent ones
+def add_interval(intervals, start, end):
+    merged = []
+    for lo, hi in sorted(intervals + [(start, end)]):
+        if merged and lo <= merged[-1][1] + ONE_DAY:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], hi))
+        else:
+            merged.append((lo, hi))
+    return merged
+
+
+# Day ranges of [start, end] not covered by the intervals, in date order
+def missing_ranges(intervals, start, end):
+    missing = []
+    cursor = start
+    for lo, hi in intervals:
+        if hi < cursor:
+            continue
+        if lo > end:
+            break
+        if lo > cursor:
+            missing.append((cursor, min(lo - ONE_DAY, end)))
+        cursor = max(cursor, hi + ONE_DAY)
+        if cursor > end:
+            break
+    if cursor <= end:
+        missing.append((cursor, end))
+    return missing
+
+
+# In-memory frame of a table that holds only the date ranges asked for so far. Startup fetches
+# the last window_days of the table; ensure(start, end) then fetches just the days of a new
+# selection that are not loaded yet and merges them in. Loaded day ranges are tracked as merged
+# intervals, so no range is fetched twice. Calls are serialized, so it is safe from workers.
+# With a cache_name, startup reads the Feather snapshot instead when there is one (only rows
+# after its high-water mark are fetched), and a frame covering the whole table is saved as one.
+class WindowedSource:
+    def __init__(self, table, columns, window_days=DEFAULT_WINDOW_DAYS, chunk_size=DEFAULT_CHUNK_SIZE,
+                 cache_name=None, lookback_days=DEFAULT_LOOKBACK_DAYS):
+        self.table = table
+        self.columns = columns
+        self.window_days = window_days
+        self.chunk_size = chunk_size
+        self.cache_name = cache_name
+        self.lookback_days = lookback_days
+        self.lock = threading.Lock()
+        self.intervals = []
+        self.frame = None
+        self.min_date = self.max_date = None
+
+    # First and last DATE of the whole table (the selectable range of the date pickers)
+    def fetch_bounds(self):
+        with pooled_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(f"SELECT MIN(DATE), MAX(DATE) FROM {self.table}")
+            min_date, max_date = cursor.fetchone()
+            cursor.close()
+        if min_date is not None and max_date is not None:
+            self.min_date = pd.Timestamp(min_date).normalize()
+            self.max_date = pd.Timestamp(max_date).normalize()
+
+    # Load the snapshot (plus newer rows) or else fetch the default recent window; returns the frame
+    def load_initial(self, progress_callback=None):
+        if self.cache_name is not None and snapshot_exists(self.cache_name):
+            return self.load_snapshot(progress_callback)
+        self.fetch_bounds()
+        if self.max_date is None:
+            self.frame = concat_typed_chunks([], self.columns)
+            return self.frame
+        start = max(self.min_date, self.max_date - pd.Timedelta(days=self.window_days - 1))
+        self.ensure(start, self.max_date, progress_callback)
+        return self.frame
+
+    # The snapshot holds the whole table up to its high-water mark, so every day is then loaded
+    def load_snapshot(self, progress_callback=None):
+        with self.lock:
+            self.frame = sort_by_date(load_table_cached(self.table, self.columns, self.lookback_days, self.chunk_size,
+                                                        progress_callback, cache_name=self.cache_name))
+            if len(self.frame):
+                self.min_date = pd.Timestamp(self.frame['DATE'].iloc[0]).normalize()
+                self.max_date = pd.Timestamp(self.frame['DATE'].iloc[-1]).normalize()
+                self.intervals = [(self.min_date, self.max_date)]
+            return self.frame
+
+    # Rows of one day range [start, end]; DATE < end + 1 day also keeps DATETIME values of the last day
+    def fetch_range(self, start, end, progress_callback=None):
+        with span("window.fetch", table=self.table, start=str(start.date()), end=str(end.date())) as fetch_span:
+            frame = stream_table(self.table, self.columns, self.chunk_size, progress_callback,
+                                 where_clause=" WHERE DATE >= %s AND DATE < %s",
+                                 params=[start.to_pydatetime(), (end + ONE_DAY).to_pydatetime()])
+            fetch_span["rows"] = len(frame)
+        return frame
+
+    # Day ranges of a selection that still have to be fetched (clipped to the table's dates)
+    def missing(self, start_date, end_date):
+        if self.min_date is None:
+            return []
+        start = max(pd.Timestamp(start_date).normalize(), self.min_date)
+        end = min(pd.Timestamp(end_date).normalize(), self.max_date)
+        if start > end:
+            return []
+        return missing_ranges(self.intervals, start, end)
+
+    def covers(self, start_date, end_date):
+        return not self.missing(start_date, end_date)
+
+    # Fetch the missing days of [start_date, end_date] and merge them into the frame (sorted by
+    # DATE). Returns the new frame, or None when everything was already loaded.
+    def ensure(self, start_date, end_date, progress_callback=None):
+        with self.lock:
+            ranges = self.missing(start_date, end_date)
+            if not ranges:
+                return None
+            with span("window.ensure", table=self.table) as ensure_span:
+                parts = [] if self.frame is None else [self.frame]
+                for start, end in ranges:
+                    parts.append(self.fetch_range(start, end, progress_callback))
+                    self.intervals = add_interval(self.intervals, start, end)
+                self.frame = sort_by_date(concat_typed_chunks(parts, self.columns))
+                ensure_span.update(rows=len(self.frame),
+                                   days=sum((hi - lo).days + 1 for lo, hi in self.intervals))
+            if self.cache_name is not None and self.intervals == [(self.min_date, self.max_date)]:
+                write_snapshot(self.cache_name, self.frame)
+            return self.frame
+
+    # Take over a frame refreshed from first_day on (see live_refresh); days up to its last DATE
+    # are then loaded, including days after the table's MAX(DATE) at startup
+    def adopt_refresh(self, frame, first_day):
+        with self.lock:
+            self.frame = frame
+            if len(frame):
+                last_day = pd.Timestamp(frame['DATE'].iloc[-1]).normalize()
+                self.max_date = max(self.max_date, last_day) if self.max_date is not None else last_day
+                self.intervals = add_interval(self.intervals, pd.Timestamp(first_day).normalize(), self.max_date)
+
+    # True when frame is the one ensure() last returned; every merge or refresh replaces the object
+    def is_current(self, frame):
+        return frame is self.frame
+
+
+# use_snapshot seeds the window from the table's Feather snapshot (see snapshot_cache)
+def inbound_source(window_days=DEFAULT_WINDOW_DAYS, use_snapshot=True, lookback_days=DEFAULT_LOOKBACK_DAYS):
+    return WindowedSource(INBOUND_TABLE, INBOUND_COLUMNS, window_days,
+                          cache_name=DEFAULT_DATASET.inbound.cache_name if use_snapshot else None,
+                          lookback_days=lookback_days)
+
+
+def outbound_source(window_days=DEFAULT_WINDOW_DAYS, use_snapshot=True, lookback_days=DEFAULT_LOOKBACK_DAYS):
+    return WindowedSource(OUTBOUND_TABLE, OUTBOUND_COLUMNS, window_days,
+                          cache_name=DEFAULT_DATASET.outbound.cache_name if use_snapshot else None,
+                          lookback_days=lookback_days)